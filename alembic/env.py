@@ -16,18 +16,24 @@ from app.models import user, resume, job, match, analytics
 # this is the Alembic Config object
 config = context.config
 
-# Use the same database path logic as the main app
-base_path = Path("/app") if Path("/app").exists() else Path.cwd()
-db_dir = base_path / "storage" / "db"
-db_dir.mkdir(parents=True, exist_ok=True)
-database_url = f"sqlite:///{db_dir}/db.sqlite"
+# The app passes its own connection when it migrates at startup
+app_connection = config.attributes.get("connection")
 
-# Set the database URL for alembic
-config.set_main_option("sqlalchemy.url", database_url)
+if app_connection is None:
+    # Use the same database path logic as the main app
+    database_url = os.getenv("DATABASE_URL", "")
+    if not database_url:
+        base_path = Path("/app") if Path("/app").exists() else Path.cwd()
+        db_dir = base_path / "storage" / "db"
+        db_dir.mkdir(parents=True, exist_ok=True)
+        database_url = f"sqlite:///{db_dir}/db.sqlite"
 
-# Interpret the config file for Python logging.
-if config.config_file_name is not None:
-    fileConfig(config.config_file_name)
+    # Set the database URL for alembic
+    config.set_main_option("sqlalchemy.url", database_url)
+
+    # Interpret the config file for Python logging (the app configures its own)
+    if config.config_file_name is not None:
+        fileConfig(config.config_file_name)
 
 # add your model's MetaData object here
 target_metadata = Base.metadata
@@ -46,8 +52,21 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 
+def do_run_migrations(connection) -> None:
+    context.configure(
+        connection=connection, target_metadata=target_metadata
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
 def run_migrations_online() -> None:
     """Run migrations in 'online' mode."""
+    if app_connection is not None:
+        do_run_migrations(app_connection)
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
@@ -55,12 +74,7 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(
-            connection=connection, target_metadata=target_metadata
-        )
-
-        with context.begin_transaction():
-            context.run_migrations()
+        do_run_migrations(connection)
 
 
 if context.is_offline_mode():
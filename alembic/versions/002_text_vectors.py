@@ -0,0 +1,29 @@
+"""Add text vectors to resumes and jobs
+
+Revision ID: 002
+Revises: 001
+Create Date: 2024-06-01 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # float32 hashed term vectors; rows without one are vectorized on the fly
+    op.add_column('jobs', sa.Column('text_vector', sa.LargeBinary(), nullable=True))
+    op.add_column('resumes', sa.Column('text_vector', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('resumes') as batch_op:
+        batch_op.drop_column('text_vector')
+    with op.batch_alter_table('jobs') as batch_op:
+        batch_op.drop_column('text_vector')
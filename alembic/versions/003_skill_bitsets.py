@@ -0,0 +1,44 @@
+"""Add skill registry and skill bitsets
+
+Revision ID: 003
+Revises: 002
+Create Date: 2024-06-15 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create skills table (ids are bit positions in the bitsets below)
+    op.create_table('skills',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_skills_id'), 'skills', ['id'], unique=False)
+    op.create_index(op.f('ix_skills_name'), 'skills', ['name'], unique=True)
+
+    # Rows without bitsets are encoded on the fly from their skill names
+    op.add_column('resumes', sa.Column('skill_bits', sa.LargeBinary(), nullable=True))
+    op.add_column('jobs', sa.Column('required_skill_bits', sa.LargeBinary(), nullable=True))
+    op.add_column('jobs', sa.Column('preferred_skill_bits', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('jobs') as batch_op:
+        batch_op.drop_column('preferred_skill_bits')
+        batch_op.drop_column('required_skill_bits')
+    with op.batch_alter_table('resumes') as batch_op:
+        batch_op.drop_column('skill_bits')
+    op.drop_index(op.f('ix_skills_name'), table_name='skills')
+    op.drop_index(op.f('ix_skills_id'), table_name='skills')
+    op.drop_table('skills')
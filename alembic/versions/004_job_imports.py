@@ -0,0 +1,54 @@
+"""Add bulk job imports
+
+Revision ID: 004
+Revises: 003
+Create Date: 2024-07-01 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create job_imports table
+    op.create_table('job_imports',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('recruiter_id', sa.Integer(), nullable=False),
+        sa.Column('format', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('rows_total', sa.Integer(), nullable=True),
+        sa.Column('rows_imported', sa.Integer(), nullable=True),
+        sa.Column('rows_failed', sa.Integer(), nullable=True),
+        sa.Column('rows_enriched', sa.Integer(), nullable=True),
+        sa.Column('enrichment_failed', sa.Integer(), nullable=True),
+        sa.Column('errors', sa.JSON(), nullable=True),
+        sa.Column('detail', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['recruiter_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_job_imports_id'), 'job_imports', ['id'], unique=False)
+
+    # Jobs remember the import that created them, for enrichment
+    with op.batch_alter_table('jobs') as batch_op:
+        batch_op.add_column(sa.Column('import_id', sa.Integer(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_jobs_import_id'), ['import_id'], unique=False)
+        batch_op.create_foreign_key('fk_jobs_import_id_job_imports', 'job_imports', ['import_id'], ['id'])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('jobs') as batch_op:
+        batch_op.drop_constraint('fk_jobs_import_id_job_imports', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_jobs_import_id'))
+        batch_op.drop_column('import_id')
+    op.drop_index(op.f('ix_job_imports_id'), table_name='job_imports')
+    op.drop_table('job_imports')
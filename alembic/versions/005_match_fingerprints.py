@@ -0,0 +1,41 @@
+"""Add content fingerprints and stale flags for matches
+
+Revision ID: 005
+Revises: 004
+Create Date: 2024-07-15 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Fingerprints of the fields matches are scored from; NULL until a row is next written
+    op.add_column('resumes', sa.Column('content_fingerprint', sa.String(), nullable=True))
+    op.add_column('jobs', sa.Column('content_fingerprint', sa.String(), nullable=True))
+
+    # Matches remember what they were computed from, and whether that has changed since
+    op.add_column('matches', sa.Column('resume_fingerprint', sa.String(), nullable=True))
+    op.add_column('matches', sa.Column('job_fingerprint', sa.String(), nullable=True))
+    with op.batch_alter_table('matches') as batch_op:
+        batch_op.add_column(sa.Column('is_stale', sa.Boolean(), server_default=sa.false(), nullable=False))
+        batch_op.create_index(batch_op.f('ix_matches_is_stale'), ['is_stale'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('matches') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_matches_is_stale'))
+        batch_op.drop_column('is_stale')
+        batch_op.drop_column('job_fingerprint')
+        batch_op.drop_column('resume_fingerprint')
+    with op.batch_alter_table('jobs') as batch_op:
+        batch_op.drop_column('content_fingerprint')
+    with op.batch_alter_table('resumes') as batch_op:
+        batch_op.drop_column('content_fingerprint')
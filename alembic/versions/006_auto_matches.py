@@ -0,0 +1,29 @@
+"""Add origin to matches for pre-computed candidate matches
+
+Revision ID: 006
+Revises: 005
+Create Date: 2024-07-22 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing matches were all requested by applicants
+    with op.batch_alter_table('matches') as batch_op:
+        batch_op.add_column(sa.Column('origin', sa.String(), server_default='applicant', nullable=False))
+        batch_op.create_index(batch_op.f('ix_matches_origin'), ['origin'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('matches') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_matches_origin'))
+        batch_op.drop_column('origin')
@@ -0,0 +1,225 @@
+import time
+import tracemalloc
+from typing import Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.deps import get_current_admin, get_db
+from app.core.profiling import ProfilerBusy, allocation_tracker, sampling_profiler, to_collapsed
+from app.core.tracing import trace_exporter
+from app.models.user import User
+from app.services.llm_ledger import llm_ledger
+from app.services.match_freshness import rescore_stale_matches, stale_matches_query
+
+router = APIRouter()
+
+
+@router.get("/llm-calls/summary")
+def get_llm_call_summary(
+    minutes: int = Query(60, ge=1, le=60 * 24 * 31),
+    task: Optional[str] = Query(None),
+    current_user: User = Depends(get_current_admin)
+):
+    """Get latency percentiles, token usage and cost per AIService task"""
+    until = time.time()
+    since = until - minutes * 60
+    return {
+        "window_minutes": minutes,
+        "since": since,
+        "until": until,
+        "tasks": llm_ledger.summarize(since, until, task=task)
+    }
+
+
+@router.get("/llm-calls/recent")
+def get_recent_llm_calls(
+    limit: int = Query(50, ge=1, le=500),
+    minutes: int = Query(60, ge=1, le=60 * 24),
+    current_user: User = Depends(get_current_admin)
+):
+    """Get the most recent LLM call records"""
+    calls = llm_ledger.read(time.time() - minutes * 60)
+    calls.sort(key=lambda call: call["started_at"], reverse=True)
+    return calls[:limit]
+
+
+
+@router.get("/traces")
+def get_traces(
+    limit: int = Query(50, ge=1, le=500),
+    min_duration_ms: float = Query(0, ge=0),
+    route: Optional[str] = Query(None, description="Only traces whose name contains this text"),
+    current_user: User = Depends(get_current_admin)
+):
+    """List recently sampled request traces, slowest first"""
+    traces = [
+        trace for trace in trace_exporter.recent()
+        if (trace["duration_ms"] or 0) >= min_duration_ms and (not route or route in trace["name"])
+    ]
+    traces.sort(key=lambda trace: trace["duration_ms"] or 0, reverse=True)
+    return [
+        {
+            "trace_id": trace["trace_id"],
+            "name": trace["name"],
+            "start_time": trace["start_time"],
+            "duration_ms": trace["duration_ms"],
+            "status": trace["status"],
+            "span_count": len(trace["spans"])
+        }
+        for trace in traces[:limit]
+    ]
+
+
+@router.get("/traces/{trace_id}")
+def get_trace(
+    trace_id: str,
+    current_user: User = Depends(get_current_admin)
+):
+    """Get all spans of a sampled request trace"""
+    trace = trace_exporter.get(trace_id)
+    if not trace:
+        raise HTTPException(status_code=404, detail="Trace not found")
+    return trace
+
+
+
+@router.post("/profile/cpu", response_class=PlainTextResponse)
+async def profile_cpu(
+    seconds: float = Query(10, gt=0),
+    interval_ms: float = Query(10, ge=1, le=1000),
+    mode: str = Query("wall", pattern="^(wall|cpu)$"),
+    current_user: User = Depends(get_current_admin)
+):
+    """Sample every thread of this worker and return collapsed stacks for flamegraphs"""
+    if seconds > settings.PROFILER_MAX_SECONDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Profiling is limited to {settings.PROFILER_MAX_SECONDS} seconds"
+        )
+    try:
+        stacks = await run_in_threadpool(sampling_profiler.sample, seconds, interval_ms / 1000, mode)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return PlainTextResponse(to_collapsed(stacks))
+
+
+@router.post("/profile/memory/start")
+def start_memory_tracing(
+    frames: int = Query(10, ge=1, le=100),
+    current_user: User = Depends(get_current_admin)
+):
+    """Start tracemalloc in this worker"""
+    allocation_tracker.start(frames)
+    return {"tracing": True, "frames": tracemalloc.get_traceback_limit()}
+
+
+@router.post("/profile/memory/stop")
+def stop_memory_tracing(current_user: User = Depends(get_current_admin)):
+    """Stop tracemalloc and discard snapshots"""
+    allocation_tracker.stop()
+    return {"tracing": False}
+
+
+def _require_tracing():
+    if not allocation_tracker.tracing:
+        raise HTTPException(
+            status_code=409,
+            detail="Memory tracing is not running; POST /admin/profile/memory/start first"
+        )
+
+
+def _get_snapshot(snapshot_id: int):
+    snapshot = allocation_tracker.get(snapshot_id)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+    return snapshot
+
+
+@router.post("/profile/memory/snapshots")
+async def take_memory_snapshot(
+    limit: int = Query(25, ge=1, le=500),
+    current_user: User = Depends(get_current_admin)
+):
+    """Take a tracemalloc snapshot and return its top allocators"""
+    _require_tracing()
+    snapshot_id = await run_in_threadpool(allocation_tracker.take_snapshot)
+    current, peak = tracemalloc.get_traced_memory()
+    return {
+        "snapshot_id": snapshot_id,
+        "traced_memory_kb": round(current / 1024, 1),
+        "peak_traced_memory_kb": round(peak / 1024, 1),
+        "top": allocation_tracker.top(_get_snapshot(snapshot_id), limit)
+    }
+
+
+@router.get("/profile/memory/snapshots")
+def list_memory_snapshots(current_user: User = Depends(get_current_admin)):
+    """List retained snapshot ids"""
+    return {"tracing": allocation_tracker.tracing, "snapshot_ids": allocation_tracker.snapshot_ids()}
+
+
+@router.get("/profile/memory/snapshots/{snapshot_id}")
+def get_memory_snapshot(
+    snapshot_id: int,
+    limit: int = Query(25, ge=1, le=500),
+    key_type: str = Query("lineno", pattern="^(lineno|filename|traceback)$"),
+    current_user: User = Depends(get_current_admin)
+):
+    """Get top allocators of a snapshot"""
+    return allocation_tracker.top(_get_snapshot(snapshot_id), limit, key_type)
+
+
+@router.get("/profile/memory/diff")
+def diff_memory_snapshots(
+    base: int,
+    target: int,
+    limit: int = Query(25, ge=1, le=500),
+    key_type: str = Query("lineno", pattern="^(lineno|filename|traceback)$"),
+    current_user: User = Depends(get_current_admin)
+):
+    """Compare two snapshots and return the biggest allocation growth"""
+    return allocation_tracker.diff(_get_snapshot(base), _get_snapshot(target), limit, key_type)
+
+
+@router.get("/job-index")
+def get_job_index(current_user: User = Depends(get_current_admin)):
+    """Get the shared similar-job ANN index's size, lists and pending delta"""
+    # Imported here so numpy stays off the worker start path
+    from app.services.job_search import job_ann_index
+    stats = job_ann_index.stats()
+    return {
+        "enabled": settings.JOB_ANN_ENABLED,
+        "built": stats is not None,
+        "nprobe": settings.JOB_ANN_NPROBE,
+        "index": stats
+    }
+
+
+@router.post("/job-index/rebuild")
+def rebuild_job_index(
+    nlist: Optional[int] = Query(None, ge=1),
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Rebuild the similar-job ANN index from all active jobs"""
+    from app.services.ann_index import IndexBusy
+    from app.services.job_search import build_job_ann_index
+    try:
+        return build_job_ann_index(db, nlist)
+    except IndexBusy:
+        raise HTTPException(status_code=409, detail="A job index build is already running")
+
+
+@router.post("/matches/rescore")
+def rescore_matches(
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Re-score every stale match in the background, e.g. those left over by a restarted worker"""
+    stale = stale_matches_query(db).count()
+    if stale:
+        background_tasks.add_task(rescore_stale_matches)
+    return {"stale": stale, "engine": settings.MATCH_RESCORE_ENGINE}
@@ -34,6 +34,7 @@ def get_user_analytics(
     # Match score improvement over time
     matches = db.query(Match).filter(
         Match.user_id == current_user.id,
+        Match.origin == "applicant",
         Match.created_at >= start_date
     ).order_by(Match.created_at).all()
     
@@ -57,11 +58,13 @@ def get_user_analytics(
     
     # Best and recent matches
     best_matches = db.query(Match).filter(
-        Match.user_id == current_user.id
+        Match.user_id == current_user.id,
+        Match.origin == "applicant"
     ).order_by(desc(Match.match_score)).limit(5).all()
     
     recent_matches = db.query(Match).filter(
-        Match.user_id == current_user.id
+        Match.user_id == current_user.id,
+        Match.origin == "applicant"
     ).order_by(desc(Match.created_at)).limit(5).all()
     
     return {
@@ -101,7 +104,8 @@ def get_skill_gap_analysis(
         SkillGap.importance,
         func.count(SkillGap.id).label("frequency")
     ).join(Match).filter(
-        Match.user_id == current_user.id
+        Match.user_id == current_user.id,
+        Match.origin == "applicant"
     ).group_by(
         SkillGap.missing_skill,
         SkillGap.importance
@@ -140,6 +144,7 @@ def get_improvement_suggestions(
     # Get recent matches with low scores
     low_score_matches = db.query(Match).filter(
         Match.user_id == current_user.id,
+        Match.origin == "applicant",
         Match.match_score < 70
     ).order_by(desc(Match.created_at)).limit(10).all()
     
@@ -160,7 +165,8 @@ def get_improvement_suggestions(
         SkillGap.missing_skill,
         func.count(SkillGap.id).label("count")
     ).join(Match).filter(
-        Match.user_id == current_user.id
+        Match.user_id == current_user.id,
+        Match.origin == "applicant"
     ).group_by(SkillGap.missing_skill).order_by(
         desc(func.count(SkillGap.id))
     ).limit(5).all()
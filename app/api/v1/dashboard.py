@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc
 from app.core.deps import get_db, get_current_recruiter
 from app.models.user import User
 from app.models.job import Job
 from app.models.match import Match
-from app.models.resume import Resume
+from app.services.candidate_export import EXPORT_MEDIA_TYPES, candidates_query, stream_candidates
 
 router = APIRouter()
 
@@ -28,32 +29,8 @@ def get_candidates_for_job(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    # Get matches for this job, ordered by score
-    matches = db.query(Match).join(Resume).join(User).filter(
-        Match.job_id == job_id,
-        Match.match_score >= min_score
-    ).order_by(desc(Match.match_score)).limit(limit).all()
-    
-    # Format response with candidate info
-    candidates = []
-    for match in matches:
-        resume = db.query(Resume).filter(Resume.id == match.resume_id).first()
-        user = db.query(User).filter(User.id == match.user_id).first()
-        
-        candidates.append({
-            "match_id": match.id,
-            "candidate_name": user.full_name,
-            "candidate_email": user.email,
-            "resume_title": resume.title,
-            "match_score": match.match_score,
-            "skill_match_score": match.skill_match_score,
-            "experience_match_score": match.experience_match_score,
-            "education_match_score": match.education_match_score,
-            "skills": resume.skills,
-            "experience_years": resume.experience_years,
-            "education_level": resume.education_level,
-            "created_at": match.created_at
-        })
+    # Get matches for this job with their candidates, ordered by score
+    candidates = [row._asdict() for row in candidates_query(db, job_id, min_score).limit(limit)]
     
     return {
         "job_title": job.title,
@@ -63,6 +40,30 @@ def get_candidates_for_job(
     }
 
 
+@router.get("/candidates/{job_id}/export")
+def export_candidates_for_job(
+    job_id: int,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    min_score: float = Query(0, ge=0, le=100),
+    current_user: User = Depends(get_current_recruiter),
+    db: Session = Depends(get_db)
+):
+    """Stream all ranked candidates for a job as CSV or NDJSON"""
+    job = db.query(Job.id).filter(
+        Job.id == job_id,
+        Job.recruiter_id == current_user.id
+    ).first()
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return StreamingResponse(
+        stream_candidates(job_id, min_score, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="job-{job_id}-candidates.{format}"'}
+    )
+
+
 @router.get("/jobs/stats")
 def get_job_stats(
     current_user: User = Depends(get_current_recruiter),
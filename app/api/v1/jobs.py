@@ -1,25 +1,81 @@
+import hashlib
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.core.cache import ResponseCache, cache_headers, etag_matches, make_etag
+from app.core.config import settings
 from app.core.deps import get_db, get_current_recruiter
+from app.core.serialization import dump_model, dump_models, models_response
+from app.core.tracing import span
 from app.models.user import User
 from app.models.job import Job
-from app.schemas.job import JobResponse, JobCreate, JobUpdate
-from app.services.ai_service import AIService
+from app.models.job_import import JobImport
+from app.schemas.job import JobResponse, JobCreate, JobSimilarity, JobUpdate
+from app.schemas.job_import import JobImportResponse
+from app.services.ai_service import get_ai_service
+from app.services.auto_matching import auto_match_jobs
+from app.services.llm_scheduler import llm_scope
+from app.services.match_freshness import job_fingerprint, mark_matches_stale, rescore_stale_matches
+from app.services.skills import get_skill_registry
 
 router = APIRouter()
-ai_service = AIService()
+VECTOR_FIELDS = {"title", "description", "requirements", "required_skills", "preferred_skills"}
+INDEX_FIELDS = VECTOR_FIELDS | {"is_active"}
+SKILL_FIELDS = {"required_skills", "preferred_skills"}
+job_cache = ResponseCache(
+    max_entries=settings.JOB_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.JOB_CACHE_TTL_SECONDS,
+)
+
+
+def _cached_response(request: Request, key, validate, render) -> Response:
+    """Serve a public job representation from the response cache.
+
+    ``validate`` returns a cheap validator string built from ids and timestamps
+    (or None when the resource does not exist) and ``render`` builds the JSON
+    body. Fresh entries skip the database entirely; stale ones are revalidated
+    first. The ETag also covers a digest of the body, so timestamps sharing the
+    same second can never hand out a 304 for changed content.
+    """
+    entry = job_cache.get(key)
+    if entry is None or not job_cache.is_fresh(entry):
+        validator = validate()
+        if validator is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        if entry is not None and entry.validator == validator:
+            entry = job_cache.touch(key, entry)
+        else:
+            body = render()
+            etag = make_etag(key, validator, hashlib.sha1(body).hexdigest())
+            entry = job_cache.set(key, body, etag, validator)
+    
+    headers = cache_headers(
+        entry.etag, settings.JOB_CACHE_TTL_SECONDS, settings.JOB_CACHE_STALE_WHILE_REVALIDATE
+    )
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+def _sync_job_index(job_id: int, text_vector: Optional[bytes], created: bool = False) -> None:
+    """Propagate a committed job write to the similar-job indexes; None removes the job"""
+    from app.services.job_search import sync_job
+    sync_job(job_id, text_vector, created)
 
 
 @router.post("/", response_model=JobResponse)
 async def create_job(
     job: JobCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_recruiter),
     db: Session = Depends(get_db)
 ):
-    """Create a new job posting"""
+    """Create a new job posting; its best candidates are pre-matched in the background"""
     # Analyze job description with AI
-    job_analysis = await ai_service.analyze_job_description(job.description)
+    with llm_scope(user_id=current_user.id):
+        job_analysis = await get_ai_service().analyze_job_description(job.description)
     
     # Create job record
     db_job = Job(
@@ -36,16 +92,80 @@ async def create_job(
         experience_level=job_analysis.get("experience_level", job.experience_level),
         education_requirement=job_analysis.get("education_requirement", job.education_requirement)
     )
+    # Imported here so numpy stays off the worker start path
+    from app.services.text_vectors import vectorize_job
+    text_vector = db_job.text_vector = vectorize_job(db_job)
+    db_job.content_fingerprint = job_fingerprint(db_job)
     
-    db.add(db_job)
-    db.commit()
-    db.refresh(db_job)
+    def save():
+        # Registering new skills and committing hit the database; keep both off the event loop
+        registry = get_skill_registry()
+        db_job.required_skill_bits = registry.encode(db, db_job.required_skills)
+        db_job.preferred_skill_bits = registry.encode(db, db_job.preferred_skills)
+        with span("db.commit"):
+            db.add(db_job)
+            db.commit()
+            db.refresh(db_job)
+    
+    await run_in_threadpool(save)
+    job_cache.clear()
+    _sync_job_index(db_job.id, text_vector, created=True)
+    background_tasks.add_task(auto_match_jobs, [db_job.id])
     
     return db_job
 
 
+@router.post("/bulk", response_model=JobImportResponse, status_code=202)
+async def bulk_import_jobs(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    current_user: User = Depends(get_current_recruiter),
+    db: Session = Depends(get_db)
+):
+    """Import job postings from a streamed CSV or NDJSON body.
+
+    Rows are validated and inserted as they arrive; AI enrichment of their
+    skills continues in the background. Poll GET /jobs/bulk/{import_id}.
+    """
+    from app.services.job_import import detect_format, enrich_import, import_jobs
+    
+    import_format = format or detect_format(request.headers.get("content-type", ""))
+    if not import_format:
+        raise HTTPException(
+            status_code=415,
+            detail="Send text/csv or application/x-ndjson, or pass ?format=csv|ndjson"
+        )
+    
+    job_import = await import_jobs(db, current_user.id, import_format, request.stream())
+    job_cache.clear()
+    if job_import.rows_imported:
+        background_tasks.add_task(enrich_import, job_import.id, job_cache.clear)
+    
+    return job_import
+
+
+@router.get("/bulk/{import_id}", response_model=JobImportResponse)
+def get_bulk_import(
+    import_id: int,
+    current_user: User = Depends(get_current_recruiter),
+    db: Session = Depends(get_db)
+):
+    """Get progress and row errors of a bulk job import"""
+    job_import = db.query(JobImport).filter(
+        JobImport.id == import_id,
+        JobImport.recruiter_id == current_user.id
+    ).first()
+    
+    if not job_import:
+        raise HTTPException(status_code=404, detail="Import not found")
+    
+    return job_import
+
+
 @router.get("/", response_model=List[JobResponse])
 def get_jobs(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     search: Optional[str] = Query(None),
@@ -54,22 +174,41 @@ def get_jobs(
     db: Session = Depends(get_db)
 ):
     """Get all active job postings with filtering"""
-    query = db.query(Job).filter(Job.is_active)
+    # Normalize filters so equivalent queries share a cache entry
+    search = search.strip() if search and search.strip() else None
+    location = location.strip() if location and location.strip() else None
+    job_type = job_type.strip() if job_type and job_type.strip() else None
+    key = ("list", skip, limit, search, location, job_type)
     
-    if search:
-        query = query.filter(
-            Job.title.contains(search) |
-            Job.description.contains(search) |
-            Job.company.contains(search)
-        )
-    
-    if location:
-        query = query.filter(Job.location.contains(location))
+    def validate():
+        # Any insert, update or delete changes at least one of these
+        count, max_id, last_modified = db.query(
+            func.count(Job.id),
+            func.max(Job.id),
+            func.max(func.coalesce(Job.updated_at, Job.created_at))
+        ).one()
+        return f"{count}-{max_id}-{last_modified}"
     
-    if job_type:
-        query = query.filter(Job.job_type == job_type)
+    def render():
+        query = db.query(Job).filter(Job.is_active)
+        
+        if search:
+            query = query.filter(
+                Job.title.contains(search) |
+                Job.description.contains(search) |
+                Job.company.contains(search)
+            )
+        
+        if location:
+            query = query.filter(Job.location.contains(location))
+        
+        if job_type:
+            query = query.filter(Job.job_type == job_type)
+        
+        jobs = query.offset(skip).limit(limit).all()
+        return dump_models(JobResponse, jobs)
     
-    return query.offset(skip).limit(limit).all()
+    return _cached_response(request, key, validate, render)
 
 
 @router.get("/my-jobs", response_model=List[JobResponse])
@@ -78,31 +217,67 @@ def get_my_jobs(
     db: Session = Depends(get_db)
 ):
     """Get jobs created by current recruiter"""
-    return db.query(Job).filter(Job.recruiter_id == current_user.id).all()
+    jobs = db.query(Job).filter(Job.recruiter_id == current_user.id).all()
+    return models_response(JobResponse, jobs)
 
 
-@router.get("/{job_id}", response_model=JobResponse)
-def get_job(
+@router.get("/similar/{job_id}", response_model=List[JobSimilarity])
+def get_similar_jobs(
     job_id: int,
+    limit: int = Query(10, ge=1, le=50),
     db: Session = Depends(get_db)
 ):
-    """Get specific job"""
+    """Get active jobs most similar to a job by text content"""
+    from app.services.job_search import job_vector_index
+    from app.services.text_vectors import decode, job_text, term_vector
+    
     job = db.query(Job).filter(Job.id == job_id, Job.is_active).first()
     
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    return job
+    vector = decode(job.text_vector)
+    if vector is None:
+        vector = term_vector(job_text(job))
+    
+    with span("job_index.search"):
+        hits = job_vector_index.search(db, vector, limit, exclude_id=job.id)
+    return [{"job": similar, "similarity": round(score, 4)} for similar, score in hits]
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(
+    job_id: int,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Get specific job"""
+    def validate():
+        row = db.query(
+            Job.id, func.coalesce(Job.updated_at, Job.created_at)
+        ).filter(Job.id == job_id, Job.is_active).first()
+        return f"{row[0]}-{row[1]}" if row else None
+    
+    def render():
+        job = db.query(Job).filter(Job.id == job_id, Job.is_active).first()
+        
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        
+        return dump_model(JobResponse, job)
+    
+    return _cached_response(request, ("detail", job_id), validate, render)
 
 
 @router.put("/{job_id}", response_model=JobResponse)
 def update_job(
     job_id: int,
     job_update: JobUpdate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_recruiter),
     db: Session = Depends(get_db)
 ):
-    """Update job posting"""
+    """Update job posting; its matches are re-scored and its auto matches re-ranked in the background"""
     job = db.query(Job).filter(
         Job.id == job_id,
         Job.recruiter_id == current_user.id
@@ -111,11 +286,38 @@ def update_job(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    for field, value in job_update.dict(exclude_unset=True).items():
+    was_active = job.is_active
+    changes = job_update.dict(exclude_unset=True)
+    for field, value in changes.items():
         setattr(job, field, value)
     
+    if SKILL_FIELDS & changes.keys():
+        registry = get_skill_registry()
+        job.required_skill_bits = registry.encode(db, job.required_skills)
+        job.preferred_skill_bits = registry.encode(db, job.preferred_skills)
+    
+    reindex = bool(INDEX_FIELDS & changes.keys())
+    if reindex and (VECTOR_FIELDS & changes.keys() or job.text_vector is None):
+        from app.services.text_vectors import vectorize_job
+        job.text_vector = vectorize_job(job)
+    text_vector = job.text_vector if reindex and job.is_active else None
+    
+    fingerprint = job_fingerprint(job)
+    content_changed = fingerprint != job.content_fingerprint
+    if content_changed:
+        job.content_fingerprint = fingerprint
+        mark_matches_stale(db, job_id=job.id)
+    
     db.commit()
     db.refresh(job)
+    job_cache.clear()
+    if reindex:
+        _sync_job_index(job.id, text_vector)
+    if content_changed:
+        background_tasks.add_task(rescore_stale_matches, job_id=job.id)
+    if job.is_active and (content_changed or not was_active):
+        # Its best candidates may have changed; the pass evicts auto matches that no longer make the cut
+        background_tasks.add_task(auto_match_jobs, [job.id])
     
     return job
 
@@ -137,5 +339,7 @@ def delete_job(
     
     db.delete(job)
     db.commit()
+    job_cache.clear()
+    _sync_job_index(job_id, None)
     
     return {"message": "Job deleted successfully"}
\ No newline at end of file
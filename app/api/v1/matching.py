@@ -1,17 +1,21 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session, selectinload
 from app.core.deps import get_db, get_current_active_user
+from app.core.projections import loader_options, resolve_projection
+from app.core.serialization import models_response
+from app.core.tracing import span
 from app.models.user import User
 from app.models.resume import Resume
 from app.models.job import Job
-from app.models.match import Match, SkillGap
-from app.schemas.match import MatchResponse, MatchRequest
-from app.services.ai_service import AIService
+from app.models.match import Match
+from app.schemas.match import MatchResponse, MatchRequest, MatchSummary
+from app.services.ai_service import get_ai_service
+from app.services.llm_scheduler import llm_scope
+from app.services.match_freshness import apply_match_analysis, content_fingerprint, job_match_data, resume_match_data
 from app.models.analytics import Analytics
 
 router = APIRouter()
-ai_service = AIService()
 
 
 @router.post("/analyze", response_model=MatchResponse)
@@ -39,69 +43,47 @@ async def analyze_match(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    # Check if match already exists
-    existing_match = db.query(Match).filter(
+    # Prepare data for AI analysis
+    resume_data = resume_match_data(resume)
+    job_data = job_match_data(job)
+    resume_fingerprint = content_fingerprint(resume_data)
+    job_fingerprint = content_fingerprint(job_data)
+    
+    # Reuse an existing match unless the resume or job changed since it was scored;
+    # an auto match only has a local score, so asking for the analysis upgrades it
+    match = db.query(Match).options(selectinload(Match.skill_gaps)).filter(
         Match.user_id == current_user.id,
         Match.resume_id == match_request.resume_id,
         Match.job_id == match_request.job_id
     ).first()
     
-    if existing_match:
-        return existing_match
-    
-    # Prepare data for AI analysis
-    resume_data = {
-        "skills": resume.skills or [],
-        "experience_years": resume.experience_years,
-        "education_level": resume.education_level,
-        "parsed_data": resume.parsed_data or {}
-    }
-    
-    job_data = {
-        "required_skills": job.required_skills or [],
-        "preferred_skills": job.preferred_skills or [],
-        "experience_level": job.experience_level,
-        "education_requirement": job.education_requirement,
-        "description": job.description
-    }
+    if match and match.origin == "applicant" and not match.is_stale and (match.resume_fingerprint, match.job_fingerprint) in (
+        (resume_fingerprint, job_fingerprint), (None, None)
+    ):
+        return match
     
     # Calculate match score using AI
-    match_analysis = await ai_service.calculate_match_score(resume_data, job_data)
-    
-    # Generate resume suggestions
-    suggestions = await ai_service.generate_resume_suggestions(
-        resume_data, job_data, match_analysis
-    )
-    
-    # Create match record
-    match = Match(
-        user_id=current_user.id,
-        resume_id=match_request.resume_id,
-        job_id=match_request.job_id,
-        match_score=match_analysis.get("overall_score", 0),
-        skill_match_score=match_analysis.get("skill_match_score", 0),
-        experience_match_score=match_analysis.get("experience_match_score", 0),
-        education_match_score=match_analysis.get("education_match_score", 0),
-        overall_feedback=match_analysis.get("overall_feedback", ""),
-        resume_suggestions=suggestions
-    )
-    
-    db.add(match)
-    db.commit()
-    db.refresh(match)
-    
-    # Create skill gap records
-    missing_skills = match_analysis.get("missing_skills", [])
-    for skill_data in missing_skills:
-        skill_gap = SkillGap(
-            match_id=match.id,
-            missing_skill=skill_data.get("skill", ""),
-            importance=skill_data.get("importance", ""),
-            suggestion=skill_data.get("suggestion", "")
+    with llm_scope(user_id=current_user.id):
+        match_analysis = await get_ai_service().calculate_match_score(resume_data, job_data)
+        
+        # Generate resume suggestions
+        suggestions = await get_ai_service().generate_resume_suggestions(
+            resume_data, job_data, match_analysis
         )
-        db.add(skill_gap)
     
-    db.commit()
+    # Create or refresh the match record with its skill gaps in one transaction
+    if match is None:
+        match = Match(
+            user_id=current_user.id,
+            resume_id=match_request.resume_id,
+            job_id=match_request.job_id
+        )
+        db.add(match)
+    apply_match_analysis(match, match_analysis, suggestions)
+    match.resume_fingerprint = resume_fingerprint
+    match.job_fingerprint = job_fingerprint
+    match.is_stale = False
+    match.origin = "applicant"
     
     # Log analytics
     analytics = Analytics(
@@ -115,21 +97,34 @@ async def analyze_match(
         improvement_score=match.match_score
     )
     db.add(analytics)
-    db.commit()
+    with span("db.commit"):
+        db.flush()
+        match_id = match.id
+        db.commit()
     
-    # Refresh to get skill gaps
-    db.refresh(match)
+    # Reload the match and its skill gaps in two queries for the response
+    match = db.query(Match).options(selectinload(Match.skill_gaps)).filter(
+        Match.id == match_id
+    ).one()
     
     return match
 
 
-@router.get("/", response_model=List[MatchResponse])
+@router.get("/", response_model=List[Union[MatchResponse, MatchSummary]])
 def get_matches(
+    view: str = Query("full", pattern="^(full|summary)$"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return; overrides view"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """Get all matches for current user"""
-    return db.query(Match).filter(Match.user_id == current_user.id).all()
+    # Feedback, suggestions, cover letters and skill gaps are only loaded when selected
+    schema = resolve_projection(MatchResponse, MatchSummary, view, fields)
+    matches = db.query(Match).options(*loader_options(Match, schema)).filter(
+        Match.user_id == current_user.id,
+        Match.origin == "applicant"
+    ).all()
+    return models_response(schema, matches)
 
 
 @router.get("/{match_id}", response_model=MatchResponse)
@@ -139,9 +134,10 @@ def get_match(
     db: Session = Depends(get_db)
 ):
     """Get specific match"""
-    match = db.query(Match).filter(
+    match = db.query(Match).options(selectinload(Match.skill_gaps)).filter(
         Match.id == match_id,
-        Match.user_id == current_user.id
+        Match.user_id == current_user.id,
+        Match.origin == "applicant"
     ).first()
     
     if not match:
@@ -159,7 +155,8 @@ async def generate_cover_letter(
     """Generate cover letter for specific match"""
     match = db.query(Match).filter(
         Match.id == match_id,
-        Match.user_id == current_user.id
+        Match.user_id == current_user.id,
+        Match.origin == "applicant"
     ).first()
     
     if not match:
@@ -185,9 +182,10 @@ async def generate_cover_letter(
     }
     
     # Generate cover letter
-    cover_letter = await ai_service.generate_cover_letter(
-        resume_data, job_data, current_user.full_name
-    )
+    with llm_scope(user_id=current_user.id):
+        cover_letter = await get_ai_service().generate_cover_letter(
+            resume_data, job_data, current_user.full_name
+        )
     
     # Update match with cover letter
     match.cover_letter = cover_letter
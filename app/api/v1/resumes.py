@@ -1,43 +1,54 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from typing import List, Optional, Union
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, UploadFile, File
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from app.core.deps import get_db, get_current_active_user
+from app.core.projections import loader_options, resolve_projection
+from app.core.serialization import models_response
+from app.core.tracing import span
 from app.models.user import User
+from app.models.job import Job
 from app.models.resume import Resume
-from app.schemas.resume import ResumeResponse, ResumeUpdate
-from app.services.file_service import FileService
+from app.schemas.job import JobSimilarity, JobSkillFit
+from app.schemas.resume import ResumeResponse, ResumeSummary, ResumeUpdate
+from app.services.file_service import get_file_service
 from app.services.resume_parser import ResumeParser
-from app.services.ai_service import AIService
+from app.services.ai_service import get_ai_service
+from app.services.auto_matching import auto_match_resume
+from app.services.llm_scheduler import llm_scope
+from app.services.match_freshness import mark_matches_stale, rescore_stale_matches, resume_fingerprint
+from app.services.skills import get_skill_registry
 
 router = APIRouter()
-file_service = FileService()
 resume_parser = ResumeParser()
-ai_service = AIService()
+VECTOR_FIELDS = {"title", "extracted_text", "skills"}
 
 
 @router.post("/upload", response_model=ResumeResponse)
 async def upload_resume(
     title: str,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Upload and parse resume file"""
+    """Upload and parse resume file; it is offered to active jobs' pre-computed candidates in the background"""
     # Save file
-    file_path, original_filename = await file_service.save_file(file, current_user.id)
+    file_path, original_filename = await get_file_service().save_file(file, current_user.id)
     
-    # Extract text from file
-    extracted_text = resume_parser.extract_text(file_path)
+    # Extract text from file (CPU bound, keep it off the event loop)
+    extracted_text = await run_in_threadpool(resume_parser.extract_text, file_path)
     if not extracted_text:
         # Clean up file if parsing failed
-        file_service.delete_file(file_path)
+        get_file_service().delete_file(file_path)
         raise HTTPException(
             status_code=400,
             detail="Failed to extract text from file"
         )
     
     # Analyze resume with AI
-    parsed_data = await ai_service.analyze_resume(extracted_text)
+    with llm_scope(user_id=current_user.id):
+        parsed_data = await get_ai_service().analyze_resume(extracted_text)
     
     # Create resume record
     resume = Resume(
@@ -51,21 +62,39 @@ async def upload_resume(
         experience_years=parsed_data.get("experience_years"),
         education_level=parsed_data.get("education_level")
     )
+    # Imported here so numpy stays off the worker start path
+    from app.services.text_vectors import vectorize_resume
+    resume.text_vector = vectorize_resume(resume)
+    resume.content_fingerprint = resume_fingerprint(resume)
     
-    db.add(resume)
-    db.commit()
-    db.refresh(resume)
+    def save():
+        # Registering new skills and committing hit the database; keep both off the event loop
+        resume.skill_bits = get_skill_registry().encode(db, resume.skills)
+        with span("db.commit"):
+            db.add(resume)
+            db.commit()
+            db.refresh(resume)
+    
+    await run_in_threadpool(save)
+    background_tasks.add_task(auto_match_resume, resume.id)
     
     return resume
 
 
-@router.get("/", response_model=List[ResumeResponse])
+@router.get("/", response_model=List[Union[ResumeResponse, ResumeSummary]])
 def get_resumes(
+    view: str = Query("full", pattern="^(full|summary)$"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return; overrides view"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """Get all resumes for current user"""
-    return db.query(Resume).filter(Resume.user_id == current_user.id).all()
+    # Heavy columns (extracted_text, parsed_data) are only loaded when selected
+    schema = resolve_projection(ResumeResponse, ResumeSummary, view, fields)
+    resumes = db.query(Resume).options(*loader_options(Resume, schema)).filter(
+        Resume.user_id == current_user.id
+    ).all()
+    return models_response(schema, resumes)
 
 
 @router.get("/{resume_id}", response_model=ResumeResponse)
@@ -86,14 +115,96 @@ def get_resume(
     return resume
 
 
+@router.get("/{resume_id}/recommended-jobs", response_model=List[JobSimilarity])
+def get_recommended_jobs(
+    resume_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get active jobs most similar to a resume by text content"""
+    from app.services.job_search import job_vector_index
+    from app.services.text_vectors import decode, resume_text, term_vector
+    
+    resume = db.query(Resume).filter(
+        Resume.id == resume_id,
+        Resume.user_id == current_user.id
+    ).first()
+    
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    
+    vector = decode(resume.text_vector)
+    if vector is None:
+        vector = term_vector(resume_text(resume))
+    
+    with span("job_index.search"):
+        hits = job_vector_index.search(db, vector, limit)
+    return [{"job": job, "similarity": round(score, 4)} for job, score in hits]
+
+
+@router.get("/{resume_id}/skill-fit", response_model=List[JobSkillFit])
+def get_skill_fit(
+    resume_id: int,
+    min_score: float = Query(0, ge=0, le=100),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Rank active jobs by how well the resume covers their required and preferred skills"""
+    import numpy as np
+    from app.services.skill_bitsets import active_job_skill_bits, decode, pack, skill_overlap
+    skill_registry = get_skill_registry()
+    
+    resume = db.query(Resume).filter(
+        Resume.id == resume_id,
+        Resume.user_id == current_user.id
+    ).first()
+    
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    
+    resume_bits = resume.skill_bits if resume.skill_bits is not None else skill_registry.encode(db, resume.skills)
+    job_ids, required_bits, preferred_bits = active_job_skill_bits(db)
+    if not job_ids:
+        return []
+    
+    # One resume row against the whole job matrix
+    with span("skill_fit.score"):
+        words = max(len(blob) for blob in required_bits + preferred_bits + [resume_bits]) // 8
+        overlap = skill_overlap(
+            pack([resume_bits], words), pack(required_bits, words), pack(preferred_bits, words)
+        )
+        scores = overlap["skill_match_score"]
+        ranked = np.argsort(-scores, kind="stable")
+        ranked = ranked[scores[ranked] >= min_score][:limit]
+    
+    jobs = {job.id: job for job in db.query(Job).filter(Job.id.in_([job_ids[position] for position in ranked]))}
+    have = decode(resume_bits)
+    return [
+        {
+            "job": jobs[job_ids[position]],
+            "skill_match_score": round(float(scores[position]), 1),
+            "required_matched": int(overlap["required_matched"][position]),
+            "required_total": int(overlap["required_total"][position]),
+            "preferred_matched": int(overlap["preferred_matched"][position]),
+            "preferred_total": int(overlap["preferred_total"][position]),
+            "missing_required_skills": skill_registry.names(db, decode(required_bits[position]) & ~have),
+        }
+        for position in ranked
+        if job_ids[position] in jobs
+    ]
+
+
 @router.put("/{resume_id}", response_model=ResumeResponse)
 def update_resume(
     resume_id: int,
     resume_update: ResumeUpdate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Update resume"""
+    """Update resume; matches scored from its old content are re-scored in the background"""
     resume = db.query(Resume).filter(
         Resume.id == resume_id,
         Resume.user_id == current_user.id
@@ -102,12 +213,29 @@ def update_resume(
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
     
-    for field, value in resume_update.dict(exclude_unset=True).items():
+    changes = resume_update.dict(exclude_unset=True)
+    for field, value in changes.items():
         setattr(resume, field, value)
     
+    if VECTOR_FIELDS & changes.keys():
+        from app.services.text_vectors import vectorize_resume
+        resume.text_vector = vectorize_resume(resume)
+    
+    if "skills" in changes:
+        resume.skill_bits = get_skill_registry().encode(db, resume.skills)
+    
+    fingerprint = resume_fingerprint(resume)
+    content_changed = fingerprint != resume.content_fingerprint
+    if content_changed:
+        resume.content_fingerprint = fingerprint
+        mark_matches_stale(db, resume_id=resume.id)
+    
     db.commit()
     db.refresh(resume)
     
+    if content_changed:
+        background_tasks.add_task(rescore_stale_matches, resume_id=resume.id)
+    
     return resume
 
 
@@ -128,7 +256,7 @@ def delete_resume(
     
     # Delete file
     if resume.file_path:
-        file_service.delete_file(resume.file_path)
+        get_file_service().delete_file(resume.file_path)
     
     db.delete(resume)
     db.commit()
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1 import auth, resumes, jobs, matching, dashboard, analytics
+from app.api.v1 import auth, resumes, jobs, matching, dashboard, analytics, admin
 
 api_router = APIRouter()
 
@@ -8,4 +8,5 @@ api_router.include_router(resumes.router, prefix="/resumes", tags=["Resumes"])
 api_router.include_router(jobs.router, prefix="/jobs", tags=["Jobs"])
 api_router.include_router(matching.router, prefix="/matching", tags=["Matching"])
 api_router.include_router(dashboard.router, prefix="/dashboard", tags=["Dashboard"])
-api_router.include_router(analytics.router, prefix="/analytics", tags=["Analytics"])
\ No newline at end of file
+api_router.include_router(analytics.router, prefix="/analytics", tags=["Analytics"])
+api_router.include_router(admin.router, prefix="/admin", tags=["Admin"])
\ No newline at end of file
@@ -0,0 +1,84 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, NamedTuple, Optional
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+    validator: str
+    stored_at: float
+
+
+class ResponseCache:
+    """In-process LRU cache of rendered response bodies with a freshness window.
+
+    Entries younger than ``ttl_seconds`` are served without touching the database.
+    Older entries are kept so callers can revalidate them against a cheap
+    validator query and reuse the body when the validator is unchanged.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 30):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        return time.monotonic() - entry.stored_at < self.ttl_seconds
+
+    def set(self, key: Hashable, body: bytes, etag: str, validator: str) -> CachedResponse:
+        entry = CachedResponse(body, etag, validator, time.monotonic())
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def touch(self, key: Hashable, entry: CachedResponse) -> CachedResponse:
+        """Mark a revalidated entry as fresh again"""
+        return self.set(key, entry.body, entry.etag, entry.validator)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def make_etag(*parts) -> str:
+    """Build a weak ETag from the values that determine a representation"""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest[:20]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def cache_headers(etag: str, max_age: int, stale_while_revalidate: int = 0) -> dict:
+    """Headers that let browsers and CDNs cache a public response"""
+    cache_control = f"public, max-age={max_age}"
+    if stale_while_revalidate:
+        cache_control += f", stale-while-revalidate={stale_while_revalidate}"
+    return {"ETag": etag, "Cache-Control": cache_control}
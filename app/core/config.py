@@ -5,16 +5,124 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     APP_NAME: str = "SkillSync - AI Resume & Job Match Hub"
     APP_VERSION: str = "1.0.0"
+    DEBUG: bool = False
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     ALGORITHM: str = "HS256"
     
+    # Database (empty = SQLite under storage/db)
+    DATABASE_URL: str = os.getenv("DATABASE_URL", "")
+    DB_MIGRATE_ON_STARTUP: bool = True  # Run alembic upgrade head when a worker starts
+    
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12
+    BCRYPT_MIN_ROUNDS: int = 10  # Floor applied by calibration
+    BCRYPT_TARGET_MS: int = 0  # Calibrate rounds at startup for this hash time (0 = use BCRYPT_ROUNDS)
+    PASSWORD_HASH_WORKERS: int = 0  # 0 = one thread per CPU core
+    PASSWORD_HASH_QUEUE_LIMIT: int = 64  # Requests waiting for a hashing thread before we answer 503
+    
     # OpenAI Configuration
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
+    OPENAI_BASE_URL: str = os.getenv("OPENAI_BASE_URL", "")  # Point at a compatible server, e.g. the load-test stub
+    
+    # LLM backend
+    LLM_BACKEND: str = "openai"  # openai / local (deterministic heuristics, no network)
+    LLM_MODEL: str = "gpt-3.5-turbo"
+    
+    # LLM call ledger
+    LLM_LEDGER_FLUSH_SIZE: int = 50  # Buffered records before appending to storage/llm_ledger
+    LLM_LEDGER_FLUSH_SECONDS: float = 10.0
+    LLM_PRICING_PER_1K_TOKENS: dict = {  # model -> [prompt, completion] USD per 1K tokens
+        "gpt-3.5-turbo": [0.0005, 0.0015],
+        "gpt-4o-mini": [0.00015, 0.0006],
+        "gpt-4o": [0.0025, 0.01],
+    }
+    
+    # LLM call deadlines, retries, hedging and circuit breaking
+    LLM_DEADLINE_SECONDS: float = 30  # Time budget per AIService call, all retries and hedges included
+    LLM_TASK_DEADLINES: dict = {  # task -> seconds, overriding LLM_DEADLINE_SECONDS
+        "analyze_job_descriptions": 90,
+        "generate_cover_letter": 45,
+    }
+    LLM_MAX_RETRIES: int = 2  # Retries of timeouts, connection errors, 429s and 5xx answers
+    LLM_RETRY_BASE_SECONDS: float = 0.5  # Backoff before retry n is uniform in [0, base * 2^n]
+    LLM_RETRY_MAX_SECONDS: float = 8
+    LLM_HEDGE_ENABLED: bool = False  # Race a second request once an attempt outlives the task's p95
+    LLM_HEDGE_MIN_SAMPLES: int = 20  # Calls of a task observed before it is hedged
+    LLM_BREAKER_ERROR_RATE: float = 0.5  # Failed share of recent calls that opens the circuit
+    LLM_BREAKER_MIN_CALLS: int = 10
+    LLM_BREAKER_WINDOW_SECONDS: float = 60
+    LLM_BREAKER_COOLDOWN_SECONDS: float = 30  # Open time before one probe call is let through
+    LLM_FALLBACK_BACKEND: str = "local"  # Answers calls while the circuit is open; empty = fail fast
+    
+    # LLM scheduler (provider rate limits, shared by priority and per user)
+    LLM_RATE_LIMIT_RPM: int = 3500  # Provider requests/min for the whole deployment; 0 = unlimited
+    LLM_RATE_LIMIT_TPM: int = 90000  # Provider tokens/min for the whole deployment; 0 = unlimited
+    LLM_RATE_LIMIT_WORKERS: int = 0  # Processes sharing those budgets; 0 = WEB_CONCURRENCY or 1
+    LLM_RATE_LIMIT_BURST_SECONDS: float = 10  # Budget a worker may spend at once after idling
+    LLM_SCHEDULER_INTERACTIVE_RESERVE: float = 0.2  # Share of the budget background calls leave free
+    LLM_SCHEDULER_COMPLETION_TOKENS: int = 400  # Answer tokens assumed per request until usage is known
+    
+    # Batched LLM prompts (several job descriptions per completion)
+    LLM_BATCH_TOKEN_BUDGET: int = 6000  # Estimated description + answer tokens per batched request
+    LLM_BATCH_ANSWER_TOKENS_PER_ITEM: int = 250  # Answer tokens reserved in the budget for each item
+    LLM_BATCH_INITIAL_ITEMS: int = 4
+    LLM_BATCH_MAX_ITEMS: int = 16  # Upper bound for the adaptive batch size
+    LLM_BATCH_TARGET_LATENCY_MS: float = 30000  # Slower batches halve the batch size
+    
+    # Telemetry
+    METRICS_ENABLED: bool = True  # Expose Prometheus metrics at /metrics
+    SERVER_TIMING_ENABLED: bool = True
+    ACCESS_LOG_SAMPLE_RATE: float = 0.01  # Fraction of requests written to the access log
+    
+    # Tracing
+    TRACE_SAMPLE_RATE: float = 0.01  # Fraction of requests traced (head-based sampling)
+    TRACE_BUFFER_SIZE: int = 200  # Finished traces kept in memory for /api/v1/admin/traces
+    TRACE_EXPORT_PATH: str = ""  # Also append finished traces to this JSON-lines file
+    
+    # On-demand profiling (admin only)
+    PROFILER_MAX_SECONDS: int = 60
+    
+    # SQL instrumentation
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5  # Repetitions of one statement shape per request before flagging
+    SQL_SLOW_QUERY_MS: float = 200  # Log statements slower than this with parameters and plan (0 disables)
+    SQL_EXPLAIN_SLOW_QUERIES: bool = True
     
     # CORS settings
     CORS_ORIGINS: list = ["*"]
     
+    # Public job listing cache
+    JOB_CACHE_TTL_SECONDS: int = 30  # In-process freshness and Cache-Control max-age
+    JOB_CACHE_STALE_WHILE_REVALIDATE: int = 60
+    JOB_CACHE_MAX_ENTRIES: int = 512
+    
+    # Text vectors for similar-job search
+    TEXT_VECTOR_DIM: int = 512  # Hash buckets per vector; changing it re-vectorizes rows on the fly
+    JOB_ANN_ENABLED: bool = True  # Search the shared IVF index under storage/index once one is built
+    JOB_ANN_NLIST: int = 0  # Lists per build; 0 = sqrt(active jobs)
+    JOB_ANN_NPROBE: int = 8  # Lists scanned per query; higher = better recall, slower
+    
+    # Bulk job import (POST /api/v1/jobs/bulk)
+    JOB_IMPORT_CHUNK_ROWS: int = 500  # Rows validated and inserted per transaction
+    JOB_IMPORT_MAX_RECORD_BYTES: int = 1024 * 1024  # Longest CSV record / NDJSON line accepted
+    JOB_IMPORT_MAX_ERRORS: int = 1000  # Row errors kept on the import record (all are counted)
+    JOB_IMPORT_ENRICH_CONCURRENCY: int = 4  # Job analysis calls in flight per import
+    
+    # Re-scoring matches after resume/job edits
+    MATCH_RESCORE_ENGINE: str = "local"  # local (match_scoring, no LLM calls) / llm (background-priority AI calls)
+    MATCH_RESCORE_BATCH_SIZE: int = 100  # Stale matches re-scored per transaction
+    
+    # Pre-computed candidate matches for new jobs and resumes (local scorer, no LLM calls)
+    MATCH_AUTO_ENABLED: bool = True
+    MATCH_AUTO_TOP_N: int = 50  # Auto matches kept per job
+    MATCH_AUTO_MIN_SCORE: float = 50.0  # Weaker fits are not suggested
+    MATCH_AUTO_CHUNK_SIZE: int = 500  # Resumes (or jobs) scored per chunk
+    MATCH_AUTO_CHUNK_PAUSE_SECONDS: float = 0.05  # Pause between chunks so request handlers get the worker
+    MATCH_AUTO_CONCURRENCY: int = 1  # Scoring passes running at once per worker; others wait their turn
+    
+    # Recruiter candidate export (GET /api/v1/dashboard/candidates/{job_id}/export)
+    CANDIDATE_EXPORT_BATCH_ROWS: int = 1000  # Rows fetched and written to the response per batch
+    
     # File upload settings
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
     ALLOWED_FILE_EXTENSIONS: list = [".pdf", ".docx", ".txt"]
@@ -0,0 +1,147 @@
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional
+
+# Leaf frames where a thread is parked rather than running Python code
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),
+    ("socket.py", "accept"),
+    ("ssl.py", "read"),
+    ("connection.py", "_recv"),
+}
+
+
+class ProfilerBusy(Exception):
+    pass
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+def _is_idle(frame) -> bool:
+    return (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in IDLE_FRAMES
+
+
+class SamplingProfiler:
+    """Samples the Python stacks of every thread in this process on demand.
+
+    Nothing runs until ``sample`` is called, so there is no overhead while the
+    profiler is idle. ``wall`` mode records every thread at every tick; ``cpu``
+    mode skips threads whose innermost frame is a known blocking wait, which
+    approximates on-CPU time without OS support.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def sample(self, seconds: float, interval: float = 0.01, mode: str = "wall") -> Dict[str, int]:
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusy("A profiling session is already running in this worker")
+        try:
+            own_ident = threading.get_ident()
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            stacks: Counter = Counter()
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                for ident, frame in sys._current_frames().items():
+                    if ident == own_ident or (mode == "cpu" and _is_idle(frame)):
+                        continue
+                    labels: List[str] = []
+                    while frame is not None:
+                        labels.append(_frame_label(frame))
+                        frame = frame.f_back
+                    thread_name = names.get(ident)
+                    if thread_name is None:
+                        names = {thread.ident: thread.name for thread in threading.enumerate()}
+                        thread_name = names.get(ident, f"thread-{ident}")
+                    stacks[";".join([thread_name] + labels[::-1])] += 1
+                time.sleep(interval)
+            return dict(stacks)
+        finally:
+            self._lock.release()
+
+
+def to_collapsed(stacks: Dict[str, int]) -> str:
+    """Render samples in the collapsed format read by flamegraph.pl and speedscope"""
+    return "".join(f"{stack} {count}\n" for stack, count in sorted(stacks.items(), key=lambda item: -item[1]))
+
+
+class AllocationTracker:
+    """Wraps tracemalloc with named snapshots; tracing is off until ``start`` is called"""
+
+    def __init__(self, max_snapshots: int = 5):
+        self.max_snapshots = max_snapshots
+        self._snapshots: "OrderedDict[int, tracemalloc.Snapshot]" = OrderedDict()
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 10) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def stop(self) -> None:
+        tracemalloc.stop()
+        with self._lock:
+            self._snapshots.clear()
+
+    def take_snapshot(self) -> int:
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        with self._lock:
+            snapshot_id = self._next_id
+            self._next_id += 1
+            self._snapshots[snapshot_id] = snapshot
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return snapshot_id
+
+    def get(self, snapshot_id: int) -> Optional[tracemalloc.Snapshot]:
+        return self._snapshots.get(snapshot_id)
+
+    def snapshot_ids(self) -> List[int]:
+        return list(self._snapshots)
+
+    @staticmethod
+    def top(snapshot: tracemalloc.Snapshot, limit: int = 25, key_type: str = "lineno") -> List[Dict[str, Any]]:
+        return [
+            {
+                "location": str(stat.traceback),
+                "size_kb": round(stat.size / 1024, 1),
+                "count": stat.count,
+            }
+            for stat in snapshot.statistics(key_type)[:limit]
+        ]
+
+    @staticmethod
+    def diff(
+        base: tracemalloc.Snapshot, target: tracemalloc.Snapshot, limit: int = 25, key_type: str = "lineno"
+    ) -> List[Dict[str, Any]]:
+        return [
+            {
+                "location": str(stat.traceback),
+                "size_diff_kb": round(stat.size_diff / 1024, 1),
+                "size_kb": round(stat.size / 1024, 1),
+                "count_diff": stat.count_diff,
+            }
+            for stat in target.compare_to(base, key_type)[:limit]
+        ]
+
+
+sampling_profiler = SamplingProfiler()
+allocation_tracker = AllocationTracker()
@@ -0,0 +1,60 @@
+from functools import lru_cache
+from typing import List, Optional, Tuple, Type
+from fastapi import HTTPException
+from pydantic import BaseModel, ConfigDict, create_model
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only, selectinload
+
+
+@lru_cache(maxsize=256)
+def _projection_model(schema: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    definitions = {name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in fields}
+    return create_model(
+        f"{schema.__name__}Projection",
+        __config__=ConfigDict(from_attributes=True),
+        **definitions,
+    )
+
+
+def parse_fields(schema: Type[BaseModel], fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Parse a comma-separated ``fields`` parameter against a response schema"""
+    if not fields:
+        return None
+    requested = ["id"]
+    for name in fields.split(","):
+        name = name.strip()
+        if name and name not in requested:
+            requested.append(name)
+    unknown = [name for name in requested if name not in schema.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed fields: {', '.join(schema.model_fields)}"
+        )
+    return tuple(requested)
+
+
+def resolve_projection(
+    full_schema: Type[BaseModel],
+    summary_schema: Type[BaseModel],
+    view: str,
+    fields: Optional[str],
+) -> Type[BaseModel]:
+    """Pick the response schema for a listing: explicit fields, the summary view or the full payload"""
+    selected = parse_fields(full_schema, fields)
+    if selected:
+        return _projection_model(full_schema, selected)
+    if view == "summary":
+        return summary_schema
+    return full_schema
+
+
+def loader_options(model, schema: Type[BaseModel]) -> List:
+    """Query options that load only the columns and relationships a schema serializes"""
+    mapper = inspect(model)
+    columns = [getattr(model, attr.key) for attr in mapper.column_attrs if attr.key in schema.model_fields]
+    options = [load_only(*columns)]
+    for relationship in mapper.relationships:
+        if relationship.key in schema.model_fields:
+            options.append(selectinload(getattr(model, relationship.key)))
+    return options
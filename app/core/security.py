@@ -1,10 +1,22 @@
+import asyncio
+import contextvars
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union
-from jose import jwt
-from passlib.context import CryptContext
+from functools import lru_cache
+from typing import Any, Optional, Tuple, Union
+from fastapi import HTTPException, status
 from app.core.config import settings
+from app.core.tracing import span
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=1)
+def get_pwd_context():
+    """Build the passlib context on first use (passlib and bcrypt are slow to import)"""
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 
 
 def create_access_token(
@@ -16,14 +28,112 @@ def create_access_token(
         expire = datetime.utcnow() + timedelta(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
+    from jose import jwt
+
     to_encode = {"exp": expire, "sub": str(subject)}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
\ No newline at end of file
+    return get_pwd_context().hash(password)
+
+
+def configure_bcrypt_rounds(rounds: int) -> None:
+    """Set the work factor used for new hashes and for rehash-on-login"""
+    get_pwd_context().update(bcrypt__rounds=rounds)
+
+
+def calibrate_bcrypt_rounds(
+    target_ms: float, min_rounds: int = 4, max_rounds: int = 20
+) -> int:
+    """Return the highest bcrypt cost whose hash time on this host stays within target_ms"""
+    from passlib.context import CryptContext
+
+    chosen = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+        start = time.perf_counter()
+        context.hash("calibration-password")
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if elapsed_ms > target_ms and rounds > min_rounds:
+            break
+        chosen = rounds
+        # Each extra round doubles the cost, so stop before the next one overshoots
+        if elapsed_ms * 2 > target_ms:
+            break
+    return chosen
+
+
+def _traced_hash(password: str) -> str:
+    with span("password.hash"):
+        return get_pwd_context().hash(password)
+
+
+def _traced_verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    with span("password.verify"):
+        return get_pwd_context().verify_and_update(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    """Runs bcrypt on a dedicated, bounded thread pool.
+
+    Hashing is CPU bound and slow by design; keeping it off FastAPI's default
+    threadpool stops a burst of logins from starving every other sync endpoint.
+    Requests beyond ``workers + queue_limit`` are rejected with 503 instead of
+    piling up behind the pool.
+    """
+
+    def __init__(self, workers: int = 0, queue_limit: int = 64):
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_limit = queue_limit
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="password-hasher"
+            )
+        return self._executor
+
+    async def _run(self, func, *args):
+        if self._in_flight >= self.workers + self.queue_limit:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service is busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+        self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            # Carry the caller's context (e.g. the active trace span) onto the hashing thread
+            context = contextvars.copy_context()
+            return await loop.run_in_executor(self._get_executor(), context.run, func, *args)
+        finally:
+            self._in_flight -= 1
+
+    async def hash(self, password: str) -> str:
+        """Hash a password with the current work factor"""
+        return await self._run(_traced_hash, password)
+
+    async def verify_and_update(
+        self, plain_password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        """Verify a password and return a replacement hash if its cost is out of date"""
+        return await self._run(_traced_verify_and_update, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_limit=settings.PASSWORD_HASH_QUEUE_LIMIT,
+)
\ No newline at end of file
@@ -0,0 +1,57 @@
+import json
+from functools import lru_cache
+from typing import Any, Iterable, List, Type
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[schema])
+
+
+def dump_models(schema: Type[BaseModel], rows: Iterable[Any]) -> bytes:
+    """Validate ORM rows against a response schema and encode them straight to JSON bytes.
+
+    This replaces FastAPI's response_model path (validate, dump to Python
+    objects, re-encode with the stdlib json module) with a single validation
+    pass and pydantic-core's native encoder.
+    """
+    adapter = _list_adapter(schema)
+    return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+
+def dump_model(schema: Type[BaseModel], row: Any) -> bytes:
+    """Validate a single ORM row against a response schema and encode it to JSON bytes"""
+    return schema.model_validate(row).model_dump_json().encode("utf-8")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode plain Python content, using orjson when it is installed"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(
+        jsonable_encoder(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def models_response(schema: Type[BaseModel], rows: Iterable[Any], **kwargs) -> Response:
+    """Build a JSON response for a list endpoint without per-row revalidation by FastAPI.
+
+    Endpoints keep their ``response_model`` so the OpenAPI schema is unchanged;
+    returning a Response directly makes FastAPI skip its own serialization.
+    """
+    return Response(content=dump_models(schema, rows), media_type="application/json", **kwargs)
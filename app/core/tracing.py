@@ -0,0 +1,222 @@
+import json
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from contextvars import ContextVar
+from time import perf_counter_ns
+from typing import Any, Deque, Dict, List, Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    """A timed unit of work inside a sampled trace"""
+
+    __slots__ = ("trace", "span_id", "parent_id", "name", "start_ns", "start_time", "duration_ms", "attributes", "status", "_token")
+
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = perf_counter_ns()
+        self.start_time = time.time()
+        self.duration_ms: Optional[float] = None
+        self.attributes = attributes
+        self.status = "ok"
+        self._token = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # A request's root span has already finished if its response was sent
+        if self.duration_ms is None:
+            if exc is not None:
+                self.status = "error"
+                self.attributes["error"] = f"{exc_type.__name__}: {exc}"[:200]
+            self.finish()
+        _current_span.reset(self._token)
+
+    def finish(self, end_ns: Optional[int] = None) -> None:
+        self.duration_ms = round(((end_ns or perf_counter_ns()) - self.start_ns) / 1_000_000, 3)
+        self.trace.spans.append(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_time": self.start_time,
+            "offset_ms": round((self.start_ns - self.trace.start_ns) / 1_000_000, 3),
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Returned for unsampled requests so instrumented code costs a ContextVar lookup"""
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    def __init__(self, name: str):
+        self.trace_id = uuid.uuid4().hex
+        self.name = name
+        self.start_ns = perf_counter_ns()
+        self.start_time = time.time()
+        # list.append is atomic, so spans may finish on executor threads
+        self.spans: List[Span] = []
+        self.ended = False  # Response sent; later work (background tasks) is not part of the trace
+
+    def to_dict(self) -> Dict[str, Any]:
+        spans = sorted(self.spans, key=lambda item: item.start_ns)
+        root = next((item for item in spans if item.parent_id is None), None)
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "start_time": self.start_time,
+            "duration_ms": root.duration_ms if root else None,
+            "status": root.status if root else "ok",
+            "attributes": root.attributes if root else {},
+            "spans": [item.to_dict() for item in spans],
+        }
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def span(name: str, **attributes: Any):
+    """Open a child span of the current span, or a no-op when the request is not sampled.
+
+    Usable as ``with span("resume.extract_text", format=".pdf"):`` in sync and
+    async code. Context is carried by a ContextVar, so it follows awaits and
+    ``run_in_threadpool``; raw executors need ``contextvars.copy_context()``.
+    """
+    parent = _current_span.get()
+    if parent is None or parent.trace.ended:
+        return NOOP_SPAN
+    return Span(parent.trace, name, parent.span_id, attributes)
+
+
+def record_span(name: str, start_ns: int, end_ns: int, **attributes: Any) -> None:
+    """Attach an already-timed operation (e.g. a SQL statement) to the current trace"""
+    parent = _current_span.get()
+    if parent is None or parent.trace.ended:
+        return
+    child = Span(parent.trace, name, parent.span_id, attributes)
+    child.start_ns = start_ns
+    child.start_time = time.time() - (perf_counter_ns() - start_ns) / 1_000_000_000
+    child.finish(end_ns)
+
+
+class TraceExporter:
+    """Keeps finished traces in a ring buffer and optionally appends them to a JSON-lines file"""
+
+    def __init__(self, capacity: int = 200, path: str = ""):
+        self._buffer: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, trace: Trace) -> None:
+        data = trace.to_dict()
+        self._buffer.append(data)
+        if self.path:
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(data, default=str) + "\n")
+            except OSError as e:
+                logger.error(f"Failed to export trace: {e}")
+
+    def recent(self) -> List[Dict[str, Any]]:
+        return list(self._buffer)
+
+    def get(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        return next((data for data in self._buffer if data["trace_id"] == trace_id), None)
+
+
+class TracingMiddleware:
+    """Pure ASGI middleware starting a root span for a head-sampled fraction of requests.
+
+    The root span ends, and the trace is exported, once the last byte of the
+    response is sent; background tasks that run after it are not traced.
+    """
+
+    def __init__(self, app, exporter: TraceExporter, sample_rate: float = 0.01):
+        self.app = app
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.sample_rate or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace(f"{scope['method']} {scope['path']}")
+        root = Span(trace, "http.request", None, {"method": scope["method"], "path": scope["path"]})
+        status_code = 500
+
+        def end() -> None:
+            if trace.ended:
+                return
+            trace.ended = True
+            route = getattr(scope.get("route"), "path", None)
+            if route:
+                trace.name = f"{scope['method']} {route}"
+                root.attributes["route"] = route
+            root.attributes["status"] = status_code
+            if root.duration_ms is None:
+                root.finish()
+            self.exporter.export(trace)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-trace-id", trace.trace_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                # Background tasks run after this inside the app; they are not the request's latency
+                end()
+
+        try:
+            with root:
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            # No complete response was sent (an error or a client disconnect)
+            end()
+
+
+trace_exporter = TraceExporter(capacity=settings.TRACE_BUFFER_SIZE, path=settings.TRACE_EXPORT_PATH)
@@ -0,0 +1,234 @@
+import logging
+import re
+from contextvars import ContextVar
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.telemetry import metrics
+from app.core.tracing import record_span
+
+logger = logging.getLogger(__name__)
+
+sql_query_duration_seconds = metrics.histogram(
+    "sql_query_duration_seconds",
+    "SQL statement execution time by statement type",
+    ("operation",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+sql_queries_per_request = metrics.histogram(
+    "sql_queries_per_request",
+    "SQL statements issued per HTTP request by route template",
+    ("route",),
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+sql_n_plus_one_total = metrics.counter(
+    "sql_n_plus_one_total",
+    "Requests where a statement shape repeated above the N+1 threshold, by route template",
+    ("route",),
+)
+sql_slow_queries_total = metrics.counter("sql_slow_queries_total", "Statements slower than SQL_SLOW_QUERY_MS")
+
+_IN_LIST = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)|\((?:\s*%\(\w+\)s\s*,)+\s*%\(\w+\)s\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so executions that differ only in bound values compare equal"""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    return _IN_LIST.sub("(?, ...)", shape)
+
+
+class RequestQueryStats:
+    """Statements executed while serving one request, grouped by shape"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.shapes: Dict[str, List[float]] = {}
+        self.finished = False  # Response sent; later statements belong to background tasks
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_time += elapsed
+        entry = self.shapes.setdefault(statement_shape(statement), [0, 0.0])
+        entry[0] += 1
+        entry[1] += elapsed
+
+    def repeated_shapes(self, threshold: int) -> List[Tuple[str, int, float]]:
+        """Shapes executed more than ``threshold`` times, the usual signature of an N+1"""
+        return sorted(
+            ((shape, int(count), elapsed) for shape, (count, elapsed) in self.shapes.items() if count > threshold),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+
+
+_request_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def current_query_stats() -> Optional[RequestQueryStats]:
+    return _request_stats.get()
+
+
+def _explain(conn, statement: str, parameters) -> Optional[str]:
+    if not statement.lstrip().upper().startswith("SELECT"):
+        return None
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    try:
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            cursor.execute(prefix + statement, parameters)
+            return "\n".join(" | ".join(str(column) for column in row) for row in cursor.fetchall())
+        finally:
+            cursor.close()
+    except Exception as exc:
+        return f"unavailable ({exc})"
+
+
+def install_sql_instrumentation(
+    engine: Engine, slow_query_ms: float = 200, explain_slow_queries: bool = True
+) -> None:
+    """Time every statement on ``engine`` and attribute it to the current request"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(perf_counter_ns())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        end = perf_counter_ns()
+        start = conn.info["query_start_time"].pop()
+        elapsed = (end - start) / 1_000_000_000
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "UNKNOWN"
+        sql_query_duration_seconds.observe(elapsed, operation)
+
+        stats = _request_stats.get()
+        if stats is not None and not stats.finished:
+            stats.record(statement, elapsed)
+        record_span("sql." + operation.lower(), start, end, statement=statement_shape(statement)[:300])
+
+        if slow_query_ms and elapsed * 1000 >= slow_query_ms:
+            sql_slow_queries_total.inc()
+            plan = _explain(conn, statement, parameters) if explain_slow_queries and not executemany else None
+            logger.warning(
+                f"Slow query ({elapsed * 1000:.1f}ms): {_WHITESPACE.sub(' ', statement).strip()} "
+                f"params={repr(parameters)[:500]}" + (f"\nplan:\n{plan}" if plan else "")
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        # A failed statement never reaches after_cursor_execute; drop its start time so the
+        # pooled connection's later timings stay paired
+        if context.connection is not None:
+            started = context.connection.info.get("query_start_time")
+            if started:
+                started.pop()
+
+
+class SQLInstrumentationMiddleware:
+    """Pure ASGI middleware collecting per-request SQL statistics.
+
+    Counts and times statements per request, flags statement shapes repeated
+    more than ``n_plus_one_threshold`` times and records both in /metrics. In
+    debug mode the numbers are also returned as ``X-SQL-*`` response headers.
+    """
+
+    def __init__(self, app, n_plus_one_threshold: int = 5, debug_headers: bool = False, server_timing: bool = True):
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.debug_headers = debug_headers
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _request_stats.set(stats)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and (self.debug_headers or self.server_timing):
+                headers = list(message.get("headers", []))
+                if self.server_timing:
+                    headers.append((b"server-timing", f"db;dur={stats.total_time * 1000:.2f}".encode("latin-1")))
+                if self.debug_headers:
+                    repeated = stats.repeated_shapes(self.n_plus_one_threshold)
+                    headers.append((b"x-sql-queries", str(stats.count).encode("latin-1")))
+                    headers.append((b"x-sql-time-ms", f"{stats.total_time * 1000:.2f}".encode("latin-1")))
+                    headers.append((b"x-sql-n-plus-one", str(len(repeated)).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                # Background tasks run after this in the same context; they are not the request's queries
+                stats.finished = True
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_stats.reset(token)
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            sql_queries_per_request.observe(stats.count, route)
+            repeated = stats.repeated_shapes(self.n_plus_one_threshold)
+            if repeated:
+                sql_n_plus_one_total.inc(route)
+                for shape, count, elapsed in repeated:
+                    logger.warning(
+                        f"Possible N+1 in {scope['method']} {route}: {count} executions "
+                        f"({elapsed * 1000:.1f}ms total) of {shape}"
+                    )
+
+
+class QueryCounter:
+    """Records every statement executed on an engine while the context is active"""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.statements: List[str] = []
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+def assert_constant_query_count(
+    engine: Engine,
+    seed: Callable[[int], Any],
+    call: Callable[[], Any],
+    sizes: Iterable[int] = (1, 5, 25),
+) -> Dict[int, int]:
+    """Fail if the number of queries issued by ``call`` grows with the result size.
+
+    For each size, ``seed(size)`` prepares that many rows (not counted) and
+    ``call()`` runs the code under test, typically a listing endpoint through
+    a TestClient. Raises AssertionError listing the statements of the first and
+    last run when the counts differ, which is how N+1 lazy loads show up.
+    """
+    counts: Dict[int, int] = {}
+    runs: Dict[int, List[str]] = {}
+    for size in sizes:
+        seed(size)
+        with QueryCounter(engine) as counter:
+            call()
+        counts[size] = counter.count
+        runs[size] = counter.statements
+
+    if len(set(counts.values())) > 1:
+        first, last = min(counts), max(counts)
+        raise AssertionError(
+            f"Query count grows with result size: {counts}\n"
+            f"--- {first} rows ---\n" + "\n".join(runs[first]) + "\n"
+            f"--- {last} rows ---\n" + "\n".join(runs[last])
+        )
+    return counts
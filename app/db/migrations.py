@@ -0,0 +1,55 @@
+import logging
+import re
+from pathlib import Path
+from typing import Set
+from sqlalchemy import inspect, text
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+VERSIONS_DIR = PROJECT_ROOT / "alembic" / "versions"
+BASELINE_REVISION = "001"  # Schema the old import-time create_all produced
+
+_REVISION_PATTERN = re.compile(r"^(down_revision|revision)\s*=\s*['\"]?([\w]+)?['\"]?", re.MULTILINE)
+
+
+def head_revisions() -> Set[str]:
+    """Head revisions read straight from the version files, without importing alembic"""
+    revisions, parents = set(), set()
+    for path in VERSIONS_DIR.glob("*.py"):
+        fields = dict(_REVISION_PATTERN.findall(path.read_text()))
+        if fields.get("revision"):
+            revisions.add(fields["revision"])
+        if fields.get("down_revision") and fields["down_revision"] != "None":
+            parents.add(fields["down_revision"])
+    return revisions - parents
+
+
+def run_migrations() -> None:
+    """Upgrade the database to the latest alembic revision.
+
+    Workers usually start against an up-to-date schema, so that case is
+    answered with one query and alembic is only imported when there is work
+    to do. Databases created before migrations ran at startup have the tables
+    but no alembic_version row; they are stamped at the baseline revision
+    first so the initial migration is not replayed over existing tables.
+    """
+    with engine.connect() as connection:
+        tables = set(inspect(connection).get_table_names())
+        if "alembic_version" in tables:
+            current = {row[0] for row in connection.execute(text("SELECT version_num FROM alembic_version"))}
+            if current == head_revisions():
+                return
+
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(str(PROJECT_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(PROJECT_ROOT / "alembic"))
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        if "users" in tables and "alembic_version" not in tables:
+            logger.info(f"Existing schema has no migration history, stamping revision {BASELINE_REVISION}")
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, "head")
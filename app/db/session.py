@@ -2,17 +2,26 @@ import os
 from pathlib import Path
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.db.instrumentation import install_sql_instrumentation
 
-# Use current working directory if /app doesn't exist
-base_path = Path("/app") if Path("/app").exists() else Path.cwd()
-DB_DIR = base_path / "storage" / "db"
-DB_DIR.mkdir(parents=True, exist_ok=True)
-
-SQLALCHEMY_DATABASE_URL = f"sqlite:///{DB_DIR}/db.sqlite"
+if settings.DATABASE_URL:
+    SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+else:
+    # Use current working directory if /app doesn't exist
+    base_path = Path("/app") if Path("/app").exists() else Path.cwd()
+    DB_DIR = base_path / "storage" / "db"
+    DB_DIR.mkdir(parents=True, exist_ok=True)
+    SQLALCHEMY_DATABASE_URL = f"sqlite:///{DB_DIR}/db.sqlite"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False}
+    connect_args={"check_same_thread": False} if SQLALCHEMY_DATABASE_URL.startswith("sqlite") else {}
+)
+install_sql_instrumentation(
+    engine,
+    slow_query_ms=settings.SQL_SLOW_QUERY_MS,
+    explain_slow_queries=settings.SQL_EXPLAIN_SLOW_QUERIES,
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -2,4 +2,6 @@ from .user import User
 from .resume import Resume
 from .job import Job
 from .match import Match, SkillGap
-from .analytics import Analytics
\ No newline at end of file
+from .analytics import Analytics
+from .skill import Skill
+from .job_import import JobImport
\ No newline at end of file
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Boolean, LargeBinary
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from app.db.base import Base
 
 
@@ -21,9 +21,14 @@ class Job(Base):
     experience_level = Column(String, nullable=True)  # entry, mid, senior
     education_requirement = Column(String, nullable=True)
     is_active = Column(Boolean, default=True)
+    content_fingerprint = Column(String, nullable=True)  # Hash of the fields matches are scored from
+    import_id = Column(Integer, ForeignKey("job_imports.id"), nullable=True, index=True)  # Set by POST /jobs/bulk
+    required_skill_bits = Column(LargeBinary, nullable=True)  # Skill ids as a bitset (app.services.skill_bitsets)
+    preferred_skill_bits = Column(LargeBinary, nullable=True)
+    text_vector = deferred(Column(LargeBinary, nullable=True))  # float32 hashed term vector (app.services.text_vectors)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
     recruiter = relationship("User", back_populates="jobs")
-    matches = relationship("Match", back_populates="job")
\ No newline at end of file
+    matches = relationship("Match", back_populates="job", cascade="all, delete-orphan")
\ No newline at end of file
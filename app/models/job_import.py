@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+
+class JobImport(Base):
+    __tablename__ = "job_imports"
+
+    id = Column(Integer, primary_key=True, index=True)
+    recruiter_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    format = Column(String, nullable=False)  # csv, ndjson
+    status = Column(String, nullable=False, default="receiving")  # receiving, enriching, completed, failed
+    rows_total = Column(Integer, default=0)
+    rows_imported = Column(Integer, default=0)
+    rows_failed = Column(Integer, default=0)
+    rows_enriched = Column(Integer, default=0)
+    enrichment_failed = Column(Integer, default=0)
+    errors = Column(JSON, nullable=True)  # First JOB_IMPORT_MAX_ERRORS row errors: {"row", "errors"}
+    detail = Column(String, nullable=True)  # Why the import failed as a whole
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
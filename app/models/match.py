@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Float
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Float, Boolean, false
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
@@ -18,6 +18,11 @@ class Match(Base):
     overall_feedback = Column(Text, nullable=True)
     resume_suggestions = Column(JSON, nullable=True)  # AI suggestions for resume improvement
     cover_letter = Column(Text, nullable=True)  # Generated cover letter
+    resume_fingerprint = Column(String, nullable=True)  # Content fingerprints the scores were computed from
+    job_fingerprint = Column(String, nullable=True)
+    is_stale = Column(Boolean, default=False, server_default=false(), nullable=False, index=True)  # Resume or job edited since scoring
+    # applicant (requested through /matching/analyze) or auto (pre-computed candidate for the job's recruiter)
+    origin = Column(String, default="applicant", server_default="applicant", nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -25,7 +30,7 @@ class Match(Base):
     user = relationship("User", back_populates="matches")
     resume = relationship("Resume", back_populates="matches")
     job = relationship("Job", back_populates="matches")
-    skill_gaps = relationship("SkillGap", back_populates="match")
+    skill_gaps = relationship("SkillGap", back_populates="match", cascade="all, delete-orphan")
 
 
 class SkillGap(Base):
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, LargeBinary
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from app.db.base import Base
 
 
@@ -17,9 +17,12 @@ class Resume(Base):
     skills = Column(JSON, nullable=True)  # Extracted skills
     experience_years = Column(Integer, nullable=True)
     education_level = Column(String, nullable=True)
+    content_fingerprint = Column(String, nullable=True)  # Hash of the fields matches are scored from
+    skill_bits = Column(LargeBinary, nullable=True)  # Skill ids as a bitset (app.services.skill_bitsets)
+    text_vector = deferred(Column(LargeBinary, nullable=True))  # float32 hashed term vector (app.services.text_vectors)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
     user = relationship("User", back_populates="resumes")
-    matches = relationship("Match", back_populates="resume")
\ No newline at end of file
+    matches = relationship("Match", back_populates="resume", cascade="all, delete-orphan")
\ No newline at end of file
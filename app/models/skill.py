@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+
+class Skill(Base):
+    __tablename__ = "skills"
+
+    id = Column(Integer, primary_key=True, index=True)  # Bit position in skill bitsets; never reused
+    name = Column(String, unique=True, index=True, nullable=False)  # Canonical name (app.services.skills)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,5 +1,6 @@
 from .user import User, UserCreate, UserUpdate, UserResponse, Token
-from .resume import Resume, ResumeCreate, ResumeUpdate, ResumeResponse
-from .job import Job, JobCreate, JobUpdate, JobResponse
-from .match import Match, MatchResponse, SkillGap, SkillGapResponse
-from .analytics import Analytics, AnalyticsCreate, AnalyticsResponse
\ No newline at end of file
+from .resume import Resume, ResumeCreate, ResumeUpdate, ResumeResponse, ResumeSummary
+from .job import Job, JobCreate, JobUpdate, JobResponse, JobSimilarity, JobSkillFit
+from .match import Match, MatchResponse, MatchSummary, SkillGap, SkillGapResponse
+from .analytics import Analytics, AnalyticsCreate, AnalyticsResponse
+from .job_import import JobImportResponse
\ No newline at end of file
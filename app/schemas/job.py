@@ -48,4 +48,19 @@ class JobResponse(JobBase):
 
 
 class Job(JobResponse):
-    pass
\ No newline at end of file
+    pass
+
+
+class JobSimilarity(BaseModel):
+    job: JobResponse
+    similarity: float
+
+
+class JobSkillFit(BaseModel):
+    job: JobResponse
+    skill_match_score: float
+    required_matched: int
+    required_total: int
+    preferred_matched: int
+    preferred_total: int
+    missing_required_skills: List[str]
\ No newline at end of file
@@ -0,0 +1,23 @@
+from typing import Optional, List, Dict, Any
+from pydantic import BaseModel
+from datetime import datetime
+
+
+class JobImportResponse(BaseModel):
+    id: int
+    recruiter_id: int
+    format: str
+    status: str
+    rows_total: int
+    rows_imported: int
+    rows_failed: int
+    rows_enriched: int
+    enrichment_failed: int
+    errors: Optional[List[Dict[str, Any]]] = None
+    detail: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
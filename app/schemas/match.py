@@ -38,6 +38,25 @@ class MatchResponse(MatchBase):
     resume_id: int
     job_id: int
     skill_gaps: Optional[List[SkillGapResponse]] = None
+    is_stale: bool = False  # Re-scoring after a resume or job edit is pending
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class MatchSummary(BaseModel):
+    """Listing view of a match without feedback, suggestions, cover letter or skill gaps"""
+    id: int
+    user_id: int
+    resume_id: int
+    job_id: int
+    match_score: float
+    skill_match_score: Optional[float] = None
+    experience_match_score: Optional[float] = None
+    education_match_score: Optional[float] = None
+    is_stale: bool = False
     created_at: datetime
     updated_at: Optional[datetime] = None
 
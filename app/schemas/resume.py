@@ -37,5 +37,21 @@ class ResumeResponse(ResumeBase):
         from_attributes = True
 
 
+class ResumeSummary(BaseModel):
+    """Listing view of a resume without the extracted text and parsed data"""
+    id: int
+    user_id: int
+    title: str
+    original_filename: Optional[str] = None
+    skills: Optional[List[str]] = None
+    experience_years: Optional[int] = None
+    education_level: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
 class Resume(ResumeResponse):
     pass
\ No newline at end of file
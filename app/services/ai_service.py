@@ -1,12 +1,113 @@
-from openai import OpenAI
-from typing import Dict, List, Any
+from functools import lru_cache
+from typing import Dict, List, Any, Optional
 from app.core.config import settings
+from app.core.tracing import span
+from app.services.llm_backends import LLMBackend, _estimate_tokens, create_backend
+from app.services.llm_batching import AdaptiveBatchSize, llm_batch_items_total, take_batch
+from app.services.llm_ledger import LLMCallRecord, estimate_cost, llm_ledger
+from app.services.llm_resilience import (
+    CircuitOpenError,
+    ResilientCaller,
+    llm_call_duration_seconds,
+    llm_calls_total,
+)
+from app.services.llm_scheduler import get_llm_scheduler, llm_priority
+import asyncio
 import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+JOB_ANALYSIS_LIST_FIELDS = ("required_skills", "preferred_skills", "key_responsibilities", "company_benefits")
+JOB_ANALYSIS_TEXT_FIELDS = ("experience_level", "education_requirement", "job_type", "remote_option")
+
+
+def _valid_job_analysis(data: Any) -> bool:
+    """Whether a job analysis has the skill lists and the field types the prompt asks for"""
+    if not isinstance(data, dict) or "required_skills" not in data or "preferred_skills" not in data:
+        return False
+    for field in JOB_ANALYSIS_LIST_FIELDS:
+        value = data.get(field, [])
+        if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+            return False
+    return all(isinstance(data.get(field, ""), str) for field in JOB_ANALYSIS_TEXT_FIELDS)
 
 
 class AIService:
-    def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+    def __init__(self, backend: Optional[LLMBackend] = None):
+        self.backend = backend or create_backend()
+        self.model = self.backend.model
+        self.job_batch_size = AdaptiveBatchSize(
+            "analyze_job_descriptions",
+            initial=settings.LLM_BATCH_INITIAL_ITEMS,
+            maximum=settings.LLM_BATCH_MAX_ITEMS,
+            target_latency_ms=settings.LLM_BATCH_TARGET_LATENCY_MS
+        )
+        fallback = None
+        if settings.LLM_FALLBACK_BACKEND and settings.LLM_FALLBACK_BACKEND.lower() != self.backend.name:
+            fallback = create_backend(settings.LLM_FALLBACK_BACKEND)
+        # Only providers with quotas go through the shared rate-limit scheduler
+        scheduler = get_llm_scheduler() if self.backend.rate_limited else None
+        self.caller = ResilientCaller(self.backend, fallback, scheduler)
+
+    async def _complete(
+        self,
+        task: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        context: Dict[str, Any],
+        parse_json: bool = True,
+        call: Optional[LLMCallRecord] = None
+    ) -> Any:
+        """Run one completion for ``task`` through the resilient caller and record it in the LLM ledger.
+
+        Pass ``call`` to read the ledger record (e.g. its queue time) afterwards.
+        """
+        call = call or LLMCallRecord(task=task, model=self.model, priority=llm_priority.get())
+        start = time.perf_counter()
+        tokens = sum(_estimate_tokens(m.get("content") or "") for m in messages)
+        tokens += settings.LLM_SCHEDULER_COMPLETION_TOKENS
+
+        def request(backend: LLMBackend):
+            if parse_json:
+                return backend.complete_json(task, messages, temperature, context)
+            # Prose answers are streamed, which is what time to first token is measured on
+            return backend.complete_streaming(task, messages, temperature, context)
+
+        with span("llm.complete", task=task, model=self.model, backend=self.backend.name) as llm_span:
+            try:
+                completion = await self.caller.complete(task, request, call, tokens)
+                
+                call.prompt_tokens = completion.prompt_tokens
+                call.completion_tokens = completion.completion_tokens
+                call.cached_prompt_tokens = completion.cached_prompt_tokens
+                call.time_to_first_token_ms = completion.time_to_first_token_ms
+                call.cache_status = "hit" if call.cached_prompt_tokens else "miss"
+                call.cost_usd = estimate_cost(call.model, call.prompt_tokens, call.completion_tokens)
+                
+                return completion.data if parse_json else completion.text
+            except json.JSONDecodeError as e:
+                call.outcome = "invalid_json"
+                call.error = str(e)[:200]
+                raise
+            except (asyncio.TimeoutError, CircuitOpenError) as e:
+                # The caller already set the timeout / short_circuited outcome
+                call.error = f"{type(e).__name__}: {e}"[:200]
+                raise
+            except Exception as e:
+                call.outcome = "error"
+                call.error = f"{type(e).__name__}: {e}"[:200]
+                raise
+            finally:
+                call.wall_time_ms = round((time.perf_counter() - start) * 1000, 2)
+                llm_ledger.record(call)
+                llm_calls_total.inc(task, call.outcome)
+                llm_call_duration_seconds.observe(call.wall_time_ms / 1000, task)
+                llm_span.set_attribute("outcome", call.outcome)
+                llm_span.set_attribute("tokens", call.prompt_tokens + call.completion_tokens)
+                llm_span.set_attribute("retries", call.retry_count)
+                llm_span.set_attribute("queue_ms", call.queue_ms)
 
     async def analyze_resume(self, resume_text: str) -> Dict[str, Any]:
         """Extract structured data from resume text using AI"""
@@ -45,19 +146,17 @@ class AIService:
         """
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
+            return await self._complete(
+                "analyze_resume",
+                [
                     {"role": "system", "content": "You are an expert resume analyzer. Return only valid JSON."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.1
+                temperature=0.1,
+                context={"resume_text": resume_text}
             )
-            
-            result = response.choices[0].message.content
-            return json.loads(result)
         except Exception as e:
-            print(f"Error analyzing resume: {e}")
+            logger.error(f"Error analyzing resume: {e}")
             return {}
 
     async def analyze_job_description(self, job_description: str) -> Dict[str, Any]:
@@ -81,21 +180,119 @@ class AIService:
         """
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
+            return await self._complete(
+                "analyze_job_description",
+                [
                     {"role": "system", "content": "You are an expert job description analyzer. Return only valid JSON."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.1
+                temperature=0.1,
+                context={"job_description": job_description}
             )
-            
-            result = response.choices[0].message.content
-            return json.loads(result)
         except Exception as e:
-            print(f"Error analyzing job description: {e}")
+            logger.error(f"Error analyzing job description: {e}")
             return {}
 
+    async def analyze_job_descriptions(self, job_descriptions: List[str], concurrency: int = 1) -> List[Dict[str, Any]]:
+        """Analyze many job descriptions, packing several into each completion.
+
+        Batches are cut to LLM_BATCH_TOKEN_BUDGET and to the adaptive batch
+        size; items a batched answer leaves out or gets wrong are retried one
+        by one with analyze_job_description. Results come back in input order,
+        with {} for descriptions that could not be analyzed.
+        """
+        results: List[Dict[str, Any]] = [{} for _ in job_descriptions]
+        position = 0
+
+        async def worker():
+            nonlocal position
+            while position < len(job_descriptions):
+                batch = take_batch(
+                    job_descriptions, position, self.job_batch_size.value,
+                    settings.LLM_BATCH_TOKEN_BUDGET, self._job_batch_tokens
+                )
+                position = batch[-1] + 1
+                if len(batch) == 1:
+                    llm_batch_items_total.inc("analyze_job_descriptions", "single")
+                    results[batch[0]] = await self.analyze_job_description(job_descriptions[batch[0]])
+                    continue
+                answers = await self._analyze_job_batch([job_descriptions[index] for index in batch])
+                for index, answer in zip(batch, answers):
+                    if answer is not None:
+                        results[index] = answer
+                        llm_batch_items_total.inc("analyze_job_descriptions", "batched")
+                for index, answer in zip(batch, answers):
+                    if answer is None:
+                        llm_batch_items_total.inc("analyze_job_descriptions", "fallback")
+                        results[index] = await self.analyze_job_description(job_descriptions[index])
+
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+        return results
+
+    @staticmethod
+    def _job_batch_tokens(job_description: str) -> int:
+        return _estimate_tokens(job_description) + settings.LLM_BATCH_ANSWER_TOKENS_PER_ITEM
+
+    async def _analyze_job_batch(self, job_descriptions: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """One batched completion; None marks items to retry on their own"""
+        jobs = "\n\n".join(
+            f'<job index="{index}">\n{description}\n</job>' for index, description in enumerate(job_descriptions)
+        )
+        prompt = f"""
+        Analyze each of the following {len(job_descriptions)} job descriptions separately and extract structured information:
+        
+        {jobs}
+        
+        Please return a JSON object with one entry in "results" per job description, "index" being its index:
+        {{
+            "results": [
+                {{
+                    "index": number,
+                    "required_skills": ["skill1", "skill2", ...],
+                    "preferred_skills": ["skill1", "skill2", ...],
+                    "experience_level": "entry/mid/senior",
+                    "education_requirement": "string",
+                    "key_responsibilities": ["resp1", "resp2", ...],
+                    "company_benefits": ["benefit1", "benefit2", ...],
+                    "job_type": "full-time/part-time/contract",
+                    "remote_option": "yes/no/hybrid"
+                }}
+            ]
+        }}
+        """
+        
+        answers: List[Optional[Dict[str, Any]]] = [None] * len(job_descriptions)
+        call = LLMCallRecord(task="analyze_job_descriptions", model=self.model, priority=llm_priority.get())
+        start = time.perf_counter()
+        try:
+            data = await self._complete(
+                "analyze_job_descriptions",
+                [
+                    {
+                        "role": "system",
+                        "content": "You are an expert job description analyzer. "
+                        "Analyze every numbered job description on its own. Return only valid JSON."
+                    },
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.1,
+                context={"job_descriptions": job_descriptions},
+                call=call
+            )
+            items = data.get("results") if isinstance(data, dict) else None
+            for item in items if isinstance(items, list) else []:
+                index = item.pop("index", None) if isinstance(item, dict) else None
+                if isinstance(index, int) and 0 <= index < len(answers) and answers[index] is None:
+                    if _valid_job_analysis(item):
+                        answers[index] = item
+        except Exception as e:
+            logger.error(f"Error analyzing a batch of {len(job_descriptions)} job descriptions: {e}")
+        failed = sum(answer is None for answer in answers)
+        # Time queued behind the rate limits says nothing about how well this batch size performs
+        latency_ms = (time.perf_counter() - start) * 1000 - call.queue_ms
+        self.job_batch_size.record(len(answers), failed, latency_ms)
+        return answers
+
     async def calculate_match_score(
         self, resume_data: Dict[str, Any], job_data: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -129,19 +326,17 @@ class AIService:
         """
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
+            return await self._complete(
+                "calculate_match_score",
+                [
                     {"role": "system", "content": "You are an expert HR analyst. Provide accurate match scoring."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.2
+                temperature=0.2,
+                context={"resume": resume_data, "job": job_data}
             )
-            
-            result = response.choices[0].message.content
-            return json.loads(result)
         except Exception as e:
-            print(f"Error calculating match score: {e}")
+            logger.error(f"Error calculating match score: {e}")
             return {"overall_score": 0, "skill_match_score": 0, "experience_match_score": 0, "education_match_score": 0}
 
     async def generate_resume_suggestions(
@@ -167,19 +362,17 @@ class AIService:
         """
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
+            return await self._complete(
+                "generate_resume_suggestions",
+                [
                     {"role": "system", "content": "You are an expert resume coach. Provide actionable suggestions."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.3
+                temperature=0.3,
+                context={"resume": resume_data, "job": job_data, "match_analysis": match_analysis}
             )
-            
-            result = response.choices[0].message.content
-            return json.loads(result)
         except Exception as e:
-            print(f"Error generating resume suggestions: {e}")
+            logger.error(f"Error generating resume suggestions: {e}")
             return []
 
     async def generate_cover_letter(
@@ -201,16 +394,22 @@ class AIService:
         """
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
+            return await self._complete(
+                "generate_cover_letter",
+                [
                     {"role": "system", "content": "You are an expert cover letter writer. Write compelling, professional cover letters."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.4
+                temperature=0.4,
+                context={"resume": resume_data, "job": job_data, "user_name": user_name},
+                parse_json=False
             )
-            
-            return response.choices[0].message.content
         except Exception as e:
-            print(f"Error generating cover letter: {e}")
-            return "Unable to generate cover letter at this time."
\ No newline at end of file
+            logger.error(f"Error generating cover letter: {e}")
+            return "Unable to generate cover letter at this time."
+
+
+@lru_cache(maxsize=1)
+def get_ai_service() -> AIService:
+    """Shared AIService, built on first use so importing the routers stays cheap"""
+    return AIService()
@@ -0,0 +1,372 @@
+import fcntl
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from app.services.text_vectors import idf_weights, normalize_rows
+
+logger = logging.getLogger(__name__)
+
+TOMBSTONE_DTYPE = np.dtype([("id", "<i8"), ("delta_position", "<i8")])
+ASSIGN_CHUNK_ROWS = 65536
+
+
+class IndexBusy(Exception):
+    """Another process is already building the index"""
+
+
+def delta_dtype(dim: int) -> np.dtype:
+    return np.dtype([("id", "<i8"), ("vector", "<f4", (dim,))])
+
+
+def assign_lists(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the most similar centroid for each row, computed in chunks"""
+    assignment = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), ASSIGN_CHUNK_ROWS):
+        chunk = vectors[start:start + ASSIGN_CHUNK_ROWS]
+        assignment[start:start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+    return assignment
+
+
+def spherical_kmeans(
+    vectors: np.ndarray, nlist: int, iterations: int = 10, sample_size: int = 100_000, seed: int = 0
+) -> np.ndarray:
+    """Unit-length centroids clustering ``vectors`` by cosine similarity, trained on a sample"""
+    rng = np.random.default_rng(seed)
+    if len(vectors) > sample_size:
+        vectors = vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))]
+    centroids = vectors[rng.choice(len(vectors), min(nlist, len(vectors)), replace=False)].copy()
+    nlist = len(centroids)
+    for _ in range(iterations):
+        assignment = assign_lists(vectors, centroids)
+        order = np.argsort(assignment, kind="stable")
+        counts = np.bincount(assignment, minlength=nlist)
+        filled = np.flatnonzero(counts)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[filled]
+        sums = np.zeros_like(centroids)
+        sums[filled] = np.add.reduceat(vectors[order], starts, axis=0)
+        # Empty lists are re-seeded from random rows so every list stays useful
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            sums[empty] = vectors[rng.choice(len(vectors), len(empty))]
+        centroids = normalize_rows(sums)
+    return centroids
+
+
+class _Generation:
+    """One built index, its memory-mapped lists and the logs written since"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.meta = json.loads((path / "meta.json").read_text())
+        self.dim = self.meta["dim"]
+        self.centroids = np.load(path / "centroids.npy")
+        self.offsets = np.load(path / "offsets.npy")
+        self.idf = np.load(path / "idf.npy")
+        self.vectors = np.load(path / "vectors.npy", mmap_mode="r")
+        self.ids = np.load(path / "ids.npy", mmap_mode="r")
+        self.delta_record = delta_dtype(self.dim)
+        self._delta = np.zeros(0, dtype=self.delta_record)
+        self._tombstones = np.zeros(0, dtype=TOMBSTONE_DTYPE)
+        self.delta_ids = np.zeros(0, dtype=np.int64)
+        self.delta_vectors = np.zeros((0, self.dim), dtype=np.float32)
+        self.dead_ids = np.zeros(0, dtype=np.int64)
+
+    def prepare(self, term_vector: np.ndarray) -> np.ndarray:
+        return normalize_rows(term_vector * self.idf)
+
+    def refresh_logs(self) -> None:
+        """Read delta and tombstone records appended by any worker since the last call"""
+        delta = _read_new_records(self.path / "delta.bin", self.delta_record, len(self._delta))
+        tombstones = _read_new_records(self.path / "tombstones.bin", TOMBSTONE_DTYPE, len(self._tombstones))
+        if not len(delta) and not len(tombstones):
+            return
+        self._delta = np.concatenate([self._delta, delta])
+        self._tombstones = np.concatenate([self._tombstones, tombstones])
+
+        # A tombstone hides the built entry and delta records written before it
+        killed_before: Dict[int, int] = {}
+        for record_id, position in self._tombstones.tolist():
+            killed_before[record_id] = max(position, killed_before.get(record_id, 0))
+        live = np.array([
+            position >= killed_before.get(record_id, 0)
+            for position, record_id in enumerate(self._delta["id"].tolist())
+        ], dtype=bool)
+        self.delta_ids = self._delta["id"][live]
+        self.delta_vectors = normalize_rows(self._delta["vector"][live] * self.idf) if live.any() else \
+            np.zeros((0, self.dim), dtype=np.float32)
+        self.dead_ids = np.array(sorted(killed_before), dtype=np.int64)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.meta,
+            "delta_records": len(self._delta),
+            "live_delta_records": len(self.delta_ids),
+            "tombstones": len(self._tombstones),
+        }
+
+
+def _read_new_records(path: Path, dtype: np.dtype, already_read: int) -> np.ndarray:
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:
+        return np.zeros(0, dtype=dtype)
+    # Only whole records; a concurrent append may be half written
+    available = size // dtype.itemsize - already_read
+    if available <= 0:
+        return np.zeros(0, dtype=dtype)
+    return np.fromfile(path, dtype=dtype, count=available, offset=already_read * dtype.itemsize)
+
+
+class IVFIndex:
+    """Inverted-file approximate nearest-neighbor index persisted as .npy files.
+
+    A build weighs term vectors by IDF, clusters them with spherical k-means
+    into ``nlist`` lists and writes them grouped by list, so probing a list
+    is one contiguous slice of a memory-mapped file that every worker shares
+    through the page cache. Searches score the ``nprobe`` lists closest to
+    the query; more probes trade latency for recall.
+
+    Inserts after a build are appended to a delta log that is scanned
+    exactly, and removals append tombstones; both are shared between
+    workers the same way, so a rebuild is only needed once the delta grows
+    large relative to the built lists. ``directory/CURRENT`` names the live
+    build and is switched atomically.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._current_key = None
+        self._generation: Optional[_Generation] = None
+
+    @contextmanager
+    def _file_lock(self, name: str = ".lock", blocking: bool = True) -> Iterator[None]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / name, "a") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                raise IndexBusy()
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _current_name(self) -> Optional[str]:
+        try:
+            return (self.directory / "CURRENT").read_text().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _refresh(self) -> Optional[_Generation]:
+        """The live generation with its logs caught up; cheap when nothing changed"""
+        try:
+            stat = (self.directory / "CURRENT").stat()
+            key = (stat.st_ino, stat.st_mtime_ns)
+        except FileNotFoundError:
+            key = None
+        with self._lock:
+            if key != self._current_key:
+                name = self._current_name() if key else None
+                try:
+                    self._generation = _Generation(self.directory / name) if name else None
+                    self._current_key = key
+                except OSError as e:
+                    # Raced a rebuild that removed the generation; retry on the next call
+                    logger.warning(f"Could not load ANN index {name}: {e}")
+                    self._generation, self._current_key = None, None
+            if self._generation is not None:
+                self._generation.refresh_logs()
+            return self._generation
+
+    def stats(self) -> Optional[Dict[str, Any]]:
+        generation = self._refresh()
+        return generation.stats() if generation else None
+
+    def search(
+        self, term_vector: np.ndarray, k: int, nprobe: int, exclude_id: Optional[int] = None
+    ) -> Optional[List[Tuple[int, float]]]:
+        """Approximate cosine top-K as (id, score), or None when no usable index is built"""
+        generation = self._refresh()
+        if generation is None:
+            return None
+        if len(term_vector) != generation.dim:
+            logger.warning("Job ANN index was built with a different TEXT_VECTOR_DIM; rebuild it")
+            return None
+        query = generation.prepare(term_vector)
+
+        nprobe = min(nprobe, len(generation.centroids))
+        centroid_scores = generation.centroids @ query
+        probes = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        id_parts, score_parts = [generation.delta_ids], [generation.delta_vectors @ query]
+        for probe in probes:
+            start, end = generation.offsets[probe], generation.offsets[probe + 1]
+            if end > start:
+                ids = generation.ids[start:end]
+                scores = generation.vectors[start:end] @ query
+                if len(generation.dead_ids):
+                    alive = ~np.isin(ids, generation.dead_ids)
+                    ids, scores = ids[alive], scores[alive]
+                id_parts.append(ids)
+                score_parts.append(scores)
+        ids, scores = np.concatenate(id_parts), np.concatenate(score_parts)
+        if exclude_id is not None:
+            scores[ids == exclude_id] = -np.inf
+        if not len(scores):
+            return []
+
+        # A job can sit in both the built lists and a carried-over delta, so
+        # take extra candidates and keep each id once
+        candidates = min(2 * k, len(scores))
+        top = np.argpartition(-scores, candidates - 1)[:candidates]
+        hits: Dict[int, float] = {}
+        for position in top[np.argsort(-scores[top])]:
+            if scores[position] <= 0 or len(hits) == k:
+                break
+            hits.setdefault(int(ids[position]), float(scores[position]))
+        return list(hits.items())
+
+    def insert(self, record_id: int, term_vector: np.ndarray, replace: bool = True) -> bool:
+        """Append a vector to the live index's delta log, tombstoning older copies when ``replace``"""
+        if not (self.directory / "CURRENT").exists():
+            return False
+        with self._file_lock():
+            name = self._current_name()
+            if name is None:
+                return False
+            path = self.directory / name
+            dim = json.loads((path / "meta.json").read_text())["dim"]
+            if len(term_vector) != dim:
+                return False
+            if replace:
+                self._append_tombstone(path, record_id, dim)
+            record = np.zeros(1, dtype=delta_dtype(dim))
+            record["id"], record["vector"] = record_id, term_vector
+            with open(path / "delta.bin", "ab") as f:
+                f.write(record.tobytes())
+        return True
+
+    def remove(self, record_id: int) -> bool:
+        """Tombstone every copy of ``record_id`` in the live index"""
+        if not (self.directory / "CURRENT").exists():
+            return False
+        with self._file_lock():
+            name = self._current_name()
+            if name is None:
+                return False
+            path = self.directory / name
+            self._append_tombstone(path, record_id, json.loads((path / "meta.json").read_text())["dim"])
+        return True
+
+    @staticmethod
+    def _append_tombstone(path: Path, record_id: int, dim: int) -> None:
+        delta_path = path / "delta.bin"
+        delta_records = delta_path.stat().st_size // delta_dtype(dim).itemsize if delta_path.exists() else 0
+        tombstone = np.array([(record_id, delta_records)], dtype=TOMBSTONE_DTYPE)
+        with open(path / "tombstones.bin", "ab") as f:
+            f.write(tombstone.tobytes())
+
+    def build(
+        self,
+        load: Callable[[], Tuple[np.ndarray, np.ndarray]],
+        nlist: int = 0,
+        iterations: int = 10,
+        seed: int = 0,
+    ) -> Dict[str, Any]:
+        """Build a new generation from ``load()`` -> (ids, term matrix) and switch to it.
+
+        Writes that land in the old generation while the build runs are
+        carried over before the switch, so inserts and removals racing a
+        rebuild are not lost. ``load`` is called after the old logs'
+        positions are recorded, which may carry a few entries twice; search
+        keeps each id once. The term matrix is weighted in place.
+        """
+        with self._file_lock(".build.lock", blocking=False):
+            started = time.perf_counter()
+            with self._file_lock():
+                previous = self._current_name()
+                carry_from = self._log_lengths(previous)
+            ids, matrix = load()
+            name = f"{time.time_ns():x}"
+            path = self.directory / name
+            path.mkdir(parents=True)
+
+            idf = idf_weights(matrix) if len(ids) else np.ones(matrix.shape[1], dtype=np.float32)
+            for start in range(0, len(matrix), ASSIGN_CHUNK_ROWS):
+                chunk = matrix[start:start + ASSIGN_CHUNK_ROWS]
+                chunk *= idf
+                chunk /= np.maximum(np.linalg.norm(chunk, axis=1, keepdims=True), 1e-12)
+            nlist = max(1, min(nlist or int(np.sqrt(len(ids))), len(ids)))
+            if len(ids):
+                centroids = spherical_kmeans(matrix, nlist, iterations, seed=seed)
+                assignment = assign_lists(matrix, centroids)
+            else:
+                centroids = np.zeros((1, matrix.shape[1]), dtype=np.float32)
+                assignment = np.zeros(0, dtype=np.int32)
+            order = np.argsort(assignment, kind="stable")
+            offsets = np.concatenate(([0], np.cumsum(np.bincount(assignment, minlength=len(centroids)))))
+
+            vectors = np.lib.format.open_memmap(path / "vectors.npy", mode="w+", dtype=np.float32, shape=matrix.shape)
+            for start in range(0, len(order), ASSIGN_CHUNK_ROWS):
+                vectors[start:start + ASSIGN_CHUNK_ROWS] = matrix[order[start:start + ASSIGN_CHUNK_ROWS]]
+            vectors.flush()
+            del vectors
+            np.save(path / "ids.npy", ids[order].astype(np.int64))
+            np.save(path / "centroids.npy", centroids.astype(np.float32))
+            np.save(path / "offsets.npy", offsets.astype(np.int64))
+            np.save(path / "idf.npy", idf)
+            meta = {
+                "generation": name,
+                "built_at": time.time(),
+                "count": int(len(ids)),
+                "dim": int(matrix.shape[1]),
+                "nlist": int(len(centroids)),
+                "build_seconds": round(time.perf_counter() - started, 3),
+            }
+            (path / "meta.json").write_text(json.dumps(meta))
+
+            with self._file_lock():
+                if previous:
+                    self._carry_over(self.directory / previous, path, carry_from, meta["dim"])
+                (self.directory / "CURRENT.tmp").write_text(name)
+                os.replace(self.directory / "CURRENT.tmp", self.directory / "CURRENT")
+            # Readers that still map an old generation keep their file handles
+            for old in self.directory.iterdir():
+                if old.is_dir() and old.name != name:
+                    shutil.rmtree(old, ignore_errors=True)
+        logger.info(f"Built ANN index {name}: {meta['count']} vectors in {meta['nlist']} lists")
+        return meta
+
+    def _log_lengths(self, name: Optional[str]) -> Tuple[int, int]:
+        if name is None:
+            return 0, 0
+        path = self.directory / name
+        dim = json.loads((path / "meta.json").read_text())["dim"]
+        sizes = [
+            (path / log).stat().st_size // dtype.itemsize if (path / log).exists() else 0
+            for log, dtype in (("delta.bin", delta_dtype(dim)), ("tombstones.bin", TOMBSTONE_DTYPE))
+        ]
+        return sizes[0], sizes[1]
+
+    @staticmethod
+    def _carry_over(previous: Path, target: Path, carry_from: Tuple[int, int], dim: int) -> None:
+        old_dim = json.loads((previous / "meta.json").read_text())["dim"]
+        if old_dim != dim:
+            return
+        delta = _read_new_records(previous / "delta.bin", delta_dtype(dim), carry_from[0])
+        tombstones = _read_new_records(previous / "tombstones.bin", TOMBSTONE_DTYPE, carry_from[1])
+        if len(delta):
+            with open(target / "delta.bin", "wb") as f:
+                f.write(delta.tobytes())
+        if len(tombstones):
+            # Positions counted records of the old delta log
+            tombstones["delta_position"] = np.maximum(tombstones["delta_position"] - carry_from[0], 0)
+            with open(target / "tombstones.bin", "wb") as f:
+                f.write(tombstones.tobytes())
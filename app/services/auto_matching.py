@@ -0,0 +1,270 @@
+import asyncio
+import heapq
+import logging
+from typing import Dict, List, Sequence, Set, Tuple
+from weakref import WeakKeyDictionary
+from sqlalchemy import Row, desc, func, tuple_
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.telemetry import metrics
+from app.db.session import SessionLocal
+from app.models.job import Job
+from app.models.match import Match
+from app.models.resume import Resume
+from app.services.match_freshness import apply_match_analysis, content_fingerprint, job_match_data, resume_match_data
+from app.services.match_scoring import EDUCATION_WEIGHT, EXPERIENCE_WEIGHT, SKILL_WEIGHT, required_years, score_match
+from app.services.skills import education_rank, get_skill_registry
+
+logger = logging.getLogger(__name__)
+
+JOBS_PER_PASS = 32  # Jobs ranked together in one scan of the resume pool
+RESUME_COLUMNS = (
+    Resume.id, Resume.user_id, Resume.skill_bits, Resume.skills, Resume.experience_years, Resume.education_level
+)
+JOB_COLUMNS = (
+    Job.id, Job.required_skill_bits, Job.preferred_skill_bits, Job.required_skills, Job.preferred_skills,
+    Job.experience_level, Job.education_requirement
+)
+
+auto_match_chunks_total = metrics.counter(
+    "auto_match_chunks_total", "Chunks scored by auto-matching passes, by what the pass was for (job / resume)", ("kind",)
+)
+auto_match_writes_total = metrics.counter(
+    "auto_match_writes_total", "Auto matches written and evicted from jobs' top lists", ("action",)
+)
+
+_gates: "WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = WeakKeyDictionary()
+
+
+def _gate() -> asyncio.Semaphore:
+    """This event loop's limit of MATCH_AUTO_CONCURRENCY passes at once"""
+    loop = asyncio.get_running_loop()
+    gate = _gates.get(loop)
+    if gate is None:
+        gate = _gates[loop] = asyncio.Semaphore(max(settings.MATCH_AUTO_CONCURRENCY, 1))
+    return gate
+
+
+def overall_scores(db: Session, resumes: Sequence[Row], jobs: Sequence[Row]):
+    """Local overall score of every resume (rows) against every job (columns) as a numpy matrix.
+
+    Same formula as match_scoring.score_match, computed on skill bitsets so
+    a chunk of resumes is ranked against a group of jobs in a few array
+    operations.
+    """
+    # Imported here so numpy stays off the worker start path
+    import numpy as np
+    from app.services.skill_bitsets import pack, skill_overlap
+    skill_registry = get_skill_registry()
+
+    def bits(blob, names):
+        # Rows written before bitsets existed are encoded from their skill names
+        return blob if blob is not None else skill_registry.encode(db, names)
+
+    resume_bits = [bits(resume.skill_bits, resume.skills) for resume in resumes]
+    required_bits = [bits(job.required_skill_bits, job.required_skills) for job in jobs]
+    preferred_bits = [bits(job.preferred_skill_bits, job.preferred_skills) for job in jobs]
+    words = max(len(blob) for blob in resume_bits + required_bits + preferred_bits) // 8
+    skills = skill_overlap(
+        pack(resume_bits, words)[:, None, :], pack(required_bits, words)[None], pack(preferred_bits, words)[None]
+    )["skill_match_score"]
+
+    years = np.array([np.nan if resume.experience_years is None else resume.experience_years for resume in resumes])
+    needed_years = np.array([required_years(job.experience_level) or 0 for job in jobs], dtype=float)
+    years, needed_years = years[:, None], needed_years[None, :]
+    experience = np.where(
+        needed_years == 0,
+        100.0,
+        np.where(np.isnan(years), 50.0, np.minimum(100.0, 100.0 * years / np.maximum(needed_years, 1))),
+    )
+
+    have = np.array([education_rank(resume.education_level) for resume in resumes])[:, None]
+    needed = np.array([education_rank(job.education_requirement) for job in jobs])[None, :]
+    education = np.where(
+        needed == 0, 100.0, np.where(have == 0, 50.0, np.maximum(0.0, 100.0 - 25.0 * np.maximum(0, needed - have)))
+    )
+    return SKILL_WEIGHT * skills + EXPERIENCE_WEIGHT * experience + EDUCATION_WEIGHT * education
+
+
+def _auto_match(resume: Resume, job: Job) -> Match:
+    resume_data, job_data = resume_match_data(resume), job_match_data(job)
+    match = Match(user_id=resume.user_id, resume_id=resume.id, job_id=job.id, origin="auto")
+    apply_match_analysis(match, score_match(resume_data, job_data))
+    match.resume_fingerprint = content_fingerprint(resume_data)
+    match.job_fingerprint = content_fingerprint(job_data)
+    return match
+
+
+async def _paced(kind: str, function, *args):
+    """Run one chunk off the event loop, then give request handlers the worker for a moment"""
+    result = await run_in_threadpool(function, *args)
+    auto_match_chunks_total.inc(kind)
+    await asyncio.sleep(settings.MATCH_AUTO_CHUNK_PAUSE_SECONDS)
+    return result
+
+
+async def auto_match_jobs(job_ids: Sequence[int]) -> int:
+    """Score new jobs against the whole resume pool and keep each job's best resumes as auto matches.
+
+    Resumes are scanned MATCH_AUTO_CHUNK_SIZE at a time for JOBS_PER_PASS
+    jobs at once, each chunk in the threadpool with a pause after it, and
+    at most MATCH_AUTO_CONCURRENCY passes run per worker, so a burst of new
+    jobs queues up instead of competing with requests. Returns the number
+    of auto matches written.
+    """
+    if not settings.MATCH_AUTO_ENABLED or not job_ids:
+        return 0
+    written = 0
+    async with _gate():
+        db = SessionLocal()
+        try:
+            for start in range(0, len(job_ids), JOBS_PER_PASS):
+                written += await _match_job_group(db, list(job_ids[start:start + JOBS_PER_PASS]))
+        except Exception:
+            logger.exception(f"Auto-matching jobs {job_ids[0]}..{job_ids[-1]} failed")
+            db.rollback()
+        finally:
+            db.close()
+    if written:
+        logger.info(f"Auto-matched {len(job_ids)} new jobs: {written} candidate matches")
+    return written
+
+
+async def _match_job_group(db: Session, job_ids: List[int]) -> int:
+    jobs = db.query(*JOB_COLUMNS).filter(Job.id.in_(job_ids), Job.is_active).order_by(Job.id).all()
+    if not jobs:
+        return 0
+    # Per job, a min-heap of its best (score, resume id) so far
+    best: List[List[Tuple[float, int]]] = [[] for _ in jobs]
+    cursor = 0
+    while cursor is not None:
+        cursor = await _paced("job", _rank_resume_chunk, db, jobs, cursor, best)
+    return await run_in_threadpool(_write_job_matches, db, jobs, best)
+
+
+def _rank_resume_chunk(db: Session, jobs: List[Row], cursor: int, best: List[List[Tuple[float, int]]]):
+    """Fold the next chunk of resumes into each job's top list; None once the pool is exhausted"""
+    import numpy as np
+
+    resumes = db.query(*RESUME_COLUMNS).filter(Resume.id > cursor).order_by(Resume.id).limit(
+        settings.MATCH_AUTO_CHUNK_SIZE
+    ).all()
+    if not resumes:
+        return None
+    scores = overall_scores(db, resumes, jobs)
+    for column, heap in enumerate(best):
+        for position in np.flatnonzero(scores[:, column] >= settings.MATCH_AUTO_MIN_SCORE):
+            entry = (float(scores[position, column]), resumes[position].id)
+            if len(heap) < settings.MATCH_AUTO_TOP_N:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+    return resumes[-1].id
+
+
+def _write_job_matches(db: Session, jobs: List[Row], best: List[List[Tuple[float, int]]]) -> int:
+    """Replace the group's auto matches with its new top lists, leaving applicants' own matches alone"""
+    job_ids = [job.id for job in jobs]
+    selected = {(job.id, resume_id) for job, heap in zip(jobs, best) for _, resume_id in heap}
+    existing: Set[Tuple[int, int]] = set()
+    for match in db.query(Match).filter(Match.job_id.in_(job_ids)):
+        if match.origin == "auto" and (match.job_id, match.resume_id) not in selected:
+            db.delete(match)
+            auto_match_writes_total.inc("evicted")
+        else:
+            existing.add((match.job_id, match.resume_id))
+    pairs = selected - existing
+    if pairs:
+        resumes = {resume.id: resume for resume in db.query(Resume).filter(
+            Resume.id.in_({resume_id for _, resume_id in pairs})
+        )}
+        full_jobs = {job.id: job for job in db.query(Job).filter(Job.id.in_(job_ids))}
+        for job_id, resume_id in sorted(pairs):
+            db.add(_auto_match(resumes[resume_id], full_jobs[job_id]))
+        auto_match_writes_total.inc("added", amount=len(pairs))
+    db.commit()
+    return len(pairs)
+
+
+async def auto_match_resume(resume_id: int) -> int:
+    """Offer a new resume to every active job's auto matches, where it beats the job's current weakest.
+
+    Active jobs are scored MATCH_AUTO_CHUNK_SIZE at a time under the same
+    pacing and concurrency limit as auto_match_jobs. Returns the number of
+    jobs the resume became an auto match for.
+    """
+    if not settings.MATCH_AUTO_ENABLED:
+        return 0
+    written = 0
+    async with _gate():
+        db = SessionLocal()
+        try:
+            resume = db.query(*RESUME_COLUMNS).filter(Resume.id == resume_id).first()
+            cursor = 0
+            while resume is not None and cursor is not None:
+                cursor, added = await _paced("resume", _offer_resume, db, resume, cursor)
+                written += added
+        except Exception:
+            logger.exception(f"Auto-matching resume {resume_id} failed")
+            db.rollback()
+        finally:
+            db.close()
+    if written:
+        logger.info(f"Auto-matched resume {resume_id} to {written} jobs")
+    return written
+
+
+def _offer_resume(db: Session, resume: Row, cursor: int):
+    """Score the resume against the next chunk of active jobs and write it into the top lists it makes"""
+    jobs = db.query(*JOB_COLUMNS).filter(Job.is_active, Job.id > cursor).order_by(Job.id).limit(
+        settings.MATCH_AUTO_CHUNK_SIZE
+    ).all()
+    if not jobs:
+        return None, 0
+    scores = overall_scores(db, [resume], jobs)[0]
+    candidates = {
+        job.id: float(score) for job, score in zip(jobs, scores) if score >= settings.MATCH_AUTO_MIN_SCORE
+    }
+    if not candidates:
+        return jobs[-1].id, 0
+
+    matched = {job_id for (job_id,) in db.query(Match.job_id).filter(
+        Match.resume_id == resume.id, Match.job_id.in_(candidates)
+    )}
+    # Size and weakest score of each candidate job's auto matches
+    stats: Dict[int, Tuple[int, float]] = {
+        job_id: (count, lowest) for job_id, count, lowest in db.query(
+            Match.job_id, func.count(Match.id), func.min(Match.match_score)
+        ).filter(Match.origin == "auto", Match.job_id.in_(candidates)).group_by(Match.job_id)
+    }
+    offers, evict = [], {}
+    for job_id, score in candidates.items():
+        if job_id in matched:
+            continue
+        count, lowest = stats.get(job_id, (0, 0.0))
+        if count < settings.MATCH_AUTO_TOP_N:
+            offers.append(job_id)
+        elif score > lowest:
+            offers.append(job_id)
+            evict[job_id] = lowest
+    if not offers:
+        return jobs[-1].id, 0
+
+    if evict:
+        # The newest of each full job's weakest auto matches makes room
+        weakest = db.query(Match).filter(
+            Match.origin == "auto", tuple_(Match.job_id, Match.match_score).in_(list(evict.items()))
+        ).order_by(Match.job_id, desc(Match.id)).all()
+        evicted = set()
+        for match in weakest:
+            if match.job_id not in evicted:
+                evicted.add(match.job_id)
+                db.delete(match)
+                auto_match_writes_total.inc("evicted")
+    full_resume = db.get(Resume, resume.id)
+    for job in db.query(Job).filter(Job.id.in_(offers)):
+        db.add(_auto_match(full_resume, job))
+        auto_match_writes_total.inc("added")
+    db.commit()
+    return jobs[-1].id, len(offers)
@@ -0,0 +1,95 @@
+import csv
+import io
+from typing import Iterator, List
+from sqlalchemy import Row, desc
+from sqlalchemy.orm import Query, Session
+from app.core.config import settings
+from app.core.serialization import dumps
+from app.db.session import SessionLocal
+from app.models.match import Match
+from app.models.resume import Resume
+from app.models.user import User
+
+CANDIDATE_COLUMNS = (
+    Match.id.label("match_id"),
+    User.full_name.label("candidate_name"),
+    User.email.label("candidate_email"),
+    Resume.title.label("resume_title"),
+    Match.match_score,
+    Match.skill_match_score,
+    Match.experience_match_score,
+    Match.education_match_score,
+    Match.origin,
+    Resume.skills,
+    Resume.experience_years,
+    Resume.education_level,
+    Match.created_at,
+)
+CSV_HEADER = [column.key for column in CANDIDATE_COLUMNS]
+CSV_LIST_SEPARATOR = ";"  # Same as bulk job import
+# Spreadsheets evaluate cells starting with these as formulas
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def candidates_query(db: Session, job_id: int, min_score: float = 0) -> Query:
+    """Candidate rows of a job, best match first, in one joined query"""
+    return db.query(*CANDIDATE_COLUMNS).join(Resume, Match.resume_id == Resume.id).join(
+        User, Match.user_id == User.id
+    ).filter(
+        Match.job_id == job_id,
+        Match.match_score >= min_score
+    ).order_by(desc(Match.match_score), Match.id)
+
+
+def _csv_values(row) -> list:
+    values = []
+    for key in CSV_HEADER:
+        value = getattr(row, key)
+        if isinstance(value, list):
+            value = CSV_LIST_SEPARATOR.join(str(item) for item in value)
+        elif hasattr(value, "isoformat"):
+            value = value.isoformat()
+        if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+            # Names and titles are applicant-controlled; keep them inert text (CSV injection)
+            value = "'" + value
+        values.append("" if value is None else value)
+    return values
+
+
+def encode_rows(rows: List[Row], export_format: str) -> bytes:
+    if export_format == "ndjson":
+        return b"".join(dumps(row._asdict()) + b"\n" for row in rows)
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(_csv_values(row) for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def stream_candidates(job_id: int, min_score: float, export_format: str) -> Iterator[bytes]:
+    """Encode a job's candidates as CSV or NDJSON while they are fetched.
+
+    Runs in its own session since the response body outlives the request's
+    one. Rows come from the database ``CANDIDATE_EXPORT_BATCH_ROWS`` at a
+    time (a server-side cursor where the driver supports one), and each
+    batch is sent as soon as it is encoded, so memory stays flat at any
+    candidate count.
+    """
+    if export_format == "csv":
+        # Send the header before the first query so clients see bytes at once
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(CSV_HEADER)
+        yield buffer.getvalue().encode("utf-8")
+    db = SessionLocal()
+    try:
+        batch_rows = settings.CANDIDATE_EXPORT_BATCH_ROWS
+        batch: List[Row] = []
+        for row in candidates_query(db, job_id, min_score).yield_per(batch_rows):
+            batch.append(row)
+            if len(batch) == batch_rows:
+                yield encode_rows(batch, export_format)
+                batch = []
+        if batch:
+            yield encode_rows(batch, export_format)
+    finally:
+        db.close()
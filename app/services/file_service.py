@@ -1,8 +1,10 @@
 import os
 import uuid
+from functools import lru_cache
 from pathlib import Path
 from fastapi import UploadFile, HTTPException
 from app.core.config import settings
+from app.core.tracing import span
 
 
 class FileService:
@@ -43,9 +45,11 @@ class FileService:
         
         # Save file
         try:
-            content = await file.read()
-            with open(file_path, "wb") as f:
-                f.write(content)
+            with span("file.save", extension=file_extension) as save_span:
+                content = await file.read()
+                with open(file_path, "wb") as f:
+                    f.write(content)
+                save_span.set_attribute("bytes", len(content))
             
             return str(file_path), file.filename or unique_filename
         except Exception as e:
@@ -62,4 +66,10 @@ class FileService:
                 return True
             return False
         except Exception:
-            return False
\ No newline at end of file
+            return False
+
+
+@lru_cache(maxsize=1)
+def get_file_service() -> FileService:
+    """Shared FileService, built (and its upload directory created) on first use"""
+    return FileService()
@@ -0,0 +1,301 @@
+import csv
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import ClientDisconnect
+from app.core.config import settings
+from app.core.tracing import span
+from app.db.session import SessionLocal
+from app.models.job import Job
+from app.models.job_import import JobImport
+from app.schemas.job import JobCreate
+from app.services.ai_service import get_ai_service
+from app.services.auto_matching import auto_match_jobs
+from app.services.llm_scheduler import llm_scope
+from app.services.match_freshness import job_fingerprint
+from app.services.skills import get_skill_registry
+
+logger = logging.getLogger(__name__)
+
+CSV_LIST_FIELDS = ("required_skills", "preferred_skills")
+CSV_LIST_SEPARATOR = ";"
+
+# Parsed record: (1-based data row, fields or None, error or None)
+Record = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+class ImportFormatError(Exception):
+    """The body cannot be parsed any further"""
+
+
+def detect_format(content_type: str) -> Optional[str]:
+    content_type = content_type.lower()
+    if "csv" in content_type:
+        return "csv"
+    if any(kind in content_type for kind in ("ndjson", "jsonl", "json-seq", "jsonlines")):
+        return "ndjson"
+    return None
+
+
+def _decode_line(line: bytes, first: bool) -> str:
+    if len(line) > settings.JOB_IMPORT_MAX_RECORD_BYTES:
+        raise ImportFormatError(f"Line longer than {settings.JOB_IMPORT_MAX_RECORD_BYTES} bytes")
+    try:
+        return line.decode("utf-8-sig" if first else "utf-8").rstrip("\r")
+    except UnicodeDecodeError:
+        raise ImportFormatError("Body is not valid UTF-8")
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a byte stream into decoded lines, holding at most one partial line"""
+    buffer = b""
+    first = True
+    async for chunk in chunks:
+        buffer += chunk
+        if b"\n" in chunk:
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                yield _decode_line(line, first)
+                first = False
+        if len(buffer) > settings.JOB_IMPORT_MAX_RECORD_BYTES:
+            raise ImportFormatError(f"Line longer than {settings.JOB_IMPORT_MAX_RECORD_BYTES} bytes")
+    if buffer:
+        yield _decode_line(buffer, first)
+
+
+async def iter_csv_records(lines: AsyncIterator[str]) -> AsyncIterator[Record]:
+    """CSV rows keyed by the header row; quoted fields may span lines"""
+    header: Optional[List[str]] = None
+    pending: List[str] = []
+    row = 0
+    async for line in lines:
+        pending.append(line)
+        text = "\n".join(pending)
+        # An odd number of quotes means a quoted field continues on the next line
+        if text.count('"') % 2:
+            if len(text) > settings.JOB_IMPORT_MAX_RECORD_BYTES:
+                raise ImportFormatError(f"CSV record longer than {settings.JOB_IMPORT_MAX_RECORD_BYTES} bytes")
+            continue
+        pending = []
+        if not text.strip():
+            continue
+        try:
+            values = next(csv.reader([text]))
+        except csv.Error as e:
+            if header is None:
+                raise ImportFormatError(f"Invalid CSV header: {e}")
+            row += 1
+            yield row, None, f"Invalid CSV: {e}"
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        row += 1
+        if len(values) != len(header):
+            yield row, None, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        yield row, dict(zip(header, values)), None
+    if pending:
+        raise ImportFormatError("Unterminated quoted CSV field at end of body")
+
+
+async def iter_ndjson_records(lines: AsyncIterator[str]) -> AsyncIterator[Record]:
+    """One JSON object per non-empty line"""
+    row = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield row, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield row, None, "Expected a JSON object"
+            continue
+        yield row, record, None
+
+
+def to_job_create(record: Dict[str, Any], from_csv: bool) -> JobCreate:
+    """Validate a parsed record; CSV cells are trimmed, empty ones dropped and skill lists split on ';'"""
+    if from_csv:
+        record = {key.strip(): value.strip() for key, value in record.items() if key and value and value.strip()}
+        for field in CSV_LIST_FIELDS:
+            if field in record:
+                record[field] = [skill.strip() for skill in record[field].split(CSV_LIST_SEPARATOR) if skill.strip()]
+    return JobCreate(**record)
+
+
+class JobImporter:
+    """Validates parsed rows and inserts them in chunked transactions.
+
+    Only the current chunk and the first JOB_IMPORT_MAX_ERRORS row errors
+    are held in memory, so memory stays flat whatever the body size.
+    Progress is committed with every chunk, so the status resource shows it
+    while the upload is still streaming.
+    """
+
+    def __init__(self, db: Session, job_import: JobImport):
+        self.db = db
+        self.job_import = job_import
+        self.pending: List[JobCreate] = []
+        self.errors: List[Dict[str, Any]] = []
+
+    async def add(self, record: Record) -> None:
+        row, fields, error = record
+        self.job_import.rows_total += 1
+        errors: Optional[List[Dict[str, str]]] = [{"field": "", "message": error}] if error else None
+        if fields is not None:
+            try:
+                self.pending.append(to_job_create(fields, self.job_import.format == "csv"))
+            except ValidationError as e:
+                errors = [
+                    {"field": ".".join(str(part) for part in detail["loc"]), "message": detail["msg"]}
+                    for detail in e.errors()
+                ]
+        if errors:
+            self.job_import.rows_failed += 1
+            if len(self.errors) < settings.JOB_IMPORT_MAX_ERRORS:
+                self.errors.append({"row": row, "errors": errors})
+        if len(self.pending) >= settings.JOB_IMPORT_CHUNK_ROWS:
+            await run_in_threadpool(self.flush)
+
+    def flush(self) -> None:
+        """Insert the pending chunk and record progress in one transaction"""
+        from app.services.job_search import sync_job
+        from app.services.text_vectors import vectorize_job
+
+        skill_registry = get_skill_registry()
+        rows = [
+            {
+                **job.dict(),
+                "recruiter_id": self.job_import.recruiter_id,
+                "import_id": self.job_import.id,
+                "text_vector": vectorize_job(job),
+                "required_skill_bits": skill_registry.encode(self.db, job.required_skills),
+                "preferred_skill_bits": skill_registry.encode(self.db, job.preferred_skills),
+                "content_fingerprint": job_fingerprint(job),
+            }
+            for job in self.pending
+        ]
+        self.pending = []
+        with span("job_import.insert"):
+            job_ids = []
+            if rows:
+                job_ids = self.db.execute(
+                    insert(Job).returning(Job.id, sort_by_parameter_order=True), rows
+                ).scalars().all()
+            self.job_import.rows_imported += len(rows)
+            self.job_import.errors = list(self.errors)
+            self.db.commit()
+        for job_id, row in zip(job_ids, rows):
+            sync_job(job_id, row["text_vector"], created=True)
+
+
+async def import_jobs(db: Session, recruiter_id: int, import_format: str, chunks: AsyncIterator[bytes]) -> JobImport:
+    """Stream a CSV or NDJSON body into jobs, returning the import record"""
+    job_import = JobImport(
+        recruiter_id=recruiter_id, format=import_format, status="receiving",
+        rows_total=0, rows_imported=0, rows_failed=0, rows_enriched=0, enrichment_failed=0, errors=[]
+    )
+    db.add(job_import)
+    db.commit()
+
+    importer = JobImporter(db, job_import)
+    parse = iter_csv_records if import_format == "csv" else iter_ndjson_records
+    try:
+        async for record in parse(iter_lines(chunks)):
+            await importer.add(record)
+    except ImportFormatError as e:
+        job_import.status, job_import.detail = "failed", str(e)
+    except ClientDisconnect:
+        job_import.status, job_import.detail = "failed", "Upload interrupted"
+    await run_in_threadpool(importer.flush)
+
+    if job_import.status == "receiving":
+        job_import.status = "enriching" if job_import.rows_imported else "completed"
+    if job_import.status != "enriching":
+        job_import.finished_at = datetime.now(timezone.utc)
+    db.commit()
+    db.refresh(job_import)
+    logger.info(
+        f"Job import {job_import.id}: {job_import.rows_imported} imported, "
+        f"{job_import.rows_failed} failed, status {job_import.status}"
+    )
+    return job_import
+
+
+async def enrich_import(import_id: int, on_change: Optional[Callable[[], None]] = None) -> None:
+    """Fill in skills and levels of an import's jobs with batched AI analyses, then pre-match them to resumes"""
+    from app.services.job_search import sync_job
+    from app.services.text_vectors import vectorize_job
+
+    ai_service = get_ai_service()
+    skill_registry = get_skill_registry()
+    # Enough jobs per page for every worker to fill its largest batch
+    page_size = settings.JOB_IMPORT_ENRICH_CONCURRENCY * settings.LLM_BATCH_MAX_ITEMS
+
+    db = SessionLocal()
+    try:
+        # Enrichment runs at background priority, fair-queued per recruiter
+        recruiter_id = db.query(JobImport.recruiter_id).filter(JobImport.id == import_id).scalar()
+        cursor = 0
+        while True:
+            jobs = db.query(Job).filter(Job.import_id == import_id, Job.id > cursor).order_by(Job.id).limit(
+                page_size
+            ).all()
+            if not jobs:
+                break
+            cursor = jobs[-1].id
+            with llm_scope("background", user_id=recruiter_id):
+                analyses = await ai_service.analyze_job_descriptions(
+                    [job.description for job in jobs], concurrency=settings.JOB_IMPORT_ENRICH_CONCURRENCY
+                )
+
+            enriched = []
+            for job, analysis in zip(jobs, analyses):
+                if not analysis:
+                    continue
+                job.required_skills = analysis.get("required_skills", job.required_skills)
+                job.preferred_skills = analysis.get("preferred_skills", job.preferred_skills)
+                job.experience_level = analysis.get("experience_level", job.experience_level)
+                job.education_requirement = analysis.get("education_requirement", job.education_requirement)
+                job.text_vector = vectorize_job(job)
+                job.required_skill_bits = skill_registry.encode(db, job.required_skills)
+                job.preferred_skill_bits = skill_registry.encode(db, job.preferred_skills)
+                job.content_fingerprint = job_fingerprint(job)
+                enriched.append((job.id, job.text_vector if job.is_active else None))
+
+            job_import = db.get(JobImport, import_id)
+            job_import.rows_enriched += len(enriched)
+            job_import.enrichment_failed += len(jobs) - len(enriched)
+            db.commit()
+            for job_id, text_vector in enriched:
+                sync_job(job_id, text_vector)
+            if on_change:
+                on_change()
+
+        job_import = db.get(JobImport, import_id)
+        if job_import.status == "enriching":
+            job_import.status = "completed"
+        job_import.finished_at = datetime.now(timezone.utc)
+        db.commit()
+        job_ids = [job_id for (job_id,) in db.query(Job.id).filter(Job.import_id == import_id).order_by(Job.id)]
+    except Exception as e:
+        logger.exception(f"Enrichment of job import {import_id} failed")
+        db.rollback()
+        job_import = db.get(JobImport, import_id)
+        job_import.status, job_import.detail = "failed", f"Enrichment failed: {e}"
+        job_import.finished_at = datetime.now(timezone.utc)
+        db.commit()
+        return
+    finally:
+        db.close()
+    # Skills are final now, so the imported jobs can be pre-matched against the resume pool
+    await auto_match_jobs(job_ids)
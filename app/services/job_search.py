@@ -0,0 +1,146 @@
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.tracing import span
+from app.models.job import Job
+from app.services.ann_index import IVFIndex
+from app.services.text_vectors import decode, idf_weights, job_text, normalize_rows, term_vector
+
+logger = logging.getLogger(__name__)
+
+# Use current working directory if /app doesn't exist
+ANN_INDEX_DIR = (Path("/app") if Path("/app").exists() else Path.cwd()) / "storage" / "index" / "jobs"
+
+
+class JobVectorSnapshot:
+    """TF-IDF weighted, L2-normalized vectors of all active jobs at one point in time"""
+
+    def __init__(self, ids: np.ndarray, term_matrix: np.ndarray):
+        self.ids = ids
+        self.idf = idf_weights(term_matrix) if len(ids) else np.ones(term_matrix.shape[1], dtype=np.float32)
+        self.matrix = normalize_rows(term_matrix * self.idf)
+
+    def weigh(self, term_vector: np.ndarray) -> np.ndarray:
+        return normalize_rows(term_vector * self.idf)
+
+    def top_k(self, term_vector: np.ndarray, k: int, exclude_id: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Cosine top-K with one matrix-vector product and a partial sort"""
+        if not len(self.ids):
+            return []
+        scores = self.matrix @ self.weigh(term_vector)
+        if exclude_id is not None:
+            position = np.searchsorted(self.ids, exclude_id)
+            if position < len(self.ids) and self.ids[position] == exclude_id:
+                scores[position] = -np.inf
+        k = min(k, len(scores))
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        ranked = candidates[np.argsort(-scores[candidates])]
+        return [(int(self.ids[i]), float(scores[i])) for i in ranked if scores[i] > 0]
+
+
+class JobVectorIndex:
+    """Per-worker job matrix, rebuilt when the active job set changes.
+
+    The validator (count, max id, last modification of active jobs) catches
+    changes made by other workers; ``invalidate`` covers edits in this one
+    that land within the same second.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot: Optional[JobVectorSnapshot] = None
+        self._validator = None
+
+    def invalidate(self) -> None:
+        self._validator = None
+
+    def snapshot(self, db: Session) -> JobVectorSnapshot:
+        validator = tuple(db.query(
+            func.count(Job.id),
+            func.max(Job.id),
+            func.max(func.coalesce(Job.updated_at, Job.created_at))
+        ).filter(Job.is_active).one())
+        if self._snapshot is not None and validator == self._validator:
+            return self._snapshot
+        with self._lock:
+            if self._snapshot is None or validator != self._validator:
+                with span("job_index.build"):
+                    self._snapshot = self._build(db)
+                self._validator = validator
+            return self._snapshot
+
+    def _build(self, db: Session) -> JobVectorSnapshot:
+        return JobVectorSnapshot(*active_job_vectors(db))
+
+    def search(
+        self, db: Session, term_vector: np.ndarray, k: int, exclude_id: Optional[int] = None
+    ) -> List[Tuple[Job, float]]:
+        """Active jobs most similar to ``term_vector`` with their cosine similarity.
+
+        Uses the shared ANN index when one has been built and exact search
+        over this worker's matrix otherwise.
+        """
+        hits = None
+        if settings.JOB_ANN_ENABLED:
+            hits = job_ann_index.search(term_vector, k, settings.JOB_ANN_NPROBE, exclude_id)
+        if hits is None:
+            hits = self.snapshot(db).top_k(term_vector, k, exclude_id)
+        if not hits:
+            return []
+        # The index can lag a deactivation by a moment; the database has the final say
+        jobs = {
+            job.id: job for job in db.query(Job).filter(Job.id.in_([job_id for job_id, _ in hits]), Job.is_active)
+        }
+        return [(jobs[job_id], score) for job_id, score in hits if job_id in jobs]
+
+
+def active_job_vectors(db: Session, batch_size: int = 5000) -> Tuple[np.ndarray, np.ndarray]:
+    """Ids and term matrix of all active jobs, ordered by id"""
+    ids: List[int] = []
+    vectors: List[Optional[np.ndarray]] = []
+    rows = db.query(Job.id, Job.text_vector).filter(Job.is_active).order_by(Job.id).yield_per(batch_size)
+    for job_id, blob in rows:
+        ids.append(job_id)
+        vectors.append(decode(blob))
+    missing = [position for position, vector in enumerate(vectors) if vector is None]
+    # Rows written before vectors existed are vectorized in memory
+    for start in range(0, len(missing), batch_size):
+        positions = {ids[position]: position for position in missing[start:start + batch_size]}
+        for job in db.query(Job).filter(Job.id.in_(positions)):
+            vectors[positions[job.id]] = term_vector(job_text(job))
+    matrix = np.empty((len(ids), settings.TEXT_VECTOR_DIM), dtype=np.float32)
+    for position, vector in enumerate(vectors):
+        matrix[position] = vector if vector is not None else 0.0
+    return np.array(ids, dtype=np.int64), matrix
+
+
+def build_job_ann_index(db: Session, nlist: Optional[int] = None) -> Dict[str, Any]:
+    """Rebuild the shared ANN index from all active jobs"""
+    with span("job_ann_index.build"):
+        return job_ann_index.build(
+            lambda: active_job_vectors(db), nlist=nlist or settings.JOB_ANN_NLIST
+        )
+
+
+def sync_job(job_id: int, text_vector: Optional[bytes], created: bool = False) -> None:
+    """Apply a committed job write to the indexes; ``text_vector`` None removes the job"""
+    job_vector_index.invalidate()
+    try:
+        if text_vector is None:
+            job_ann_index.remove(job_id)
+        else:
+            vector = decode(text_vector)
+            if vector is not None:
+                job_ann_index.insert(job_id, vector, replace=not created)
+    except OSError as e:
+        # Search re-checks rows against the database, and the next rebuild catches up
+        logger.error(f"Failed to update job ANN index: {e}")
+
+
+job_vector_index = JobVectorIndex()
+job_ann_index = IVFIndex(ANN_INDEX_DIR)
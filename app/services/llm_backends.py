@@ -0,0 +1,311 @@
+import json
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Protocol
+from app.core.config import settings
+from app.services.match_scoring import score_match
+from app.services.skills import (
+    detect_education_level,
+    extract_experience_years,
+    extract_skills,
+    normalize_skills,
+)
+
+Messages = List[Dict[str, str]]
+
+
+@dataclass
+class Completion:
+    """Result of one backend call with the usage figures the LLM ledger records"""
+    text: str
+    data: Any = None  # Parsed payload for complete_json
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_prompt_tokens: int = 0
+    retry_count: int = 0
+    time_to_first_token_ms: Optional[float] = None  # Set by complete_streaming
+
+
+class LLMBackend(Protocol):
+    """What AIService needs from a model provider.
+
+    ``task`` names the AIService operation and ``context`` carries its
+    structured inputs, so backends that do not read prompts can still answer.
+    """
+    name: str
+    model: str
+    rate_limited: bool  # Calls count against provider quotas and go through the LLM scheduler
+
+    async def complete(self, task: str, messages: Messages, temperature: float, context: Dict[str, Any]) -> Completion:
+        ...
+
+    async def complete_json(
+        self, task: str, messages: Messages, temperature: float, context: Dict[str, Any]
+    ) -> Completion:
+        ...
+
+    async def complete_streaming(
+        self, task: str, messages: Messages, temperature: float, context: Dict[str, Any]
+    ) -> Completion:
+        ...
+
+    def stream(self, task: str, messages: Messages, temperature: float, context: Dict[str, Any]) -> AsyncIterator[str]:
+        ...
+
+
+class OpenAICompatibleBackend:
+    """Chat completions over HTTP against OpenAI or any compatible server"""
+    name = "openai"
+    rate_limited = True
+
+    def __init__(self, api_key: str, model: str, base_url: Optional[str] = None):
+        from openai import AsyncOpenAI
+
+        self.model = model
+        # AIService retries transient errors itself, within the task's deadline
+        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url or None, max_retries=0)
+
+    async def complete(self, task: str, messages: Messages, temperature: float, context: Dict[str, Any]) -> Completion:
+        raw = await self.client.chat.completions.with_raw_response.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature
+        )
+        response = raw.parse()
+        completion = Completion(
+            text=response.choices[0].message.content or "",
+            retry_count=getattr(raw, "retries_taken", 0)
+        )
+        usage = response.usage
+        if usage is not None:
+            completion.prompt_tokens = usage.prompt_tokens or 0
+            completion.completion_tokens = usage.completion_tokens or 0
+            details = getattr(usage, "prompt_tokens_details", None)
+            completion.cached_prompt_tokens = getattr(details, "cached_tokens", 0) or 0
+        return completion
+
+    async def complete_json(
+        self, task: str, messages: Messages, temperature: float, context: Dict[str, Any]
+    ) -> Completion:
+        completion = await self.complete(task, messages, temperature, context)
+        completion.data = json.loads(completion.text)
+        return completion
+
+    async def complete_streaming(
+        self, task: str, messages: Messages, temperature: float, context: Dict[str, Any]
+    ) -> Completion:
+        """Like complete, but streamed so the time to the first token can be measured"""
+        start = time.perf_counter()
+        chunks = await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        completion = Completion(text="")
+        parts = []
+        async for chunk in chunks:
+            if chunk.choices and chunk.choices[0].delta.content:
+                if completion.time_to_first_token_ms is None:
+                    completion.time_to_first_token_ms = round((time.perf_counter() - start) * 1000, 2)
+                parts.append(chunk.choices[0].delta.content)
+            usage = getattr(chunk, "usage", None)
+            if usage is not None:
+                completion.prompt_tokens = usage.prompt_tokens or 0
+                completion.completion_tokens = usage.completion_tokens or 0
+                details = getattr(usage, "prompt_tokens_details", None)
+                completion.cached_prompt_tokens = getattr(details, "cached_tokens", 0) or 0
+        completion.text = "".join(parts)
+        if not completion.completion_tokens:
+            # Compatible servers that ignore stream_options report no usage
+            completion.prompt_tokens = sum(_estimate_tokens(m.get("content") or "") for m in messages)
+            completion.completion_tokens = _estimate_tokens(completion.text)
+        return completion
+
+    async def stream(
+        self, task: str, messages: Messages, temperature: float, context: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        chunks = await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            stream=True
+        )
+        async for chunk in chunks:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+_EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_PHONE_PATTERN = re.compile(r"\+?\d[\d\s().-]{7,}\d")
+_PREFERRED_MARKER = re.compile(r"preferred|nice to have|bonus|plus", re.IGNORECASE)
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class LocalHeuristicBackend:
+    """Deterministic, offline answers built from keyword heuristics.
+
+    Outputs follow the same JSON shapes the prompts ask the model for, so the
+    rest of the app cannot tell the difference; quality is a rough baseline.
+    Meant for CI, benchmarks and development without network access.
+    """
+    name = "local"
+    rate_limited = False
+
+    def __init__(self, model: str = "local-heuristic"):
+        self.model = model
+
+    def _answer(self, task: str, context: Dict[str, Any]) -> Any:
+        handler = getattr(self, f"_{task}", None)
+        if handler is None:
+            raise ValueError(f"Local backend has no heuristic for task '{task}'")
+        return handler(**context)
+
+    def _analyze_resume(self, resume_text: str) -> Dict[str, Any]:
+        email = _EMAIL_PATTERN.search(resume_text)
+        phone = _PHONE_PATTERN.search(resume_text)
+        return {
+            "skills": extract_skills(resume_text),
+            "experience_years": extract_experience_years(resume_text),
+            "education_level": detect_education_level(resume_text),
+            "work_experience": [],
+            "education": [],
+            "contact_info": {
+                "email": email.group(0) if email else "",
+                "phone": phone.group(0).strip() if phone else "",
+                "location": ""
+            }
+        }
+
+    def _analyze_job_description(self, job_description: str) -> Dict[str, Any]:
+        marker = _PREFERRED_MARKER.search(job_description)
+        split = marker.start() if marker else len(job_description)
+        required = extract_skills(job_description[:split])
+        preferred = [skill for skill in extract_skills(job_description[split:]) if skill not in required]
+        lowered = job_description.lower()
+        if any(word in lowered for word in ("senior", "staff", "principal", "lead")):
+            experience_level = "senior"
+        elif any(word in lowered for word in ("junior", "entry", "graduate", "intern")):
+            experience_level = "entry"
+        else:
+            experience_level = "mid"
+        if "part-time" in lowered or "part time" in lowered:
+            job_type = "part-time"
+        elif "contract" in lowered:
+            job_type = "contract"
+        else:
+            job_type = "full-time"
+        remote_option = "hybrid" if "hybrid" in lowered else "yes" if "remote" in lowered else "no"
+        return {
+            "required_skills": required,
+            "preferred_skills": preferred,
+            "experience_level": experience_level,
+            "education_requirement": detect_education_level(job_description) or "",
+            "key_responsibilities": [],
+            "company_benefits": [],
+            "job_type": job_type,
+            "remote_option": remote_option
+        }
+
+    def _analyze_job_descriptions(self, job_descriptions: List[str]) -> Dict[str, Any]:
+        return {
+            "results": [
+                {"index": index, **self._analyze_job_description(description)}
+                for index, description in enumerate(job_descriptions)
+            ]
+        }
+
+    def _calculate_match_score(self, resume: Dict[str, Any], job: Dict[str, Any]) -> Dict[str, Any]:
+        return score_match(resume, job)
+
+    def _generate_resume_suggestions(
+        self, resume: Dict[str, Any], job: Dict[str, Any], match_analysis: Dict[str, Any]
+    ) -> List[Dict[str, str]]:
+        suggestions = [
+            {
+                "section": "skills",
+                "suggestion": f"Add {gap['skill']} with a concrete example of using it",
+                "priority": "high" if gap.get("importance") == "required" else "medium",
+                "impact": f"Covers a {gap.get('importance', 'listed')} skill for this role"
+            }
+            for gap in match_analysis.get("missing_skills", [])[:5]
+        ]
+        if (match_analysis.get("experience_match_score") or 100) < 100:
+            suggestions.append({
+                "section": "experience",
+                "suggestion": "Quantify the scope and results of your most relevant roles",
+                "priority": "medium",
+                "impact": "Offsets fewer years of experience than the role asks for"
+            })
+        return suggestions
+
+    def _generate_cover_letter(self, resume: Dict[str, Any], job: Dict[str, Any], user_name: str) -> str:
+        skills = set(normalize_skills(resume.get("skills")))
+        relevant = [
+            skill for skill in normalize_skills((job.get("required_skills") or []) + (job.get("preferred_skills") or []))
+            if skill in skills
+        ] or sorted(skills)[:3]
+        title = job.get("title") or "this role"
+        company = job.get("company") or "your company"
+        return (
+            f"Dear Hiring Manager,\n\n"
+            f"I am writing to apply for the {title} position at {company}. "
+            f"My experience with {', '.join(relevant) or 'the technologies you use'} fits what your team is looking for.\n\n"
+            f"In previous roles I have delivered and maintained production work using these skills, "
+            f"and I enjoy learning whatever a team needs next.\n\n"
+            f"I would welcome the chance to discuss how I can contribute to {company}.\n\n"
+            f"Sincerely,\n{user_name}"
+        )
+
+    def _completion(self, task: str, messages: Messages, context: Dict[str, Any]) -> Completion:
+        data = self._answer(task, context)
+        text = data if isinstance(data, str) else json.dumps(data)
+        return Completion(
+            text=text,
+            data=data,
+            prompt_tokens=sum(_estimate_tokens(m.get("content") or "") for m in messages),
+            completion_tokens=_estimate_tokens(text)
+        )
+
+    async def complete(self, task: str, messages: Messages, temperature: float, context: Dict[str, Any]) -> Completion:
+        return self._completion(task, messages, context)
+
+    async def complete_json(
+        self, task: str, messages: Messages, temperature: float, context: Dict[str, Any]
+    ) -> Completion:
+        return self._completion(task, messages, context)
+
+    async def complete_streaming(
+        self, task: str, messages: Messages, temperature: float, context: Dict[str, Any]
+    ) -> Completion:
+        # The whole answer is ready at once, so its first token arrives when it is done
+        start = time.perf_counter()
+        completion = self._completion(task, messages, context)
+        completion.time_to_first_token_ms = round((time.perf_counter() - start) * 1000, 2)
+        return completion
+
+    async def stream(
+        self, task: str, messages: Messages, temperature: float, context: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        text = self._completion(task, messages, context).text
+        for start in range(0, len(text), 64):
+            yield text[start:start + 64]
+
+
+def create_backend(name: Optional[str] = None) -> LLMBackend:
+    """Build the backend selected by LLM_BACKEND"""
+    name = (name or settings.LLM_BACKEND).lower()
+    if name == "openai":
+        return OpenAICompatibleBackend(
+            api_key=settings.OPENAI_API_KEY,
+            model=settings.LLM_MODEL,
+            base_url=settings.OPENAI_BASE_URL
+        )
+    if name == "local":
+        return LocalHeuristicBackend()
+    raise ValueError(f"Unknown LLM_BACKEND '{name}' (expected 'openai' or 'local')")
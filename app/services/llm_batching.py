@@ -0,0 +1,66 @@
+from typing import Callable, List, Sequence
+from app.core.telemetry import metrics
+
+llm_batch_size = metrics.gauge(
+    "llm_batch_size", "Current items-per-request limit of batched LLM tasks", ("task",)
+)
+llm_batch_items_total = metrics.counter(
+    "llm_batch_items_total",
+    "Items of batched LLM tasks by how they were answered (batched / single / fallback)",
+    ("task", "mode"),
+)
+
+
+class AdaptiveBatchSize:
+    """Items per batched request, tuned by additive increase / multiplicative decrease.
+
+    Every batch that comes back within ``target_latency_ms`` with few invalid
+    items grows the limit by one; a failed call, a slow one or too many
+    invalid items halves it. The limit therefore settles just below the point
+    where batches start to time out or the model starts losing items.
+    """
+
+    def __init__(
+        self,
+        task: str,
+        initial: int,
+        maximum: int,
+        target_latency_ms: float,
+        max_error_rate: float = 0.2,
+        minimum: int = 2,
+    ):
+        self.task = task
+        self.minimum = minimum
+        self.maximum = max(maximum, minimum)
+        self.target_latency_ms = target_latency_ms
+        self.max_error_rate = max_error_rate
+        self.value = min(max(initial, minimum), self.maximum)
+        llm_batch_size.set(self.value, task)
+
+    def record(self, items: int, failed: int, latency_ms: float) -> None:
+        """Feed back one batch: its size, how many items failed and its wall time"""
+        if failed > items * self.max_error_rate or latency_ms > self.target_latency_ms:
+            self.value = max(self.minimum, self.value // 2)
+        elif items >= self.value:
+            # Only full batches show that the current limit is safe
+            self.value = min(self.maximum, self.value + 1)
+        llm_batch_size.set(self.value, self.task)
+
+
+def take_batch(
+    items: Sequence[str], start: int, max_items: int, token_budget: int, estimate_tokens: Callable[[str], int]
+) -> List[int]:
+    """Indexes of the next batch from ``start``: up to ``max_items`` items whose estimates fit ``token_budget``.
+
+    The first item is always taken, so one that is over budget on its own
+    comes back as a batch of one.
+    """
+    batch: List[int] = []
+    used = 0
+    for index in range(start, len(items)):
+        tokens = estimate_tokens(items[index])
+        if batch and (len(batch) >= max_items or used + tokens > token_budget):
+            break
+        batch.append(index)
+        used += tokens
+    return batch
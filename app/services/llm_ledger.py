@@ -0,0 +1,167 @@
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LLMCallRecord:
+    """One completion request made on behalf of an AIService task"""
+    task: str
+    model: str
+    started_at: float = field(default_factory=time.time)
+    wall_time_ms: float = 0.0
+    time_to_first_token_ms: Optional[float] = None  # Streamed (prose) calls only; JSON answers arrive whole
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_prompt_tokens: int = 0
+    cache_status: str = "miss"  # hit / miss (provider prompt cache)
+    retry_count: int = 0
+    hedged: bool = False  # A second request was raced against a slow first one
+    priority: str = "interactive"  # Scheduler priority class
+    queue_ms: float = 0.0  # Time spent waiting for rate-limit budget
+    outcome: str = "ok"  # ok / error / invalid_json / timeout / short_circuited / fallback
+    error: Optional[str] = None
+    cost_usd: float = 0.0
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Price a call from LLM_PRICING_PER_1K_TOKENS ([prompt, completion] USD per 1K tokens)"""
+    pricing = settings.LLM_PRICING_PER_1K_TOKENS.get(model)
+    if not pricing:
+        return 0.0
+    return round(prompt_tokens / 1000 * pricing[0] + completion_tokens / 1000 * pricing[1], 8)
+
+
+def _percentile(sorted_values: List[float], percentile: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    # Nearest-rank percentile
+    rank = max(1, math.ceil(percentile / 100 * len(sorted_values)))
+    return round(sorted_values[rank - 1], 2)
+
+
+class LLMLedger:
+    """Buffered, append-only JSON-lines log of LLM calls.
+
+    Records are kept in memory and appended to one file per worker and day
+    once ``flush_size`` records or ``flush_interval`` seconds accumulate, so
+    recording a call never waits on disk in the common case.
+    """
+
+    def __init__(self, directory: Optional[Path] = None, flush_size: int = 50, flush_interval: float = 10.0):
+        if directory is None:
+            # Use current working directory if /app doesn't exist
+            base_path = Path("/app") if Path("/app").exists() else Path.cwd()
+            directory = base_path / "storage" / "llm_ledger"
+        self.directory = directory
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._buffer: List[LLMCallRecord] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record(self, call: LLMCallRecord) -> None:
+        with self._lock:
+            self._buffer.append(call)
+            due = (
+                len(self._buffer) >= self.flush_size
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+        lines = "".join(json.dumps(asdict(call)) + "\n" for call in pending)
+        day = datetime.now(timezone.utc).strftime("%Y%m%d")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self.directory / f"calls-{day}-{os.getpid()}.jsonl", "a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError as e:
+            logger.error(f"Failed to write LLM ledger: {e}")
+
+    def read(self, since: float, until: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Return records started in [since, until) from all workers' files and this worker's buffer"""
+        until = until or time.time()
+        first_day = datetime.fromtimestamp(since, timezone.utc).strftime("%Y%m%d")
+        records: List[Dict[str, Any]] = []
+        if self.directory.exists():
+            for path in sorted(self.directory.glob("calls-*.jsonl")):
+                if path.name.split("-")[1] < first_day:
+                    continue
+                with open(path, encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            call = json.loads(line)
+                        except ValueError:
+                            continue
+                        if since <= call.get("started_at", 0) < until:
+                            records.append(call)
+        with self._lock:
+            records.extend(asdict(call) for call in self._buffer if since <= call.started_at < until)
+        return records
+
+    def summarize(self, since: float, until: Optional[float] = None, task: Optional[str] = None) -> Dict[str, Any]:
+        """Aggregate latency percentiles, tokens, cost and outcomes per task"""
+        by_task: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for call in self.read(since, until):
+            if task is None or call["task"] == task:
+                by_task[call["task"]].append(call)
+
+        summary = {}
+        for name, calls in sorted(by_task.items()):
+            latencies = sorted(call["wall_time_ms"] for call in calls)
+            queued = sorted(call.get("queue_ms", 0.0) for call in calls)
+            first_tokens = sorted(
+                call["time_to_first_token_ms"] for call in calls if call.get("time_to_first_token_ms") is not None
+            )
+            outcomes: Dict[str, int] = defaultdict(int)
+            for call in calls:
+                outcomes[call["outcome"]] += 1
+            summary[name] = {
+                "calls": len(calls),
+                "outcomes": dict(outcomes),
+                "latency_ms": {
+                    "p50": _percentile(latencies, 50),
+                    "p95": _percentile(latencies, 95),
+                    "p99": _percentile(latencies, 99),
+                },
+                "queue_ms": {
+                    "p50": _percentile(queued, 50),
+                    "p95": _percentile(queued, 95),
+                },
+                "time_to_first_token_ms": {
+                    "p50": _percentile(first_tokens, 50),
+                    "p95": _percentile(first_tokens, 95),
+                    "p99": _percentile(first_tokens, 99),
+                },
+                "prompt_tokens": sum(call["prompt_tokens"] for call in calls),
+                "completion_tokens": sum(call["completion_tokens"] for call in calls),
+                "cache_hit_rate": round(sum(call["cache_status"] == "hit" for call in calls) / len(calls), 4),
+                "retries": sum(call["retry_count"] for call in calls),
+                "hedged": sum(bool(call.get("hedged")) for call in calls),
+                "cost_usd": round(sum(call["cost_usd"] for call in calls), 6),
+            }
+        return summary
+
+
+llm_ledger = LLMLedger(
+    flush_size=settings.LLM_LEDGER_FLUSH_SIZE,
+    flush_interval=settings.LLM_LEDGER_FLUSH_SECONDS,
+)
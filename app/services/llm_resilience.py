@@ -0,0 +1,284 @@
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, Dict, Optional, Tuple
+from app.core.config import settings
+from app.core.telemetry import metrics
+from app.services.llm_backends import Completion, LLMBackend
+from app.services.llm_ledger import LLMCallRecord
+from app.services.llm_scheduler import LLMScheduler
+
+llm_calls_total = metrics.counter(
+    "llm_calls_total",
+    "AIService calls by task and outcome (ok / error / invalid_json / timeout / short_circuited / fallback)",
+    ("task", "outcome"),
+)
+llm_call_duration_seconds = metrics.histogram(
+    "llm_call_duration_seconds", "AIService call time including retries and hedges, by task", ("task",)
+)
+llm_call_events_total = metrics.counter(
+    "llm_call_events_total", "Retries, hedged requests and hedges that answered first, by task", ("task", "event")
+)
+llm_circuit_state = metrics.gauge(
+    "llm_circuit_state", "LLM provider circuit breaker state (0 closed, 1 half-open, 2 open)", ("backend",)
+)
+
+CIRCUIT_STATES = {"closed": 0, "half_open": 1, "open": 2}
+
+Request = Callable[[LLMBackend], Awaitable[Completion]]
+
+
+class CircuitOpenError(Exception):
+    """The provider's circuit breaker is open and no fallback backend is configured"""
+
+
+def is_transient(error: BaseException) -> bool:
+    """Errors worth retrying: timeouts, dropped connections, rate limits and 5xx answers"""
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    status_code = getattr(error, "status_code", None)
+    if isinstance(status_code, int):
+        return status_code in (408, 409, 429) or status_code >= 500
+    # openai raises these without a status code
+    return type(error).__name__ in ("APIConnectionError", "APITimeoutError")
+
+
+def retry_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff before retry number ``attempt`` (0-based)"""
+    return random.uniform(0, min(settings.LLM_RETRY_MAX_SECONDS, settings.LLM_RETRY_BASE_SECONDS * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """Stops calling a provider whose recent error rate spiked, then probes it after a cooldown.
+
+    Opens once at least ``min_calls`` calls ended within ``window_seconds``
+    and ``error_rate`` of them failed. After ``cooldown_seconds`` a single
+    probe call is let through (half-open); its outcome closes the breaker
+    or opens it for another cooldown.
+    """
+
+    def __init__(self, name: str, error_rate: float, min_calls: int, window_seconds: float, cooldown_seconds: float):
+        self.name = name
+        self.error_rate = error_rate
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self.state = "closed"
+        self._opened_at = 0.0
+        self._probing = False
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._lock = threading.Lock()
+        llm_circuit_state.set(0, name)
+
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        llm_circuit_state.set(CIRCUIT_STATES[state], self.name)
+
+    def allow(self) -> Optional[str]:
+        """Whether a call may go to the provider now: "call", "probe" (the half-open trial) or None"""
+        with self._lock:
+            if self.state == "closed":
+                return "call"
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.cooldown_seconds:
+                self._set_state("half_open")
+            if self.state == "half_open" and not self._probing:
+                self._probing = True
+                return "probe"
+            return None
+
+    def end_probe(self) -> None:
+        """Let the next call probe if the current probe ended without an outcome (e.g. it was cancelled)"""
+        with self._lock:
+            self._probing = False
+
+    def record(self, ok: bool) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if self.state == "half_open" and self._probing:
+                self._probing = False
+                self._outcomes.clear()
+                if ok:
+                    self._set_state("closed")
+                else:
+                    self._opened_at = now
+                    self._set_state("open")
+                return
+            self._outcomes.append((now, ok))
+            while self._outcomes and self._outcomes[0][0] < now - self.window_seconds:
+                self._outcomes.popleft()
+            if self.state == "closed" and len(self._outcomes) >= self.min_calls:
+                failures = sum(not outcome for _, outcome in self._outcomes)
+                if failures >= self.error_rate * len(self._outcomes):
+                    self._opened_at = now
+                    self._set_state("open")
+
+
+class LatencyTracker:
+    """Recent call latencies per task, for the hedging delay"""
+
+    def __init__(self, size: int = 200):
+        self.size = size
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def observe(self, task: str, seconds: float) -> None:
+        self._samples.setdefault(task, deque(maxlen=self.size)).append(seconds)
+
+    def p95(self, task: str, min_samples: int) -> Optional[float]:
+        samples = self._samples.get(task)
+        if not samples or len(samples) < min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+
+class ResilientCaller:
+    """Runs AIService completions under a deadline, with retries, hedging and a circuit breaker.
+
+    Every request to the provider first waits for the scheduler, if any,
+    to admit it within the rate limits. Each call gets the deadline of its
+    task (LLM_TASK_DEADLINES, else LLM_DEADLINE_SECONDS) covering all
+    attempts. Transient errors are retried with jittered backoff; with
+    LLM_HEDGE_ENABLED an attempt still running after the task's observed
+    p95 gets a second, identical request and the first answer wins. While
+    the breaker is open calls go to the fallback backend, or fail fast with
+    CircuitOpenError without one.
+    """
+
+    def __init__(
+        self, backend: LLMBackend, fallback: Optional[LLMBackend] = None, scheduler: Optional[LLMScheduler] = None
+    ):
+        self.backend = backend
+        self.fallback = fallback
+        self.scheduler = scheduler
+        self.breaker = CircuitBreaker(
+            backend.name,
+            error_rate=settings.LLM_BREAKER_ERROR_RATE,
+            min_calls=settings.LLM_BREAKER_MIN_CALLS,
+            window_seconds=settings.LLM_BREAKER_WINDOW_SECONDS,
+            cooldown_seconds=settings.LLM_BREAKER_COOLDOWN_SECONDS
+        )
+        self.latency = LatencyTracker()
+
+    async def complete(self, task: str, request: Request, call: LLMCallRecord, tokens: int = 0) -> Completion:
+        """Answer ``request`` for ``task``, recording queueing, retries, hedging and fallback on ``call``.
+
+        ``tokens`` is the request's estimated size for the scheduler. Time
+        spent queued counts against the deadline, so a call never waits on
+        the scheduler for longer than its task allows.
+        """
+        admission = self.breaker.allow()
+        if admission is None:
+            if self.fallback is None:
+                call.outcome = "short_circuited"
+                raise CircuitOpenError(f"LLM backend '{self.backend.name}' is failing; circuit open")
+            call.outcome = "fallback"
+            call.model = self.fallback.model
+            return await request(self.fallback)
+        attempt = _Attempt(task, request, call, tokens)
+        try:
+            deadline = settings.LLM_TASK_DEADLINES.get(task, settings.LLM_DEADLINE_SECONDS)
+            try:
+                return await asyncio.wait_for(self._admitted(attempt), deadline)
+            except asyncio.TimeoutError:
+                if attempt.sent:
+                    # A provider that left a request hanging failed it; time spent in our queue is not its fault
+                    self.breaker.record(False)
+                call.outcome = "timeout"
+                raise asyncio.TimeoutError(f"No answer for {task} within {deadline}s") from None
+        finally:
+            if admission == "probe":
+                # No-op once the probe's outcome was recorded; otherwise the breaker would wait on it forever
+                self.breaker.end_probe()
+
+    async def _admit(self, attempt: "_Attempt") -> None:
+        if self.scheduler is not None:
+            waited = await self.scheduler.acquire(attempt.tokens)
+            attempt.call.queue_ms = round(attempt.call.queue_ms + waited * 1000, 2)
+
+    async def _admitted(self, attempt: "_Attempt") -> Completion:
+        # Admitted before the first send so queueing does not start the hedge timer
+        await self._admit(attempt)
+        return await self._with_retries(attempt)
+
+    async def _with_retries(self, attempt: "_Attempt") -> Completion:
+        task, call = attempt.task, attempt.call
+        retries = 0
+        admitted = True
+        while True:
+            hedge_after = (
+                self.latency.p95(task, settings.LLM_HEDGE_MIN_SAMPLES) if settings.LLM_HEDGE_ENABLED else None
+            )
+            try:
+                completion = await self._hedged(attempt, hedge_after, admitted)
+            except Exception as e:
+                if retries >= settings.LLM_MAX_RETRIES or not is_transient(e):
+                    raise
+                retries += 1
+                admitted = False
+                call.retry_count += 1
+                llm_call_events_total.inc(task, "retried")
+                await asyncio.sleep(retry_delay(retries - 1))
+                continue
+            call.retry_count += completion.retry_count
+            return completion
+
+    async def _send(self, attempt: "_Attempt", admitted: bool) -> Completion:
+        """One request to the provider, waiting for the scheduler first unless already admitted"""
+        if not admitted:
+            await self._admit(attempt)
+        attempt.sent = True
+        start = time.perf_counter()
+        try:
+            completion = await attempt.request(self.backend)
+        except ValueError:
+            # Unparseable output says nothing about the provider's health
+            self.breaker.record(True)
+            raise
+        except Exception:
+            self.breaker.record(False)
+            raise
+        self.breaker.record(True)
+        self.latency.observe(attempt.task, time.perf_counter() - start)
+        if self.scheduler is not None:
+            self.scheduler.settle(attempt.tokens, completion.prompt_tokens + completion.completion_tokens)
+        return completion
+
+    async def _hedged(self, attempt: "_Attempt", hedge_after: Optional[float], admitted: bool) -> Completion:
+        first = asyncio.ensure_future(self._send(attempt, admitted))
+        if hedge_after is None:
+            return await first
+        futures = {first}
+        try:
+            done, _ = await asyncio.wait(futures, timeout=hedge_after)
+            if done:
+                return first.result()
+            attempt.call.hedged = True
+            llm_call_events_total.inc(attempt.task, "hedged")
+            second = asyncio.ensure_future(self._send(attempt, admitted=False))
+            futures.add(second)
+            pending = set(futures)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is None:
+                        if future is second:
+                            llm_call_events_total.inc(attempt.task, "hedge_won")
+                        return future.result()
+            # Both failed: surface the original request's error
+            return first.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+@dataclass
+class _Attempt:
+    """One AIService call as it moves through queueing, retries and hedges"""
+    task: str
+    request: Request
+    call: LLMCallRecord
+    tokens: int
+    sent: bool = False  # Some request reached the provider
@@ -0,0 +1,220 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Deque, Dict, Iterator, Optional
+from app.core.config import settings
+from app.core.telemetry import metrics
+
+PRIORITIES = ("interactive", "background")  # Served strictly in this order
+
+llm_priority: ContextVar[str] = ContextVar("llm_priority", default="interactive")
+llm_user: ContextVar[Optional[str]] = ContextVar("llm_user", default=None)
+
+llm_scheduler_queue_depth = metrics.gauge(
+    "llm_scheduler_queue_depth", "LLM requests waiting for rate-limit budget, by priority", ("priority",)
+)
+llm_scheduler_wait_seconds = metrics.histogram(
+    "llm_scheduler_wait_seconds", "Time LLM requests waited for rate-limit budget, by priority", ("priority",)
+)
+
+
+@contextmanager
+def llm_scope(priority: Optional[str] = None, user_id: Optional[object] = None) -> Iterator[None]:
+    """Run the enclosed AIService calls at ``priority`` on behalf of ``user_id`` (fair-queued per user)"""
+    if priority is not None and priority not in PRIORITIES:
+        raise ValueError(f"Unknown LLM priority '{priority}' (expected one of {', '.join(PRIORITIES)})")
+    priority_token = llm_priority.set(priority) if priority is not None else None
+    user_token = llm_user.set(str(user_id)) if user_id is not None else None
+    try:
+        yield
+    finally:
+        if user_token is not None:
+            llm_user.reset(user_token)
+        if priority_token is not None:
+            llm_priority.reset(priority_token)
+
+
+class TokenBucket:
+    """Refills at ``per_minute / 60`` per second up to ``capacity``; may go negative after a settle"""
+
+    def __init__(self, per_minute: float, capacity: float):
+        self.rate = per_minute / 60
+        self.capacity = max(capacity, 1.0)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, amount: float, floor: float = 0.0) -> float:
+        """Seconds until ``amount`` can be taken leaving at least ``floor``"""
+        self._refill()
+        missing = min(amount, self.capacity - floor) + floor - self.tokens
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def adjust(self, amount: float) -> None:
+        """Charge (positive) or refund (negative) the difference between estimated and actual use"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+
+@dataclass
+class _Waiter:
+    tokens: int
+    priority: str
+    future: asyncio.Future
+    enqueued: float = field(default_factory=time.monotonic)
+
+
+class LLMScheduler:
+    """Admits LLM requests within requests/min and tokens/min budgets, by priority and per-user fairness.
+
+    The provider's budgets are split evenly across ``workers`` processes.
+    Interactive requests always go first; background requests only run
+    while both buckets keep ``interactive_reserve`` of their capacity free,
+    so bulk work cannot use up the budget a waiting user needs. Within a
+    priority, users take turns one request at a time.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        workers: int = 1,
+        burst_seconds: float = 10,
+        interactive_reserve: float = 0.2,
+    ):
+        workers = max(workers, 1)
+        self.buckets = {}
+        if requests_per_minute > 0:
+            rpm = requests_per_minute / workers
+            self.buckets["requests"] = TokenBucket(rpm, rpm / 60 * burst_seconds)
+        if tokens_per_minute > 0:
+            tpm = tokens_per_minute / workers
+            self.buckets["tokens"] = TokenBucket(tpm, tpm / 60 * burst_seconds)
+        self.interactive_reserve = interactive_reserve
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _reset(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._queues: Dict[str, "OrderedDict[Optional[str], Deque[_Waiter]]"] = {
+            priority: OrderedDict() for priority in PRIORITIES
+        }
+        self._wakeup = asyncio.Event()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    def _delay(self, tokens: int, priority: str) -> float:
+        delay = 0.0
+        for name, bucket in self.buckets.items():
+            amount = 1 if name == "requests" else tokens
+            floor = bucket.capacity * self.interactive_reserve if priority != "interactive" else 0.0
+            delay = max(delay, bucket.delay(amount, floor))
+        return delay
+
+    def _take(self, tokens: int) -> None:
+        for name, bucket in self.buckets.items():
+            bucket.take(1 if name == "requests" else tokens)
+
+    def _queued(self) -> int:
+        return sum(len(waiters) for users in self._queues.values() for waiters in users.values())
+
+    async def acquire(self, tokens: int) -> float:
+        """Wait until a request of about ``tokens`` tokens may be sent; returns the seconds waited"""
+        if not self.buckets:
+            return 0.0
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._reset(loop)
+        priority, user = llm_priority.get(), llm_user.get()
+        if not self._queued() and self._delay(tokens, priority) == 0:
+            self._take(tokens)
+            llm_scheduler_wait_seconds.observe(0.0, priority)
+            return 0.0
+
+        waiter = _Waiter(tokens, priority, loop.create_future())
+        self._queues[priority].setdefault(user, deque()).append(waiter)
+        llm_scheduler_queue_depth.inc(priority)
+        self._wakeup.set()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = loop.create_task(self._dispatch())
+        try:
+            await waiter.future
+        finally:
+            if not waiter.future.done():
+                # Cancelled while queued (e.g. the call's deadline passed); the dispatcher skips it
+                waiter.future.cancel()
+        waited = time.monotonic() - waiter.enqueued
+        llm_scheduler_wait_seconds.observe(waited, priority)
+        return waited
+
+    def settle(self, estimated: int, actual: int) -> None:
+        """Correct the tokens bucket once a request's real usage is known"""
+        bucket = self.buckets.get("tokens")
+        if bucket is not None and actual:
+            bucket.adjust(actual - estimated)
+
+    def _next(self) -> Optional[_Waiter]:
+        """Head of the next user's queue in the highest non-empty priority, dropping cancelled waiters"""
+        for priority in PRIORITIES:
+            users = self._queues[priority]
+            while users:
+                user, waiters = next(iter(users.items()))
+                while waiters and waiters[0].future.done():
+                    waiters.popleft()
+                    llm_scheduler_queue_depth.dec(priority)
+                if waiters:
+                    return waiters[0]
+                del users[user]
+        return None
+
+    def _pop(self, waiter: _Waiter) -> None:
+        users = self._queues[waiter.priority]
+        user, waiters = next(iter(users.items()))
+        waiters.popleft()
+        llm_scheduler_queue_depth.dec(waiter.priority)
+        # Round robin: the user just served goes to the back of its priority's line
+        del users[user]
+        if waiters:
+            users[user] = waiters
+
+    async def _dispatch(self) -> None:
+        while True:
+            self._wakeup.clear()
+            waiter = self._next()
+            if waiter is None:
+                return
+            delay = self._delay(waiter.tokens, waiter.priority)
+            if delay > 0:
+                # Re-evaluate early when a new request arrives: it may outrank this one
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            self._pop(waiter)
+            self._take(waiter.tokens)
+            waiter.future.set_result(None)
+
+
+@lru_cache(maxsize=1)
+def get_llm_scheduler() -> LLMScheduler:
+    """This worker's scheduler, with the LLM_RATE_LIMIT_* budgets split across the deployment's processes"""
+    workers = settings.LLM_RATE_LIMIT_WORKERS or int(os.getenv("WEB_CONCURRENCY", "1"))
+    return LLMScheduler(
+        settings.LLM_RATE_LIMIT_RPM,
+        settings.LLM_RATE_LIMIT_TPM,
+        workers=workers,
+        burst_seconds=settings.LLM_RATE_LIMIT_BURST_SECONDS,
+        interactive_reserve=settings.LLM_SCHEDULER_INTERACTIVE_RESERVE
+    )
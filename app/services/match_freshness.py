@@ -0,0 +1,154 @@
+import hashlib
+import json
+import logging
+from typing import Any, Dict, List, Optional
+from sqlalchemy import or_
+from sqlalchemy.orm import Query, Session, joinedload, selectinload
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.job import Job
+from app.models.match import Match, SkillGap
+from app.models.resume import Resume
+from app.services.ai_service import get_ai_service
+from app.services.llm_scheduler import llm_scope
+from app.services.match_scoring import score_match
+
+logger = logging.getLogger(__name__)
+
+
+def resume_match_data(resume: Resume) -> Dict[str, Any]:
+    """The resume fields a match is scored from"""
+    return {
+        "skills": resume.skills or [],
+        "experience_years": resume.experience_years,
+        "education_level": resume.education_level,
+        "parsed_data": resume.parsed_data or {}
+    }
+
+
+def job_match_data(job: Any) -> Dict[str, Any]:
+    """The job fields a match is scored from (a Job row or a JobCreate)"""
+    return {
+        "required_skills": job.required_skills or [],
+        "preferred_skills": job.preferred_skills or [],
+        "experience_level": job.experience_level,
+        "education_requirement": job.education_requirement,
+        "description": job.description
+    }
+
+
+def content_fingerprint(data: Dict[str, Any]) -> str:
+    """Stable hash of scoring inputs; equal fingerprints mean a match needs no re-scoring"""
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+
+def resume_fingerprint(resume: Resume) -> str:
+    return content_fingerprint(resume_match_data(resume))
+
+
+def job_fingerprint(job: Any) -> str:
+    return content_fingerprint(job_match_data(job))
+
+
+def apply_match_analysis(
+    match: Match, analysis: Dict[str, Any], suggestions: Optional[List[Dict[str, Any]]] = None
+) -> None:
+    """Write a calculate_match_score result onto a match, replacing its skill gaps"""
+    match.match_score = analysis.get("overall_score", 0)
+    match.skill_match_score = analysis.get("skill_match_score", 0)
+    match.experience_match_score = analysis.get("experience_match_score", 0)
+    match.education_match_score = analysis.get("education_match_score", 0)
+    match.overall_feedback = analysis.get("overall_feedback", "")
+    if suggestions is not None:
+        match.resume_suggestions = suggestions
+    match.skill_gaps = [
+        SkillGap(
+            missing_skill=skill_data.get("skill", ""),
+            importance=skill_data.get("importance", ""),
+            suggestion=skill_data.get("suggestion", "")
+        )
+        for skill_data in analysis.get("missing_skills", [])
+    ]
+
+
+def mark_matches_stale(db: Session, resume_id: Optional[int] = None, job_id: Optional[int] = None) -> int:
+    """Flag the matches of an edited resume or job for re-scoring; the caller commits"""
+    query = db.query(Match).filter(Match.is_stale.is_(False))
+    if resume_id is not None:
+        query = query.filter(Match.resume_id == resume_id)
+    if job_id is not None:
+        query = query.filter(Match.job_id == job_id)
+    return query.update({Match.is_stale: True}, synchronize_session=False)
+
+
+def stale_matches_query(db: Session, resume_id: Optional[int] = None, job_id: Optional[int] = None) -> Query:
+    """Matches flagged stale, or computed from content other than the stored fingerprints.
+
+    The fingerprint comparison also catches a match a concurrent re-score
+    wrote from content that was edited while it ran.
+    """
+    query = db.query(Match).join(Resume, Match.resume_id == Resume.id).join(Job, Match.job_id == Job.id).filter(
+        or_(
+            Match.is_stale,
+            Match.resume_fingerprint != Resume.content_fingerprint,
+            Match.job_fingerprint != Job.content_fingerprint
+        )
+    )
+    if resume_id is not None:
+        query = query.filter(Match.resume_id == resume_id)
+    if job_id is not None:
+        query = query.filter(Match.job_id == job_id)
+    return query
+
+
+async def rescore_stale_matches(resume_id: Optional[int] = None, job_id: Optional[int] = None) -> int:
+    """Recompute stale matches in batches, optionally only those of one resume or job.
+
+    MATCH_RESCORE_ENGINE "local" scores with match_scoring and keeps the
+    existing suggestions; "llm" asks the AI service at background priority
+    and falls back to the local score when that call fails.
+    """
+    use_llm = settings.MATCH_RESCORE_ENGINE == "llm"
+    db = SessionLocal()
+    rescored = 0
+    try:
+        cursor = 0
+        while True:
+            matches = stale_matches_query(db, resume_id, job_id).options(
+                joinedload(Match.resume), joinedload(Match.job), selectinload(Match.skill_gaps)
+            ).filter(Match.id > cursor).order_by(Match.id).limit(settings.MATCH_RESCORE_BATCH_SIZE).all()
+            if not matches:
+                break
+            cursor = matches[-1].id
+
+            for match in matches:
+                resume_data, job_data = resume_match_data(match.resume), job_match_data(match.job)
+                analysis, suggestions = None, None
+                if use_llm:
+                    ai_service = get_ai_service()
+                    with llm_scope("background", user_id=match.user_id):
+                        analysis = await ai_service.calculate_match_score(resume_data, job_data)
+                        # calculate_match_score answers failures with bare zero scores
+                        if "overall_feedback" in analysis:
+                            suggestions = await ai_service.generate_resume_suggestions(
+                                resume_data, job_data, analysis
+                            )
+                        else:
+                            analysis = None
+                if analysis is None:
+                    analysis = score_match(resume_data, job_data)
+                apply_match_analysis(match, analysis, suggestions)
+                match.resume_fingerprint = content_fingerprint(resume_data)
+                match.job_fingerprint = content_fingerprint(job_data)
+                match.is_stale = False
+            db.commit()
+            rescored += len(matches)
+    except Exception:
+        logger.exception(f"Re-scoring stale matches (resume {resume_id}, job {job_id}) failed")
+        db.rollback()
+    finally:
+        db.close()
+    if rescored:
+        logger.info(f"Re-scored {rescored} stale matches (resume {resume_id}, job {job_id})")
+    return rescored
@@ -0,0 +1,102 @@
+from typing import Any, Dict, List, Optional
+from app.services.skills import education_rank, normalize_skills
+
+# Years of experience expected for each experience level
+EXPERIENCE_LEVEL_YEARS = {
+    "entry": 0,
+    "junior": 1,
+    "mid": 3,
+    "senior": 6,
+    "lead": 8,
+    "principal": 10,
+}
+
+SKILL_WEIGHT = 0.6
+EXPERIENCE_WEIGHT = 0.25
+EDUCATION_WEIGHT = 0.15
+REQUIRED_SKILL_SHARE = 0.75  # Share of the skill score driven by required (vs preferred) skills
+
+
+def required_years(experience_level: Optional[str]) -> Optional[int]:
+    level = (experience_level or "").lower()
+    for name, years in sorted(EXPERIENCE_LEVEL_YEARS.items(), key=lambda item: -item[1]):
+        if name in level:
+            return years
+    return None
+
+
+def skill_score(resume_skills: List[str], required: List[str], preferred: List[str]) -> float:
+    have = set(resume_skills)
+    parts = []
+    if required:
+        parts.append((REQUIRED_SKILL_SHARE, len(have & set(required)) / len(required)))
+    if preferred:
+        parts.append((1 - REQUIRED_SKILL_SHARE, len(have & set(preferred)) / len(preferred)))
+    if not parts:
+        return 100.0
+    return 100.0 * sum(weight * coverage for weight, coverage in parts) / sum(weight for weight, _ in parts)
+
+
+def experience_score(experience_years: Optional[int], experience_level: Optional[str]) -> float:
+    needed = required_years(experience_level)
+    if not needed:
+        return 100.0
+    if experience_years is None:
+        return 50.0
+    return min(100.0, 100.0 * experience_years / needed)
+
+
+def education_score(education_level: Optional[str], education_requirement: Optional[str]) -> float:
+    needed = education_rank(education_requirement)
+    if not needed:
+        return 100.0
+    have = education_rank(education_level)
+    if not have:
+        return 50.0
+    return max(0.0, 100.0 - 25.0 * max(0, needed - have))
+
+
+def score_match(resume_data: Dict[str, Any], job_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Score a resume against a job without an LLM, in calculate_match_score's response shape"""
+    resume_skills = normalize_skills(resume_data.get("skills"))
+    required = normalize_skills(job_data.get("required_skills"))
+    preferred = [skill for skill in normalize_skills(job_data.get("preferred_skills")) if skill not in required]
+
+    skills = skill_score(resume_skills, required, preferred)
+    experience = experience_score(resume_data.get("experience_years"), job_data.get("experience_level"))
+    education = education_score(resume_data.get("education_level"), job_data.get("education_requirement"))
+    overall = SKILL_WEIGHT * skills + EXPERIENCE_WEIGHT * experience + EDUCATION_WEIGHT * education
+
+    have = set(resume_skills)
+    missing = [(skill, "required") for skill in required if skill not in have]
+    missing += [(skill, "preferred") for skill in preferred if skill not in have]
+    matched = [skill for skill in required + preferred if skill in have]
+
+    weaknesses = []
+    if experience < 100:
+        weaknesses.append("Less experience than the role's level usually calls for")
+    if education < 100:
+        weaknesses.append("Education below the stated requirement")
+    if missing:
+        weaknesses.append(f"Missing {len(missing)} of {len(required) + len(preferred)} listed skills")
+
+    return {
+        "overall_score": round(overall, 1),
+        "skill_match_score": round(skills, 1),
+        "experience_match_score": round(experience, 1),
+        "education_match_score": round(education, 1),
+        "missing_skills": [
+            {
+                "skill": skill,
+                "importance": importance,
+                "suggestion": f"Show concrete experience with {skill}, e.g. a project or role where you used it"
+            }
+            for skill, importance in missing
+        ],
+        "strengths": [f"Has {skill}" for skill in matched],
+        "weaknesses": weaknesses,
+        "overall_feedback": (
+            f"Matches {len(matched)} of {len(required) + len(preferred)} listed skills. "
+            f"Skills {skills:.0f}/100, experience {experience:.0f}/100, education {education:.0f}/100."
+        ),
+    }
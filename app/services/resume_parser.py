@@ -1,13 +1,14 @@
-import PyPDF2
-import docx
 from typing import Optional
 from pathlib import Path
+from app.core.tracing import span
 
 
 class ResumeParser:
     @staticmethod
     def extract_text_from_pdf(file_path: str) -> Optional[str]:
         """Extract text from PDF file"""
+        import PyPDF2
+
         try:
             with open(file_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
@@ -22,6 +23,8 @@ class ResumeParser:
     @staticmethod
     def extract_text_from_docx(file_path: str) -> Optional[str]:
         """Extract text from DOCX file"""
+        import docx
+
         try:
             doc = docx.Document(file_path)
             text = ""
@@ -47,12 +50,13 @@ class ResumeParser:
         """Extract text from file based on extension"""
         file_extension = Path(file_path).suffix.lower()
         
-        if file_extension == '.pdf':
-            return cls.extract_text_from_pdf(file_path)
-        elif file_extension == '.docx':
-            return cls.extract_text_from_docx(file_path)
-        elif file_extension == '.txt':
-            return cls.extract_text_from_txt(file_path)
-        else:
-            print(f"Unsupported file format: {file_extension}")
-            return None
\ No newline at end of file
+        with span("resume.extract_text", format=file_extension):
+            if file_extension == '.pdf':
+                return cls.extract_text_from_pdf(file_path)
+            elif file_extension == '.docx':
+                return cls.extract_text_from_docx(file_path)
+            elif file_extension == '.txt':
+                return cls.extract_text_from_txt(file_path)
+            else:
+                print(f"Unsupported file format: {file_extension}")
+                return None
\ No newline at end of file
@@ -0,0 +1,153 @@
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.job import Job
+from app.models.skill import Skill
+from app.services.match_scoring import REQUIRED_SKILL_SHARE
+from app.services.skills import normalize_skills
+
+_BYTE_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def encode(bits: int) -> bytes:
+    """Little-endian bytes of a bitset, padded to whole 64-bit words"""
+    return bits.to_bytes((bits.bit_length() + 63) // 64 * 8, "little")
+
+
+def decode(blob: Optional[bytes]) -> int:
+    return int.from_bytes(blob or b"", "little")
+
+
+def pack(blobs: Sequence[bytes], words: int = 0) -> np.ndarray:
+    """Stack encoded bitsets into a (len(blobs), words) uint64 matrix, widening to the longest.
+
+    Matrices combined with & must share a width, so pass the widest ``words``.
+    """
+    words = max([words, 1] + [len(blob) // 8 for blob in blobs])
+    buffer = b"".join(blob.ljust(words * 8, b"\0") for blob in blobs)
+    return np.frombuffer(buffer, dtype="<u8").reshape(len(blobs), words)
+
+
+def popcount(matrix: np.ndarray) -> np.ndarray:
+    """Set bits per row of a uint64 matrix (np.bitwise_count on NumPy 2, a byte table before)"""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(matrix).sum(axis=-1, dtype=np.int64)
+    return _BYTE_POPCOUNT[np.ascontiguousarray(matrix).view(np.uint8)].sum(axis=-1, dtype=np.int64)
+
+
+def skill_overlap(resume: np.ndarray, required: np.ndarray, preferred: np.ndarray) -> Dict[str, np.ndarray]:
+    """Skill coverage of resumes against jobs, broadcasting over packed bitset rows.
+
+    Compare one resume row with a job matrix or one job with a resume
+    matrix. ``skill_match_score`` equals match_scoring.skill_score, with
+    preferred skills that are also required counted as required.
+    """
+    preferred = preferred & ~required
+    required_total, preferred_total = popcount(required), popcount(preferred)
+    required_matched, preferred_matched = popcount(resume & required), popcount(resume & preferred)
+
+    required_weight = np.where(required_total > 0, REQUIRED_SKILL_SHARE, 0.0)
+    preferred_weight = np.where(preferred_total > 0, 1 - REQUIRED_SKILL_SHARE, 0.0)
+    weighted = (
+        required_weight * required_matched / np.maximum(required_total, 1)
+        + preferred_weight * preferred_matched / np.maximum(preferred_total, 1)
+    )
+    total_weight = required_weight + preferred_weight
+    score = np.where(total_weight > 0, 100.0 * weighted / np.where(total_weight > 0, total_weight, 1.0), 100.0)
+    return {
+        "skill_match_score": score,
+        "required_matched": required_matched,
+        "required_total": required_total,
+        "preferred_matched": preferred_matched,
+        "preferred_total": preferred_total,
+    }
+
+
+class SkillRegistry:
+    """Canonical skill name <-> id, shared by all workers through the skills table.
+
+    Ids are bit positions in the stored bitsets, so a name keeps its id for
+    good. Names missing from this worker's cache are looked up and created in
+    a separate session: the id is committed before any bitset uses it, and
+    the caller's pending changes are neither flushed nor rolled back.
+    """
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._names: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def _remember(self, rows) -> None:
+        with self._lock:
+            for skill_id, name in rows:
+                self._ids[name] = skill_id
+                self._names[skill_id] = name
+
+    def ids(self, db: Session, names: Optional[Iterable[str]]) -> List[int]:
+        names = normalize_skills(names)
+        missing = [name for name in names if name not in self._ids]
+        if missing:
+            registry_db = Session(bind=db.get_bind())
+            try:
+                self._remember(registry_db.query(Skill.id, Skill.name).filter(Skill.name.in_(missing)).all())
+                new = [name for name in missing if name not in self._ids]
+                if new:
+                    try:
+                        registry_db.execute(insert(Skill), [{"name": name} for name in new])
+                        registry_db.commit()
+                    except IntegrityError:
+                        # Another worker registered some of them first; add the rest one by one
+                        registry_db.rollback()
+                        for name in new:
+                            try:
+                                registry_db.execute(insert(Skill), [{"name": name}])
+                                registry_db.commit()
+                            except IntegrityError:
+                                registry_db.rollback()
+                if new:
+                    self._remember(registry_db.query(Skill.id, Skill.name).filter(Skill.name.in_(new)).all())
+            finally:
+                registry_db.close()
+        return [self._ids[name] for name in names]
+
+    def bits(self, db: Session, names: Optional[Iterable[str]]) -> int:
+        bits = 0
+        for skill_id in self.ids(db, names):
+            bits |= 1 << skill_id
+        return bits
+
+    def encode(self, db: Session, names: Optional[Iterable[str]]) -> bytes:
+        return encode(self.bits(db, names))
+
+    def names(self, db: Session, bits: int) -> List[str]:
+        """Skill names of the set bits, in id order"""
+        skill_ids = [position for position in range(bits.bit_length()) if bits >> position & 1]
+        unknown = [skill_id for skill_id in skill_ids if skill_id not in self._names]
+        if unknown:
+            self._remember(db.query(Skill.id, Skill.name).filter(Skill.id.in_(unknown)).all())
+        return [self._names[skill_id] for skill_id in skill_ids if skill_id in self._names]
+
+
+skill_registry = SkillRegistry()
+
+
+def active_job_skill_bits(db: Session) -> Tuple[List[int], List[bytes], List[bytes]]:
+    """Ids and encoded required/preferred bitsets of all active jobs, ordered by id"""
+    rows = db.query(Job.id, Job.required_skill_bits, Job.preferred_skill_bits).filter(
+        Job.is_active
+    ).order_by(Job.id).all()
+    required = {job_id: blob for job_id, blob, _ in rows}
+    preferred = {job_id: blob for job_id, _, blob in rows}
+    missing = [job_id for job_id, blob, other in rows if blob is None or other is None]
+    if missing:
+        # Rows written before bitsets existed are encoded from their skill names
+        for job_id, required_skills, preferred_skills in db.query(
+            Job.id, Job.required_skills, Job.preferred_skills
+        ).filter(Job.id.in_(missing)):
+            required[job_id] = skill_registry.encode(db, required_skills)
+            preferred[job_id] = skill_registry.encode(db, preferred_skills)
+    ids = [job_id for job_id, _, _ in rows]
+    return ids, [required[job_id] for job_id in ids], [preferred[job_id] for job_id in ids]
@@ -0,0 +1,164 @@
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    from app.services.skill_bitsets import SkillRegistry
+
+# Canonical skill name -> aliases matched in free text (case-insensitive)
+SKILL_VOCABULARY: Dict[str, List[str]] = {
+    "python": ["python", "python3"],
+    "java": ["java"],
+    "javascript": ["javascript", "js", "ecmascript"],
+    "typescript": ["typescript", "ts"],
+    "go": ["golang"],
+    "rust": ["rust"],
+    "c++": ["c++", "cpp"],
+    "c#": ["c#", "csharp"],
+    "ruby": ["ruby"],
+    "php": ["php"],
+    "kotlin": ["kotlin"],
+    "swift": ["swift"],
+    "scala": ["scala"],
+    "sql": ["sql"],
+    "postgresql": ["postgresql", "postgres"],
+    "mysql": ["mysql"],
+    "sqlite": ["sqlite"],
+    "mongodb": ["mongodb", "mongo"],
+    "redis": ["redis"],
+    "elasticsearch": ["elasticsearch", "elastic search"],
+    "kafka": ["kafka"],
+    "rabbitmq": ["rabbitmq"],
+    "spark": ["spark", "pyspark"],
+    "hadoop": ["hadoop"],
+    "airflow": ["airflow"],
+    "dbt": ["dbt"],
+    "pandas": ["pandas"],
+    "numpy": ["numpy"],
+    "scikit-learn": ["scikit-learn", "sklearn"],
+    "tensorflow": ["tensorflow"],
+    "pytorch": ["pytorch", "torch"],
+    "machine learning": ["machine learning", "ml"],
+    "deep learning": ["deep learning"],
+    "nlp": ["nlp", "natural language processing"],
+    "data analysis": ["data analysis", "data analytics"],
+    "statistics": ["statistics", "statistical analysis"],
+    "fastapi": ["fastapi"],
+    "django": ["django"],
+    "flask": ["flask"],
+    "spring": ["spring", "spring boot"],
+    "node.js": ["node.js", "nodejs", "node"],
+    "express": ["express", "express.js"],
+    "react": ["react", "react.js", "reactjs"],
+    "angular": ["angular"],
+    "vue": ["vue", "vue.js"],
+    "html": ["html", "html5"],
+    "css": ["css", "css3"],
+    "graphql": ["graphql"],
+    "rest": ["rest", "restful", "rest api", "rest apis"],
+    "grpc": ["grpc"],
+    "microservices": ["microservices", "microservice"],
+    "docker": ["docker"],
+    "kubernetes": ["kubernetes", "k8s"],
+    "terraform": ["terraform"],
+    "ansible": ["ansible"],
+    "aws": ["aws", "amazon web services"],
+    "gcp": ["gcp", "google cloud"],
+    "azure": ["azure"],
+    "linux": ["linux"],
+    "git": ["git"],
+    "ci/cd": ["ci/cd", "continuous integration", "continuous delivery"],
+    "jenkins": ["jenkins"],
+    "github actions": ["github actions"],
+    "agile": ["agile", "scrum", "kanban"],
+    "project management": ["project management"],
+    "communication": ["communication"],
+    "leadership": ["leadership", "team lead"],
+    "excel": ["excel"],
+    "tableau": ["tableau"],
+    "power bi": ["power bi", "powerbi"],
+    "figma": ["figma"],
+    "salesforce": ["salesforce"],
+    "security": ["security", "cybersecurity"],
+    "testing": ["testing", "unit testing", "pytest", "test automation"],
+}
+
+# Education levels in increasing order, with the phrases that indicate them
+EDUCATION_LEVELS = [
+    ("High School", ["high school", "secondary school", "ged"]),
+    ("Associate", ["associate"]),
+    ("Bachelor's", ["bachelor", "bsc", "b.sc", "b.s.", "ba ", "b.a.", "undergraduate"]),
+    ("Master's", ["master", "msc", "m.sc", "m.s.", "mba"]),
+    ("PhD", ["phd", "ph.d", "doctorate", "doctoral"]),
+]
+
+_YEARS_PATTERN = re.compile(r"(\d{1,2})\s*\+?\s*(?:years|yrs)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=1)
+def _alias_index() -> Dict[str, str]:
+    return {
+        alias.lower(): canonical
+        for canonical, aliases in SKILL_VOCABULARY.items()
+        for alias in aliases + [canonical]
+    }
+
+
+@lru_cache(maxsize=1)
+def _skill_pattern() -> "re.Pattern":
+    aliases = sorted(_alias_index(), key=len, reverse=True)
+    return re.compile(
+        r"(?<![\w+#.])(" + "|".join(re.escape(alias) for alias in aliases) + r")(?![\w+#])",
+        re.IGNORECASE
+    )
+
+
+def canonical_skill(name: str) -> str:
+    """Map a skill name or alias to its canonical form (unknown skills are lower-cased)"""
+    key = name.strip().lower()
+    return _alias_index().get(key, key)
+
+
+def normalize_skills(names: Optional[Iterable[str]]) -> List[str]:
+    """Canonicalize and de-duplicate skill names, keeping their order"""
+    seen = {}
+    for name in names or []:
+        if isinstance(name, str) and name.strip():
+            seen.setdefault(canonical_skill(name), None)
+    return list(seen)
+
+
+def extract_skills(text: str) -> List[str]:
+    """Find vocabulary skills mentioned in free text, in order of first mention"""
+    seen = {}
+    for match in _skill_pattern().finditer(text or ""):
+        seen.setdefault(_alias_index()[match.group(1).lower()], None)
+    return list(seen)
+
+
+def extract_experience_years(text: str) -> Optional[int]:
+    """Largest "N years" figure mentioned in the text"""
+    years = [int(value) for value in _YEARS_PATTERN.findall(text or "")]
+    return max(years) if years else None
+
+
+def education_rank(level: Optional[str]) -> int:
+    """0 when unknown, otherwise the position of the level in EDUCATION_LEVELS (1-based)"""
+    text = f" {(level or '').lower()} "
+    rank = 0
+    for index, (_, phrases) in enumerate(EDUCATION_LEVELS, start=1):
+        if any(phrase in text for phrase in phrases):
+            rank = index
+    return rank
+
+
+def detect_education_level(text: str) -> Optional[str]:
+    """Highest education level mentioned in the text"""
+    rank = education_rank(text)
+    return EDUCATION_LEVELS[rank - 1][0] if rank else None
+
+
+def get_skill_registry() -> "SkillRegistry":
+    """The shared SkillRegistry, imported on first use so numpy stays off the worker start path"""
+    from app.services.skill_bitsets import skill_registry
+    return skill_registry
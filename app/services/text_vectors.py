@@ -0,0 +1,85 @@
+import math
+import re
+import zlib
+from collections import Counter
+from typing import Iterable, List, Optional
+import numpy as np
+from app.core.config import settings
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+STOP_WORDS = frozenset("""
+a about above after all also an and any are as at be been being but by can could did do does
+for from had has have having he her his i if in into is it its itself me more most my no nor
+not of on once only or other our out over own same she should so some such than that the
+their them then there these they this those through to too under until up very was we were
+what when where which while who whom why will with would you your yours years year work
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    return [
+        token for token in TOKEN_PATTERN.findall((text or "").lower())
+        if token not in STOP_WORDS and (len(token) > 1 or token in ("c", "r"))
+    ]
+
+
+def term_vector(text: str, dim: Optional[int] = None) -> np.ndarray:
+    """Hashed, sublinear term-frequency vector of ``text`` (the hashing trick).
+
+    Each token is hashed with CRC32 into one of ``dim`` buckets and given a
+    sign from the hash's top bit, so colliding tokens tend to cancel instead
+    of piling up. IDF weighting is applied later, against the corpus.
+    """
+    dim = dim or settings.TEXT_VECTOR_DIM
+    vector = np.zeros(dim, dtype=np.float32)
+    for token, count in Counter(tokenize(text)).items():
+        digest = zlib.crc32(token.encode())
+        sign = -1.0 if digest & 0x80000000 else 1.0
+        vector[digest % dim] += sign * (1.0 + math.log(count))
+    return vector
+
+
+def encode(vector: np.ndarray) -> bytes:
+    return vector.astype(np.float32).tobytes()
+
+
+def decode(blob: Optional[bytes], dim: Optional[int] = None) -> Optional[np.ndarray]:
+    """Stored vector, or None when missing or built with a different TEXT_VECTOR_DIM"""
+    dim = dim or settings.TEXT_VECTOR_DIM
+    if not blob or len(blob) != dim * 4:
+        return None
+    return np.frombuffer(blob, dtype=np.float32)
+
+
+def _join(parts: Iterable[Optional[str]]) -> str:
+    return "\n".join(part for part in parts if part)
+
+
+def job_text(job) -> str:
+    skills = (job.required_skills or []) + (job.preferred_skills or [])
+    return _join([job.title, job.description, job.requirements, " ".join(skills)])
+
+
+def resume_text(resume) -> str:
+    return _join([resume.title, resume.extracted_text, " ".join(resume.skills or [])])
+
+
+def vectorize_job(job) -> bytes:
+    return encode(term_vector(job_text(job)))
+
+
+def vectorize_resume(resume) -> bytes:
+    return encode(term_vector(resume_text(resume)))
+
+
+def idf_weights(term_matrix: np.ndarray) -> np.ndarray:
+    """Smoothed inverse document frequency per bucket, from the rows of ``term_matrix``"""
+    documents = term_matrix.shape[0]
+    document_frequency = np.count_nonzero(term_matrix, axis=0)
+    return (np.log((1 + documents) / (1 + document_frequency)) + 1).astype(np.float32)
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
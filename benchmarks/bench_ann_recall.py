@@ -0,0 +1,125 @@
+"""Measure recall@K and latency of the IVF job index against exact search.
+
+Usage:
+    python benchmarks/bench_ann_recall.py --jobs 50000 --k 10
+    python benchmarks/bench_ann_recall.py --jobs 200000 --nlist 512 --nprobe 4 8 16 32
+
+Generates topic-clustered job texts, hashes them into term vectors the way
+the app does, builds an ``IVFIndex`` in a temporary directory and appends
+``--delta`` extra jobs and ``--removed`` tombstones through the incremental
+path. Each ``--nprobe`` setting is then compared with brute-force cosine
+search over the same live vectors and IDF weights, reporting recall@K and
+per-query latency percentiles.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+from app.services.ann_index import IVFIndex  # noqa: E402
+from app.services.text_vectors import idf_weights, normalize_rows, term_vector  # noqa: E402
+
+
+class TextGenerator:
+    """Job-like texts: topic words mixed with a Zipf-distributed shared vocabulary"""
+
+    def __init__(
+        self, seed: int, vocabulary: int = 20_000, topics: int = 500, topic_words: int = 40, topic_vocabulary: int = 5_000
+    ):
+        self.rng = random.Random(seed)
+        self.vocabulary = [f"w{i}" for i in range(vocabulary)]
+        self.cum_weights = list(np.cumsum([1 / (rank + 1) for rank in range(vocabulary)]))
+        self.topics = [self.rng.sample(self.vocabulary[:topic_vocabulary], topic_words) for _ in range(topics)]
+
+    def __call__(self) -> str:
+        topic = self.rng.choice(self.topics)
+        words = self.rng.choices(topic, k=25) + self.rng.choices(self.vocabulary, cum_weights=self.cum_weights, k=25)
+        return " ".join(words)
+
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=50_000)
+    parser.add_argument("--delta", type=int, default=1_000, help="Jobs inserted after the build")
+    parser.add_argument("--removed", type=int, default=500, help="Built jobs tombstoned after the build")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nlist", type=int, default=0, help="Inverted lists (default: sqrt(jobs))")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    generate = TextGenerator(args.seed)
+    started = time.perf_counter()
+    matrix = np.vstack([term_vector(generate()) for _ in range(args.jobs + args.delta)])
+    queries = [term_vector(generate()) for _ in range(args.queries)]
+    ids = np.arange(1, len(matrix) + 1, dtype=np.int64)
+    print(f"Vectorized {len(matrix)} jobs in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    base_ids, base_matrix = ids[:args.jobs], matrix[:args.jobs]
+    removed = np.random.default_rng(args.seed).choice(base_ids, args.removed, replace=False)
+    with tempfile.TemporaryDirectory() as tmp:
+        index = IVFIndex(Path(tmp))
+        index.build(lambda: (base_ids, base_matrix.copy()), nlist=args.nlist)
+        for job_id, vector in zip(ids[args.jobs:], matrix[args.jobs:]):
+            index.insert(int(job_id), vector, replace=False)
+        for job_id in removed:
+            index.remove(int(job_id))
+
+        # Ground truth: brute force over the live vectors with the index's IDF
+        live = ~np.isin(ids, removed)
+        live_ids = ids[live]
+        idf = idf_weights(base_matrix)
+        weighted = normalize_rows(matrix[live] * idf)
+        exact, exact_ms = [], []
+        for query in queries:
+            query_started = time.perf_counter()
+            scores = weighted @ normalize_rows(query * idf)
+            top = np.argpartition(-scores, args.k - 1)[:args.k]
+            exact_ms.append((time.perf_counter() - query_started) * 1000)
+            exact.append({int(live_ids[i]) for i in top if scores[i] > 0})
+
+        results = []
+        for nprobe in args.nprobe:
+            recalls, latencies = [], []
+            for query, truth in zip(queries, exact):
+                query_started = time.perf_counter()
+                hits = index.search(query, args.k, nprobe)
+                latencies.append((time.perf_counter() - query_started) * 1000)
+                if truth:
+                    recalls.append(len(truth & {job_id for job_id, _ in hits}) / len(truth))
+            results.append({
+                "nprobe": nprobe,
+                f"recall@{args.k}": round(statistics.mean(recalls), 4),
+                "p50_ms": round(percentile(latencies, 50), 3),
+                "p95_ms": round(percentile(latencies, 95), 3),
+            })
+        stats = index.stats()
+
+    print(json.dumps({
+        "jobs": args.jobs,
+        "delta": args.delta,
+        "removed": args.removed,
+        "k": args.k,
+        "index": {key: stats[key] for key in ("count", "dim", "nlist", "build_seconds", "live_delta_records")},
+        "exact": {"p50_ms": round(percentile(exact_ms, 50), 3), "p95_ms": round(percentile(exact_ms, 95), 3)},
+        "ann": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Measure login throughput through the password hashing executor.
+
+Usage:
+    python benchmarks/bench_password_hashing.py --rounds 12 --logins 200
+
+Runs ``--logins`` concurrent password verifications through ``PasswordHasher``
+and reports logins/sec overall and per core, plus the number of requests
+rejected by the queue limit.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import HTTPException  # noqa: E402
+from app.core.security import PasswordHasher, configure_bcrypt_rounds, get_password_hash  # noqa: E402
+
+
+async def run(rounds: int, logins: int, workers: int, queue_limit: int) -> dict:
+    configure_bcrypt_rounds(rounds)
+    stored_hash = get_password_hash("correct horse battery staple")
+    hasher = PasswordHasher(workers=workers, queue_limit=queue_limit)
+
+    async def login() -> bool:
+        try:
+            verified, _ = await hasher.verify_and_update("correct horse battery staple", stored_hash)
+            return verified
+        except HTTPException:
+            return False
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    hasher.shutdown()
+
+    succeeded = sum(results)
+    return {
+        "rounds": rounds,
+        "workers": hasher.workers,
+        "cores": os.cpu_count(),
+        "logins": logins,
+        "succeeded": succeeded,
+        "rejected": logins - succeeded,
+        "elapsed_s": round(elapsed, 3),
+        "logins_per_sec": round(succeeded / elapsed, 2),
+        "logins_per_sec_per_core": round(succeeded / elapsed / hasher.workers, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Password hashing throughput benchmark")
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=0, help="0 = one per core")
+    parser.add_argument("--queue-limit", type=int, default=10_000)
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.rounds, args.logins, args.workers, args.queue_limit))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Compare FastAPI's response_model serialization with app.core.serialization.
+
+Usage:
+    python benchmarks/bench_serialization.py --sizes 100 1000 10000
+
+For each list size, builds transient ORM rows for jobs, resumes and matches
+(with skill gaps) and times both paths end to end, from ORM objects to the
+JSON bytes written to the socket.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from typing import List
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+from app.core.serialization import dump_models  # noqa: E402
+from app.models import Job, Match, Resume, SkillGap  # noqa: E402
+from app.schemas import JobResponse, MatchResponse, ResumeResponse  # noqa: E402
+
+NOW = datetime(2024, 1, 1, 12, 0, 0)
+DESCRIPTION = "We are looking for an engineer to build and operate APIs. " * 40
+
+
+def make_jobs(n: int) -> list:
+    return [
+        Job(
+            id=i, recruiter_id=1, title=f"Engineer {i}", company="Acme", description=DESCRIPTION,
+            requirements="3+ years", location="Remote", job_type="full-time", salary_range="100k",
+            required_skills=["python", "sql", "docker"], preferred_skills=["aws"],
+            experience_level="mid", education_requirement="BSc", is_active=True, created_at=NOW,
+        )
+        for i in range(n)
+    ]
+
+
+def make_resumes(n: int) -> list:
+    return [
+        Resume(
+            id=i, user_id=1, title=f"Resume {i}", file_path=f"/tmp/{i}.pdf", original_filename=f"{i}.pdf",
+            extracted_text=DESCRIPTION, parsed_data={"skills": ["python"], "education": []},
+            skills=["python", "sql"], experience_years=5, education_level="BSc", created_at=NOW,
+        )
+        for i in range(n)
+    ]
+
+
+def make_matches(n: int) -> list:
+    matches = []
+    for i in range(n):
+        match = Match(
+            id=i, user_id=1, resume_id=1, job_id=i, match_score=72.5, skill_match_score=80,
+            experience_match_score=60, education_match_score=90, overall_feedback=DESCRIPTION[:400],
+            resume_suggestions=[{"section": "skills", "suggestion": "Add docker", "priority": "high"}],
+            is_stale=False, origin="applicant", created_at=NOW,
+        )
+        match.skill_gaps = [
+            SkillGap(id=i * 2 + k, match_id=i, missing_skill=f"skill-{k}", importance="required", created_at=NOW)
+            for k in range(2)
+        ]
+        matches.append(match)
+    return matches
+
+
+def fastapi_path(schema, rows) -> bytes:
+    field = create_response_field(name="response", type_=List[schema])
+    content = asyncio.run(serialize_response(field=field, response_content=rows, is_coroutine=True))
+    return JSONResponse(content).body
+
+
+def fast_path(schema, rows) -> bytes:
+    return dump_models(schema, rows)
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="List serialization benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cases = [
+        ("JobResponse", JobResponse, make_jobs),
+        ("ResumeResponse", ResumeResponse, make_resumes),
+        ("MatchResponse", MatchResponse, make_matches),
+    ]
+    report = []
+    for name, schema, factory in cases:
+        for size in args.sizes:
+            rows = factory(size)
+            if json.loads(fastapi_path(schema, rows)) != json.loads(fast_path(schema, rows)):
+                raise SystemExit(f"{name}: serializers disagree at {size} rows")
+            baseline = best_of(lambda: fastapi_path(schema, rows), args.repeat)
+            candidate = best_of(lambda: fast_path(schema, rows), args.repeat)
+            report.append({
+                "schema": name,
+                "rows": size,
+                "fastapi_ms": round(baseline * 1000, 2),
+                "fast_path_ms": round(candidate * 1000, 2),
+                "speedup": round(baseline / candidate, 2),
+            })
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""A local OpenAI-compatible chat completions server for load tests.
+
+Usage:
+    python benchmarks/loadtest/fake_openai.py --port 8900 --latency lognormal:800:0.6
+
+Answers ``POST /v1/chat/completions`` with canned responses for each AIService
+task, after sleeping for a delay drawn from the configured distribution.
+Latency specs:
+
+    zero                      no delay
+    fixed:MS                  always MS milliseconds
+    uniform:LOW_MS:HIGH_MS    uniform between LOW_MS and HIGH_MS
+    lognormal:MEDIAN_MS:SIGMA log-normal around MEDIAN_MS (long right tail)
+
+``--error-rate`` makes a fraction of calls fail with 500 so retry and
+fallback paths get exercised. ``--responses`` points at a JSON file mapping
+task names to replacement payloads. Batched job analyses answer every item in
+the prompt with the ``analyze_job_description`` payload.
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+CANNED_RESPONSES: Dict[str, Any] = {
+    "analyze_resume": {
+        "skills": ["python", "fastapi", "sql", "docker", "aws", "react"],
+        "experience_years": 5,
+        "education_level": "Bachelor's",
+        "work_experience": [
+            {"company": "Acme", "position": "Backend Engineer", "duration": "3 years",
+             "description": "Built and operated Python APIs"},
+        ],
+        "education": [
+            {"institution": "State University", "degree": "BSc", "field": "Computer Science", "year": "2018"},
+        ],
+        "contact_info": {"email": "candidate@example.com", "phone": "555-0100", "location": "Remote"},
+    },
+    "analyze_job_description": {
+        "required_skills": ["python", "sql", "docker"],
+        "preferred_skills": ["aws", "kubernetes"],
+        "experience_level": "mid",
+        "education_requirement": "Bachelor's",
+        "key_responsibilities": ["Design APIs", "Operate services"],
+        "company_benefits": ["Remote work", "Health insurance"],
+        "job_type": "full-time",
+        "remote_option": "yes",
+    },
+    "calculate_match_score": {
+        "overall_score": 78,
+        "skill_match_score": 82,
+        "experience_match_score": 75,
+        "education_match_score": 70,
+        "missing_skills": [
+            {"skill": "kubernetes", "importance": "preferred", "suggestion": "Deploy a side project on a managed cluster"},
+            {"skill": "terraform", "importance": "required", "suggestion": "Describe any infrastructure-as-code work"},
+        ],
+        "strengths": ["Strong Python background"],
+        "weaknesses": ["Limited cloud operations experience"],
+        "overall_feedback": "A solid match with a few gaps in infrastructure tooling.",
+    },
+    "generate_resume_suggestions": [
+        {"section": "skills", "suggestion": "List container orchestration experience",
+         "priority": "high", "impact": "Covers a preferred skill"},
+        {"section": "experience", "suggestion": "Quantify API traffic you operated",
+         "priority": "medium", "impact": "Shows scale"},
+    ],
+    "generate_cover_letter": (
+        "Dear Hiring Manager,\n\nI am excited to apply for this role. "
+        "My background in building Python services matches your needs.\n\n"
+        "Sincerely,\nCandidate"
+    ),
+}
+
+BATCH_ITEM = re.compile(r'<job index="(\d+)">')
+
+# System prompt fragments AIService uses for each task; more specific markers first
+TASK_MARKERS = [
+    ("every numbered job description", "analyze_job_descriptions"),
+    ("resume analyzer", "analyze_resume"),
+    ("job description analyzer", "analyze_job_description"),
+    ("hr analyst", "calculate_match_score"),
+    ("resume coach", "generate_resume_suggestions"),
+    ("cover letter writer", "generate_cover_letter"),
+]
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Turn a latency spec into a sampler returning seconds"""
+    kind, _, rest = spec.partition(":")
+    args = [float(part) for part in rest.split(":")] if rest else []
+    if kind == "zero":
+        return lambda rng: 0.0
+    if kind == "fixed" and len(args) == 1:
+        return lambda rng: args[0] / 1000
+    if kind == "uniform" and len(args) == 2:
+        return lambda rng: rng.uniform(args[0], args[1]) / 1000
+    if kind == "lognormal" and len(args) == 2:
+        mu = math.log(args[0])
+        return lambda rng: rng.lognormvariate(mu, args[1]) / 1000
+    raise ValueError(f"Invalid latency spec: {spec!r}")
+
+
+def detect_task(messages: List[Dict[str, Any]]) -> Optional[str]:
+    system = " ".join(m.get("content") or "" for m in messages if m.get("role") == "system").lower()
+    for marker, task in TASK_MARKERS:
+        if marker in system:
+            return task
+    return None
+
+
+def batch_indexes(messages: List[Dict[str, Any]]) -> List[int]:
+    """Item indexes of a batched prompt"""
+    prompt = " ".join(m.get("content") or "" for m in messages if m.get("role") == "user")
+    return [int(index) for index in BATCH_ITEM.findall(prompt)]
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def create_app(
+    latency: str = "zero", error_rate: float = 0.0, responses: Optional[Dict[str, Any]] = None, seed: int = 0
+) -> Starlette:
+    sample_latency = parse_latency(latency)
+    canned = {**CANNED_RESPONSES, **(responses or {})}
+    rng = random.Random(seed)
+    stats = {"requests": 0, "errors": 0, "by_task": {}}
+
+    async def chat_completions(request: Request):
+        body = await request.json()
+        messages = body.get("messages", [])
+        task = detect_task(messages) or "unknown"
+        stats["requests"] += 1
+        stats["by_task"][task] = stats["by_task"].get(task, 0) + 1
+        await asyncio.sleep(sample_latency(rng))
+
+        if rng.random() < error_rate:
+            stats["errors"] += 1
+            return JSONResponse(
+                {"error": {"message": "Injected failure", "type": "server_error"}}, status_code=500
+            )
+
+        if task == "analyze_job_descriptions":
+            item = canned["analyze_job_description"]
+            payload = {"results": [{"index": index, **item} for index in batch_indexes(messages)]}
+        else:
+            payload = canned.get(task, {})
+        content = payload if isinstance(payload, str) else json.dumps(payload)
+        prompt_tokens = sum(estimate_tokens(m.get("content") or "") for m in messages)
+        completion_tokens = estimate_tokens(content)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        model = body.get("model", "gpt-3.5-turbo")
+
+        if body.get("stream"):
+            async def chunks():
+                step = 32
+                for start in range(0, len(content), step):
+                    chunk = {
+                        "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                        "choices": [{"index": 0, "delta": {"content": content[start:start + step]}, "finish_reason": None}],
+                    }
+                    yield f"data: {json.dumps(chunk)}\n\n"
+                final = {
+                    "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                    "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                }
+                yield f"data: {json.dumps(final)}\n\n"
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(chunks(), media_type="text/event-stream")
+
+        return JSONResponse({
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+
+    async def get_stats(request: Request):
+        return JSONResponse(stats)
+
+    return Starlette(routes=[
+        Route("/v1/chat/completions", chat_completions, methods=["POST"]),
+        Route("/stats", get_stats, methods=["GET"]),
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", default="lognormal:800:0.6")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--responses", help="JSON file mapping task names to canned payloads")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    parse_latency(args.latency)
+    responses = None
+    if args.responses:
+        with open(args.responses) as f:
+            responses = json.load(f)
+
+    import uvicorn
+
+    uvicorn.run(
+        create_app(args.latency, args.error_rate, responses, args.seed),
+        host=args.host, port=args.port, log_level="warning",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+"""Drive a mixed workload against a locally started SkillSync instance.
+
+Usage:
+    python benchmarks/loadtest/run.py --concurrency 32 --duration 60 --out report.json
+    python benchmarks/loadtest/run.py --baseline report.json --tolerance 0.15
+
+Starts the fake OpenAI server (fake_openai.py) and the app under uvicorn,
+both as subprocesses, against a temporary SQLite database. Seeds a recruiter,
+jobs, applicants and resumes, then keeps ``--concurrency`` workers issuing a
+weighted mix of requests for ``--duration`` seconds after a warm-up.
+
+The JSON report has overall and per-route throughput, error counts and
+p50/p95/p99 latencies. With ``--baseline``, per-route p95 latency and
+throughput are compared against a stored report and the exit status is 1 when
+either regresses by more than ``--tolerance``.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Any, Dict, List
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+HERE = os.path.dirname(os.path.abspath(__file__))
+API = "/api/v1"
+
+DEFAULT_MIX = "search=30,job=15,resumes=10,upload=5,match=10,matches=10,dashboard=10,analytics=10"
+GATED_METRICS = {"p95_ms": "higher", "throughput_rps": "lower"}
+
+SKILLS = [
+    "python", "fastapi", "django", "sql", "postgresql", "docker", "kubernetes", "aws", "gcp",
+    "react", "typescript", "go", "rust", "terraform", "redis", "kafka", "spark", "pandas",
+]
+SEARCH_TERMS = ["engineer", "python", "data", "backend", "senior", "remote", "platform"]
+LOCATIONS = ["Remote", "New York", "Berlin", "London", "Austin"]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(values) + 0.5)))
+    return values[min(rank, len(values)) - 1]
+
+
+def wait_for(url: str, timeout: float, proc: subprocess.Popen):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Process exited with {proc.returncode} before {url} became ready")
+        try:
+            if httpx.get(url, timeout=1).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Timed out waiting for {url}")
+
+
+def resume_text(rng: random.Random, index: int) -> str:
+    skills = rng.sample(SKILLS, 6)
+    return (
+        f"Candidate {index}\ncandidate{index}@example.com\n\n"
+        f"Summary\nEngineer with {rng.randint(1, 15)} years of experience.\n\n"
+        f"Skills\n{', '.join(skills)}\n\n"
+        "Experience\nBackend Engineer at Acme. Built APIs and data pipelines.\n" * 3
+    )
+
+
+class Workload:
+    """Holds seeded accounts and ids, and issues one request per operation"""
+
+    def __init__(self, client: httpx.AsyncClient, rng: random.Random):
+        self.client = client
+        self.rng = rng
+        self.recruiter: Dict[str, str] = {}
+        self.applicants: List[Dict[str, Any]] = []
+        self.job_ids: List[int] = []
+        self.uploads = 0
+
+    async def register(self, email: str, role: str) -> Dict[str, str]:
+        await self.client.post(f"{API}/auth/register", json={
+            "email": email, "full_name": email.split("@")[0], "password": "loadtest", "role": role
+        })
+        response = await self.client.post(
+            f"{API}/auth/login", data={"username": email, "password": "loadtest"}
+        )
+        response.raise_for_status()
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def upload(self, applicant: Dict[str, Any]) -> httpx.Response:
+        self.uploads += 1
+        text = resume_text(self.rng, self.uploads)
+        response = await self.client.post(
+            f"{API}/resumes/upload",
+            params={"title": f"Resume {self.uploads}"},
+            files={"file": (f"resume_{self.uploads}.txt", text.encode(), "text/plain")},
+            headers=applicant["headers"],
+        )
+        if response.status_code == 200:
+            applicant["resume_ids"].append(response.json()["id"])
+        return response
+
+    async def seed(self, jobs: int, applicants: int, concurrency: int):
+        self.recruiter = await self.register("recruiter@loadtest.example.com", "recruiter")
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def create_job(i: int):
+            async with semaphore:
+                response = await self.client.post(f"{API}/jobs/", headers=self.recruiter, json={
+                    "title": f"{self.rng.choice(['Senior', 'Staff', 'Junior'])} Backend Engineer {i}",
+                    "company": f"Company {i % 7}",
+                    "description": "We build APIs and data platforms. " * 20,
+                    "requirements": "Python, SQL and cloud experience",
+                    "location": self.rng.choice(LOCATIONS),
+                    "job_type": "full-time",
+                    "required_skills": self.rng.sample(SKILLS, 4),
+                })
+                response.raise_for_status()
+                self.job_ids.append(response.json()["id"])
+
+        async def create_applicant(i: int):
+            async with semaphore:
+                applicant = {
+                    "headers": await self.register(f"applicant{i}@loadtest.example.com", "applicant"),
+                    "resume_ids": [],
+                }
+                response = await self.upload(applicant)
+                response.raise_for_status()
+                self.applicants.append(applicant)
+
+        await asyncio.gather(*(create_job(i) for i in range(jobs)))
+        await asyncio.gather(*(create_applicant(i) for i in range(applicants)))
+
+    async def run_op(self, op: str, rng: random.Random):
+        """Issue one request; returns (route template, response)"""
+        applicant = rng.choice(self.applicants)
+        headers = applicant["headers"]
+        if op == "search":
+            params = {"search": rng.choice(SEARCH_TERMS)}
+            if rng.random() < 0.3:
+                params["location"] = rng.choice(LOCATIONS)
+            return "GET /jobs/", await self.client.get(f"{API}/jobs/", params=params)
+        if op == "job":
+            job_id = rng.choice(self.job_ids)
+            return "GET /jobs/{job_id}", await self.client.get(f"{API}/jobs/{job_id}")
+        if op == "resumes":
+            return "GET /resumes/", await self.client.get(
+                f"{API}/resumes/", params={"view": "summary"}, headers=headers
+            )
+        if op == "upload":
+            return "POST /resumes/upload", await self.upload(applicant)
+        if op == "match":
+            return "POST /matching/analyze", await self.client.post(f"{API}/matching/analyze", headers=headers, json={
+                "resume_id": rng.choice(applicant["resume_ids"]), "job_id": rng.choice(self.job_ids)
+            })
+        if op == "matches":
+            return "GET /matching/", await self.client.get(f"{API}/matching/", headers=headers)
+        if op == "dashboard":
+            if rng.random() < 0.5:
+                return "GET /dashboard/overview", await self.client.get(
+                    f"{API}/dashboard/overview", headers=self.recruiter
+                )
+            job_id = rng.choice(self.job_ids)
+            return "GET /dashboard/candidates/{job_id}", await self.client.get(
+                f"{API}/dashboard/candidates/{job_id}", headers=self.recruiter
+            )
+        if op == "analytics":
+            return "GET /analytics/user-stats", await self.client.get(
+                f"{API}/analytics/user-stats", headers=headers
+            )
+        raise ValueError(f"Unknown operation: {op}")
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+async def drive(workload: Workload, mix: Dict[str, float], concurrency: int, duration: float, seed: int):
+    ops, weights = list(mix), list(mix.values())
+    samples: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    deadline = time.monotonic() + duration
+
+    async def worker(worker_id: int):
+        rng = random.Random(seed * 1000 + worker_id)
+        while time.monotonic() < deadline:
+            op = rng.choices(ops, weights)[0]
+            start = time.perf_counter()
+            try:
+                route, response = await workload.run_op(op, rng)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                route, failed = op, True
+            samples[route].append((time.perf_counter() - start) * 1000)
+            if failed:
+                errors[route] += 1
+
+    started = time.monotonic()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return samples, errors, time.monotonic() - started
+
+
+def build_report(samples: Dict[str, List[float]], errors: Dict[str, int], elapsed: float) -> Dict[str, Any]:
+    def summarize(values: List[float], error_count: int) -> Dict[str, Any]:
+        values = sorted(values)
+        return {
+            "requests": len(values),
+            "errors": error_count,
+            "throughput_rps": round(len(values) / elapsed, 2),
+            "mean_ms": round(sum(values) / len(values), 2) if values else 0.0,
+            "p50_ms": round(percentile(values, 50), 2),
+            "p95_ms": round(percentile(values, 95), 2),
+            "p99_ms": round(percentile(values, 99), 2),
+            "max_ms": round(values[-1], 2) if values else 0.0,
+        }
+
+    all_values = [value for values in samples.values() for value in values]
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "overall": summarize(all_values, sum(errors.values())),
+        "routes": {route: summarize(values, errors.get(route, 0)) for route, values in sorted(samples.items())},
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Print a comparison table and return the regressions beyond ``tolerance``"""
+    regressions = []
+    routes = {"overall": (report["overall"], baseline.get("overall"))}
+    routes.update({route: (stats, baseline.get("routes", {}).get(route)) for route, stats in report["routes"].items()})
+    print(f"\n{'route':<36} {'metric':<15} {'baseline':>10} {'current':>10} {'change':>8}")
+    for route, (current, base) in routes.items():
+        if not base:
+            continue
+        for metric, bad_direction in GATED_METRICS.items():
+            before, after = base.get(metric, 0), current.get(metric, 0)
+            if not before:
+                continue
+            change = (after - before) / before
+            regressed = change > tolerance if bad_direction == "higher" else change < -tolerance
+            flag = "  REGRESSION" if regressed else ""
+            print(f"{route:<36} {metric:<15} {before:>10.2f} {after:>10.2f} {change:>+7.1%}{flag}")
+            if regressed:
+                regressions.append(f"{route} {metric}: {before} -> {after}")
+    return regressions
+
+
+async def run_load(args, base_url: str) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    limits = httpx.Limits(max_connections=args.concurrency + 4, max_keepalive_connections=args.concurrency + 4)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.request_timeout, limits=limits) as client:
+        workload = Workload(client, rng)
+        seed_start = time.perf_counter()
+        await workload.seed(args.jobs, args.applicants, min(args.concurrency, 8))
+        seed_seconds = time.perf_counter() - seed_start
+        mix = parse_mix(args.mix)
+        if args.warmup > 0:
+            await drive(workload, mix, args.concurrency, args.warmup, args.seed + 1)
+        samples, errors, elapsed = await drive(workload, mix, args.concurrency, args.duration, args.seed)
+    report = build_report(samples, errors, elapsed)
+    report["seed_s"] = round(seed_seconds, 2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--warmup", type=float, default=5)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Comma separated op=weight pairs")
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--applicants", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--latency", default="lognormal:800:0.6", help="Fake OpenAI latency spec")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fake OpenAI failure rate")
+    parser.add_argument("--request-timeout", type=float, default=60)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="Write the JSON report here")
+    parser.add_argument("--baseline", help="Compare against this stored report")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="skillsync-loadtest-")
+    openai_port, app_port = free_port(), free_port()
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{workdir}/loadtest.sqlite",
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{openai_port}/v1",
+        "OPENAI_API_KEY": "loadtest",
+        "BCRYPT_ROUNDS": os.environ.get("BCRYPT_ROUNDS", "4"),
+        "BCRYPT_MIN_ROUNDS": os.environ.get("BCRYPT_MIN_ROUNDS", "4"),
+    }
+    processes: List[subprocess.Popen] = []
+    try:
+        fake = subprocess.Popen([
+            sys.executable, os.path.join(HERE, "fake_openai.py"), "--port", str(openai_port),
+            "--latency", args.latency, "--error-rate", str(args.error_rate), "--seed", str(args.seed),
+        ], cwd=workdir)
+        processes.append(fake)
+        wait_for(f"http://127.0.0.1:{openai_port}/stats", 30, fake)
+
+        app = subprocess.Popen([
+            sys.executable, "-m", "uvicorn", "main:app", "--app-dir", ROOT, "--host", "127.0.0.1",
+            "--port", str(app_port), "--workers", str(args.workers), "--log-level", "warning",
+        ], cwd=workdir, env=env)
+        processes.append(app)
+        wait_for(f"http://127.0.0.1:{app_port}/health", 60, app)
+
+        report = asyncio.run(run_load(args, f"http://127.0.0.1:{app_port}"))
+        report["fake_openai"] = httpx.get(f"http://127.0.0.1:{openai_port}/stats").json()
+    finally:
+        for proc in reversed(processes):
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    report["config"] = {
+        key: getattr(args, key) for key in (
+            "concurrency", "duration", "warmup", "mix", "jobs", "applicants", "workers", "latency", "error_rate", "seed"
+        )
+    }
+    report["environment"] = {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()}
+
+    print(json.dumps(report, indent=2))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("\nNo regressions beyond tolerance")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Deterministic fixture corpus for the micro-benchmarks.
+
+Usage:
+    python benchmarks/micro/fixtures.py /tmp/skillsync-fixtures
+
+Writes a multi-page PDF (built by hand, no PDF library needed), a
+table-heavy DOCX (python-docx) and a large TXT resume. Content comes from a
+seeded random generator, so every run produces the same content.
+"""
+import os
+import random
+import sys
+from typing import Dict, List
+
+SKILLS = [
+    "Python", "FastAPI", "Django", "PostgreSQL", "Docker", "Kubernetes", "AWS", "Terraform",
+    "React", "TypeScript", "Kafka", "Redis", "Spark", "Pandas", "Go", "GraphQL", "Linux", "Git",
+]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises"]
+VERBS = ["Built", "Designed", "Operated", "Migrated", "Scaled", "Led", "Automated", "Optimized"]
+OBJECTS = ["payment APIs", "data pipelines", "search infrastructure", "CI/CD workflows",
+           "customer dashboards", "ML feature stores", "event streaming", "internal tooling"]
+
+
+def resume_lines(rng: random.Random, count: int) -> List[str]:
+    lines = ["Jane Doe", "jane.doe@example.com | +1 555 010 0000 | Remote", "",
+             "Summary", "Backend engineer with 8 years of experience and a Master's degree.", ""]
+    while len(lines) < count:
+        company = rng.choice(COMPANIES)
+        lines.append(f"Senior Engineer, {company} ({rng.randint(2010, 2023)} - present)")
+        for _ in range(rng.randint(3, 6)):
+            lines.append(
+                f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} with {', '.join(rng.sample(SKILLS, 3))}, "
+                f"serving {rng.randint(1, 900)}k requests per day"
+            )
+        lines.append("")
+    return lines[:count]
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def build_pdf(pages: int, lines_per_page: int = 48, seed: int = 1) -> bytes:
+    """A text-only PDF with ``pages`` pages of resume-like lines in Helvetica"""
+    rng = random.Random(seed)
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog_id = add(b"")  # Filled in once the page tree exists
+    pages_id = add(b"")
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    page_ids = []
+    for _ in range(pages):
+        text = "\n".join(
+            f"({_pdf_escape(line)}) '" for line in resume_lines(rng, lines_per_page)
+        )
+        stream = f"BT /F1 9 Tf 12 TL 40 800 Td\n{text}\nET".encode("latin-1", "replace")
+        content_id = add(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages_id, font_id, content_id)
+        ))
+    objects[catalog_id - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, catalog_id, xref_offset
+    )
+    return bytes(out)
+
+
+def build_docx(path: str, tables: int = 12, rows: int = 25, seed: int = 2) -> None:
+    """A resume whose experience, skills and projects sections are mostly tables"""
+    import docx
+
+    rng = random.Random(seed)
+    document = docx.Document()
+    document.add_heading("Jane Doe", level=0)
+    for line in resume_lines(rng, 20):
+        document.add_paragraph(line)
+    for index in range(tables):
+        document.add_heading(f"Projects {index + 1}", level=2)
+        table = document.add_table(rows=rows + 1, cols=4)
+        for cell, title in zip(table.rows[0].cells, ("Project", "Company", "Stack", "Impact")):
+            cell.text = title
+        for row in table.rows[1:]:
+            cells = row.cells
+            cells[0].text = f"{rng.choice(VERBS)} {rng.choice(OBJECTS)}"
+            cells[1].text = rng.choice(COMPANIES)
+            cells[2].text = ", ".join(rng.sample(SKILLS, 4))
+            cells[3].text = f"Cut latency by {rng.randint(5, 80)}% for {rng.randint(1, 50)}M users"
+    document.save(path)
+
+
+def build_txt(target_bytes: int = 2 * 1024 * 1024, seed: int = 3) -> bytes:
+    rng = random.Random(seed)
+    chunks, size = [], 0
+    while size < target_bytes:
+        block = "\n".join(resume_lines(rng, 200)) + "\n"
+        chunks.append(block)
+        size += len(block)
+    return "".join(chunks).encode("utf-8")
+
+
+def write_corpus(directory: str) -> Dict[str, str]:
+    """Write every fixture into ``directory`` and return name -> path"""
+    os.makedirs(directory, exist_ok=True)
+    paths = {
+        "pdf": os.path.join(directory, "resume_30_pages.pdf"),
+        "docx": os.path.join(directory, "resume_tables.docx"),
+        "txt": os.path.join(directory, "resume_large.txt"),
+    }
+    with open(paths["pdf"], "wb") as f:
+        f.write(build_pdf(pages=30))
+    build_docx(paths["docx"])
+    with open(paths["txt"], "wb") as f:
+        f.write(build_txt())
+    return paths
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit(__doc__)
+    for name, path in write_corpus(sys.argv[1]).items():
+        print(f"{name}: {path} ({os.path.getsize(path) / 1024:.0f} KB)")
@@ -0,0 +1,316 @@
+"""Micro-benchmarks for parsing, scoring, serialization and analytics hot paths.
+
+Usage:
+    python benchmarks/micro/run.py                      # run and compare to baseline.json
+    python benchmarks/micro/run.py --filter parse       # only benchmarks whose name contains "parse"
+    python benchmarks/micro/run.py --update-baseline    # record a new baseline
+
+Each benchmark is timed over several rounds of at least ``--min-time``
+seconds and reported as ops/sec (median round) with the round-to-round
+spread. Peak memory is measured in a separate untimed call under tracemalloc.
+The exit status is 1 when a benchmark's ops/sec drops, or its peak memory
+grows, by more than ``--tolerance`` against the baseline. Baselines are only
+comparable on the same machine, so regenerate baseline.json when the
+reference hardware changes.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Tuple
+
+# Keep the app's default engine off disk; benchmarks use their own databases
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(os.path.dirname(HERE))
+# Add the project root to the Python path
+sys.path.append(ROOT)
+
+from fixtures import write_corpus  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from app.api.v1 import analytics  # noqa: E402
+from app.core.serialization import dump_models  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.models import Analytics, Job, Match, Resume, SkillGap, User  # noqa: E402
+from app.models.user import UserRole  # noqa: E402
+from app.schemas import JobResponse, MatchResponse  # noqa: E402
+from app.services.match_scoring import score_match  # noqa: E402
+from app.services.resume_parser import ResumeParser  # noqa: E402
+from app.services.skill_bitsets import encode, pack, skill_overlap  # noqa: E402
+from app.services.skills import extract_skills  # noqa: E402
+
+BASELINE_PATH = os.path.join(HERE, "baseline.json")
+NOW = datetime(2024, 1, 1, 12, 0, 0)
+DESCRIPTION = "We are looking for an engineer to build and operate Python APIs on AWS with Docker. " * 30
+
+Setup = Callable[[Dict[str, str]], Callable[[], Any]]
+BENCHMARKS: List[Tuple[str, Setup]] = []
+
+
+def benchmark(name: str):
+    def register(setup: Setup) -> Setup:
+        BENCHMARKS.append((name, setup))
+        return setup
+    return register
+
+
+@benchmark("parse.pdf_30_pages")
+def _parse_pdf(corpus):
+    return lambda: ResumeParser.extract_text(corpus["pdf"])
+
+
+@benchmark("parse.docx_tables")
+def _parse_docx(corpus):
+    return lambda: ResumeParser.extract_text(corpus["docx"])
+
+
+@benchmark("parse.txt_2mb")
+def _parse_txt(corpus):
+    return lambda: ResumeParser.extract_text(corpus["txt"])
+
+
+@benchmark("scoring.extract_skills_pdf_text")
+def _extract_skills(corpus):
+    text = ResumeParser.extract_text(corpus["pdf"])
+    return lambda: extract_skills(text)
+
+
+@benchmark("scoring.score_match_x1000")
+def _score_match(corpus):
+    rng = random.Random(7)
+    vocabulary = ["python", "sql", "docker", "aws", "react", "go", "kafka", "redis", "spark", "terraform"]
+    resume = {"skills": rng.sample(vocabulary, 5), "experience_years": 6, "education_level": "Bachelor's"}
+    jobs = [
+        {
+            "required_skills": rng.sample(vocabulary, 4),
+            "preferred_skills": rng.sample(vocabulary, 2),
+            "experience_level": rng.choice(["entry", "mid", "senior"]),
+            "education_requirement": rng.choice(["", "Bachelor's", "Master's"]),
+        }
+        for _ in range(1000)
+    ]
+    return lambda: [score_match(resume, job) for job in jobs]
+
+
+@benchmark("scoring.skill_overlap_x10000")
+def _skill_overlap(corpus):
+    rng = random.Random(7)
+
+    def bitset(count: int) -> bytes:
+        return encode(sum(1 << skill_id for skill_id in rng.sample(range(1, 120), count)))
+
+    resume = pack([bitset(8)], 2)
+    required = pack([bitset(rng.randint(3, 6)) for _ in range(10_000)], 2)
+    preferred = pack([bitset(2) for _ in range(10_000)], 2)
+    return lambda: skill_overlap(resume, required, preferred)
+
+
+def make_jobs(n: int) -> list:
+    return [
+        Job(
+            id=i, recruiter_id=1, title=f"Engineer {i}", company="Acme", description=DESCRIPTION,
+            requirements="3+ years", location="Remote", job_type="full-time", salary_range="100k",
+            required_skills=["python", "sql", "docker"], preferred_skills=["aws"],
+            experience_level="mid", education_requirement="BSc", is_active=True, created_at=NOW,
+        )
+        for i in range(n)
+    ]
+
+
+def make_matches(n: int, with_ids: bool = True) -> list:
+    return [
+        Match(
+            id=i if with_ids else None, user_id=1, resume_id=1, job_id=i, match_score=50 + i % 50,
+            skill_match_score=60.0, experience_match_score=70.0, education_match_score=80.0,
+            overall_feedback="Solid match with a few gaps. " * 5,
+            resume_suggestions=[{"section": "skills", "suggestion": "Add Kubernetes", "priority": "high"}],
+            is_stale=False, origin="applicant", created_at=NOW - timedelta(hours=i),
+            skill_gaps=[
+                SkillGap(id=i * 3 + k if with_ids else None, match_id=i if with_ids else None,
+                         missing_skill=f"skill{k}", importance="required" if k == 0 else "preferred",
+                         suggestion="Take a course", created_at=NOW)
+                for k in range(3)
+            ],
+        )
+        for i in range(n)
+    ]
+
+
+@benchmark("serialize.job_response_x1000")
+def _serialize_jobs(corpus):
+    rows = make_jobs(1000)
+    return lambda: dump_models(JobResponse, rows)
+
+
+@benchmark("serialize.match_response_x500")
+def _serialize_matches(corpus):
+    rows = make_matches(500)
+    return lambda: dump_models(MatchResponse, rows)
+
+
+def analytics_session(matches: int):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    user = User(id=1, email="bench@example.com", hashed_password="x", full_name="Bench", role=UserRole.APPLICANT)
+    db.add(user)
+    db.add(Resume(id=1, user_id=1, title="Resume"))
+    db.add_all(make_jobs(matches))
+    rows = make_matches(matches, with_ids=False)
+    recent = datetime.utcnow()
+    for index, match in enumerate(rows):
+        match.created_at = recent - timedelta(hours=index % (24 * 28))
+    db.add_all(rows)
+    db.add_all(
+        Analytics(user_id=1, event_type=("job_match", "resume_upload", "login")[i % 3], created_at=recent)
+        for i in range(matches)
+    )
+    db.commit()
+    return db, user
+
+
+@benchmark("analytics.user_stats_2000_matches")
+def _user_stats(corpus):
+    db, user = analytics_session(2000)
+    return lambda: analytics.get_user_analytics(days=30, current_user=user, db=db)
+
+
+@benchmark("analytics.improvement_suggestions_2000_matches")
+def _improvement_suggestions(corpus):
+    db, user = analytics_session(2000)
+    return lambda: analytics.get_improvement_suggestions(current_user=user, db=db)
+
+
+def measure(fn: Callable[[], Any], rounds: int, min_time: float) -> Dict[str, float]:
+    fn()  # Warm caches and lazy imports
+    loops, elapsed = 1, 0.0
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9)))
+    timings = [elapsed / loops]
+    for _ in range(rounds - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        timings.append((time.perf_counter() - start) / loops)
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    median = statistics.median(timings)
+    return {
+        "ops_per_sec": round(1 / median, 2),
+        "mean_ms": round(statistics.fmean(timings) * 1000, 4),
+        "spread_pct": round((max(timings) - min(timings)) / median * 100, 1),
+        "peak_kb": round(peak / 1024, 1),
+        "loops": loops,
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Print a comparison table and return the regressions beyond ``tolerance``"""
+    regressions = []
+    print(f"\n{'benchmark':<48} {'ops/sec':>12} {'baseline':>12} {'change':>8} {'peak KB':>10} {'baseline':>10}")
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not base:
+            print(f"{name:<48} {current['ops_per_sec']:>12.2f} {'(new)':>12}")
+            continue
+        speed_change = current["ops_per_sec"] / base["ops_per_sec"] - 1
+        memory_growth = current["peak_kb"] / base["peak_kb"] - 1 if base["peak_kb"] else 0.0
+        flags = []
+        if speed_change < -tolerance:
+            flags.append("SLOWER")
+            regressions.append(f"{name}: {base['ops_per_sec']} -> {current['ops_per_sec']} ops/sec")
+        if memory_growth > tolerance and current["peak_kb"] - base["peak_kb"] > 64:
+            flags.append("MORE MEMORY")
+            regressions.append(f"{name}: peak {base['peak_kb']} -> {current['peak_kb']} KB")
+        print(
+            f"{name:<48} {current['ops_per_sec']:>12.2f} {base['ops_per_sec']:>12.2f} {speed_change:>+7.1%} "
+            f"{current['peak_kb']:>10.1f} {base['peak_kb']:>10.1f}  {' '.join(flags)}"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per round")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--out", help="Also write results as JSON here")
+    args = parser.parse_args()
+
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix="skillsync-micro-") as fixtures_dir:
+        corpus = write_corpus(fixtures_dir)
+        for name, setup in BENCHMARKS:
+            if args.filter not in name:
+                continue
+            results[name] = measure(setup(corpus), args.rounds, args.min_time)
+            stats = results[name]
+            print(
+                f"{name:<48} {stats['ops_per_sec']:>12.2f} ops/sec  ±{stats['spread_pct']:>5.1f}%  "
+                f"peak {stats['peak_kb']:>10.1f} KB",
+                flush=True
+            )
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+    baseline: Dict[str, Any] = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    if args.update_baseline:
+        baseline.setdefault("benchmarks", {}).update(results)
+        baseline["environment"] = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+        }
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return
+
+    if not baseline:
+        print("\nNo baseline to compare against; run with --update-baseline to record one")
+        return
+    regressions = compare(results, baseline.get("benchmarks", {}), args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print("\nNo regressions beyond tolerance")
+
+
+if __name__ == "__main__":
+    main()
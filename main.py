@@ -1,21 +1,22 @@
 import logging
 import time
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
+from app.core.security import calibrate_bcrypt_rounds, configure_bcrypt_rounds, password_hasher
+from app.core.telemetry import TelemetryMiddleware, metrics
+from app.core.tracing import TracingMiddleware, trace_exporter
+from app.services.llm_ledger import llm_ledger
 from app.api.v1.router import api_router
-from app.db.session import engine
-from app.db.base import Base
+from app.db.instrumentation import SQLInstrumentationMiddleware
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
 logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
-logger.info("Database tables created successfully")
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -26,15 +27,27 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
-# Add request logging middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    start_time = time.time()
-    logger.info(f"Incoming request: {request.method} {request.url}")
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    logger.info(f"Request completed: {request.method} {request.url} - Status: {response.status_code} - Time: {process_time:.4f}s")
-    return response
+# Add request telemetry middleware (latency histograms, status counters, sampled access log)
+app.add_middleware(
+    TelemetryMiddleware,
+    access_log_sample_rate=settings.ACCESS_LOG_SAMPLE_RATE,
+    server_timing=settings.SERVER_TIMING_ENABLED,
+)
+
+# Add per-request SQL statistics (N+1 detection, X-SQL-* headers in debug mode)
+app.add_middleware(
+    SQLInstrumentationMiddleware,
+    n_plus_one_threshold=settings.SQL_N_PLUS_ONE_THRESHOLD,
+    debug_headers=settings.DEBUG,
+    server_timing=settings.SERVER_TIMING_ENABLED,
+)
+
+# Add head-sampled request tracing (spans for DB, parser and LLM stages)
+app.add_middleware(
+    TracingMiddleware,
+    exporter=trace_exporter,
+    sample_rate=settings.TRACE_SAMPLE_RATE,
+)
 
 # Configure CORS
 app.add_middleware(
@@ -51,6 +64,19 @@ app.include_router(api_router, prefix="/api/v1")
 
 @app.on_event("startup")
 async def startup_event():
+    if settings.DB_MIGRATE_ON_STARTUP:
+        from app.db.migrations import run_migrations
+
+        await run_in_threadpool(run_migrations)
+        logger.info("Database schema is at the latest migration")
+    
+    if settings.BCRYPT_TARGET_MS > 0:
+        rounds = await run_in_threadpool(
+            calibrate_bcrypt_rounds, settings.BCRYPT_TARGET_MS, settings.BCRYPT_MIN_ROUNDS
+        )
+        configure_bcrypt_rounds(rounds)
+        logger.info(f"Calibrated bcrypt cost to {rounds} rounds for a {settings.BCRYPT_TARGET_MS}ms target")
+    
     logger.info("=== FastAPI Application Started ===")
     logger.info(f"App Name: {settings.APP_NAME}")
     logger.info(f"Version: {settings.APP_VERSION}")
@@ -58,6 +84,7 @@ async def startup_event():
     logger.info("  GET / - Root endpoint")
     logger.info("  GET /health - Health check")
     logger.info("  GET /debug - Debug information")
+    logger.info("  GET /metrics - Prometheus metrics")
     logger.info("  GET /docs - Swagger UI documentation")
     logger.info("  GET /redoc - ReDoc documentation")
     logger.info("  GET /openapi.json - OpenAPI schema")
@@ -68,6 +95,8 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("FastAPI Application shutting down...")
+    password_hasher.shutdown()
+    llm_ledger.flush()
 
 
 @app.get("/")
@@ -84,6 +113,7 @@ async def root():
             "openapi_schema": "/openapi.json",
             "health_check": "/health",
             "debug_info": "/debug",
+            "metrics": "/metrics",
             "api_base": "/api/v1"
         }
     }
@@ -99,6 +129,14 @@ async def health_check():
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """Prometheus metrics for this worker process"""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/debug")
 async def debug_info(request: Request):
     """Debug endpoint to verify FastAPI is running"""
@@ -125,6 +163,7 @@ async def debug_info(request: Request):
             "/",
             "/health", 
             "/debug",
+            "/metrics",
             "/docs",
             "/redoc", 
             "/api-docs",
@@ -0,0 +1,40 @@
+"""Pick a bcrypt work factor for this host.
+
+Usage:
+    python scripts/calibrate_bcrypt.py --target-ms 250
+
+Prints the chosen cost as a ``BCRYPT_ROUNDS`` line ready for ``.env``. Users whose
+stored hash uses a different cost are rehashed transparently on their next login.
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from passlib.context import CryptContext  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.security import calibrate_bcrypt_rounds  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target-ms", type=float, default=250, help="Target time for one hash")
+    parser.add_argument("--min-rounds", type=int, default=settings.BCRYPT_MIN_ROUNDS)
+    args = parser.parse_args()
+
+    rounds = calibrate_bcrypt_rounds(args.target_ms, args.min_rounds)
+
+    context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+    start = time.perf_counter()
+    context.hash("calibration-password")
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print(f"# one hash takes {elapsed_ms:.1f}ms at cost {rounds} (target {args.target_ms:.0f}ms)", file=sys.stderr)
+    print(f"BCRYPT_ROUNDS={rounds}")
+
+
+if __name__ == "__main__":
+    main()
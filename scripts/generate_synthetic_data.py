@@ -0,0 +1,311 @@
+"""Fill a database with deterministic synthetic data for scale testing.
+
+Usage:
+    python scripts/generate_synthetic_data.py --scale small
+    python scripts/generate_synthetic_data.py --scale large --database-url sqlite:///synthetic.sqlite
+    python scripts/generate_synthetic_data.py --users 100000 --jobs 50000 --matches 5000000 --events 20000000
+
+Creates the schema if needed and appends users, jobs, resumes, matches,
+skill gaps and analytics events with Core executemany inserts in large
+batches. Recruiter activity follows a Zipf distribution, so a few recruiters
+own most jobs, and job popularity is skewed the same way. Each table draws
+from its own generator seeded from ``--seed``, and timestamps are spread
+over ``--days`` before ``--anchor``. The same seed, scale and anchor produce
+the same rows on any machine.
+
+Every user's password is "synthetic", hashed once up front.
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, event, func, select  # noqa: E402
+from app.core.security import get_password_hash  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.models import Analytics, Job, Match, Resume, SkillGap, User  # noqa: E402
+from app.models.user import UserRole  # noqa: E402
+
+SCALES = {
+    "tiny": {"users": 1_000, "jobs": 500, "resumes": 1_200, "matches": 10_000, "events": 50_000},
+    "small": {"users": 10_000, "jobs": 5_000, "resumes": 12_000, "matches": 200_000, "events": 500_000},
+    "medium": {"users": 50_000, "jobs": 20_000, "resumes": 60_000, "matches": 1_000_000, "events": 5_000_000},
+    "large": {"users": 100_000, "jobs": 50_000, "resumes": 150_000, "matches": 5_000_000, "events": 20_000_000},
+}
+
+FIRST_NAMES = ["Ada", "Alan", "Grace", "Linus", "Barbara", "Dennis", "Margaret", "Ken", "Radia", "Guido",
+               "Frances", "Tim", "Hedy", "Edsger", "Katherine", "Donald", "Shafi", "John", "Sophie", "Yukihiro"]
+LAST_NAMES = ["Lovelace", "Turing", "Hopper", "Torvalds", "Liskov", "Ritchie", "Hamilton", "Thompson",
+              "Perlman", "van Rossum", "Allen", "Berners-Lee", "Lamarr", "Dijkstra", "Johnson", "Knuth"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises",
+             "Soylent", "Cyberdyne", "Tyrell", "Massive Dynamic", "Wonka", "Vandelay", "Pied Piper"]
+TITLES = ["Backend Engineer", "Frontend Engineer", "Data Engineer", "Data Scientist", "DevOps Engineer",
+          "Product Manager", "ML Engineer", "Site Reliability Engineer", "QA Engineer", "Mobile Developer"]
+SENIORITY = [("Junior", "entry"), ("", "mid"), ("Senior", "senior"), ("Staff", "senior")]
+LOCATIONS = ["Remote", "New York", "San Francisco", "Berlin", "London", "Austin", "Toronto", "Bangalore"]
+JOB_TYPES = ["full-time", "full-time", "full-time", "part-time", "contract"]
+EDUCATION = ["High School", "Associate", "Bachelor's", "Bachelor's", "Master's", "PhD"]
+SKILLS = ["python", "java", "javascript", "typescript", "go", "sql", "postgresql", "docker", "kubernetes",
+          "aws", "gcp", "azure", "react", "django", "fastapi", "spark", "kafka", "redis", "terraform",
+          "machine learning", "pandas", "linux", "git", "graphql", "rest", "ci/cd", "agile", "leadership"]
+SENTENCES = [
+    "You will design, build and operate services used by millions of people.",
+    "We value ownership, clear writing and pragmatic engineering.",
+    "The team works closely with product and design in short iterations.",
+    "You will mentor other engineers and raise the bar for code quality.",
+    "Our stack runs on managed cloud infrastructure with strong automation.",
+    "We offer flexible hours, learning budgets and a remote-friendly culture.",
+]
+EVENT_TYPES = ["job_match", "resume_upload", "cover_letter_generate", "job_view", "login"]
+EVENT_WEIGHTS = [30, 5, 5, 40, 20]
+IMPORTANCE = ["required", "required", "preferred"]
+
+
+def zipf_cum_weights(n: int, exponent: float) -> List[float]:
+    """Cumulative weights for rank k ~ 1 / k**exponent, for random.choices"""
+    return list(itertools.accumulate(1.0 / (rank ** exponent) for rank in range(1, n + 1)))
+
+
+def skewed_picks(rng: random.Random, cum_weights: List[float], block: int = 10_000) -> Iterator[int]:
+    """Endless 0-based indexes drawn with ``cum_weights``, sampled a block at a time"""
+    population = range(len(cum_weights))
+    while True:
+        yield from rng.choices(population, cum_weights=cum_weights, k=block)
+
+
+def seeded(seed: int, table: str) -> random.Random:
+    # String seeds are hashed with SHA-512, so this is stable across runs and platforms
+    return random.Random(f"{seed}:{table}")
+
+
+class Generator:
+    def __init__(self, engine, args):
+        self.engine = engine
+        self.args = args
+        self.anchor = args.anchor
+        self.span_seconds = args.days * 86400
+        self.offsets = {}
+        with engine.connect() as conn:
+            for model in (User, Job, Resume, Match, SkillGap, Analytics):
+                self.offsets[model.__tablename__] = conn.execute(select(func.max(model.id))).scalar() or 0
+
+    def timestamp(self, rng: random.Random) -> datetime:
+        return self.anchor - timedelta(seconds=rng.random() * self.span_seconds)
+
+    def insert(
+        self, model, rows: Callable[[random.Random, int], Iterator[Dict[str, Any]]], total: Optional[int] = None
+    ) -> None:
+        """Insert what ``rows(rng, first_id)`` yields (at most ``total`` rows) in batches"""
+        table = model.__table__
+        stream = rows(seeded(self.args.seed, table.name), self.offsets[table.name] + 1)
+        if total is not None:
+            stream = itertools.islice(stream, total)
+        of_total = f" / {total:,}" if total is not None else ""
+        started = time.perf_counter()
+        inserted = 0
+        while True:
+            batch = list(itertools.islice(stream, self.args.batch_size))
+            if not batch:
+                break
+            with self.engine.begin() as conn:
+                conn.execute(table.insert(), batch)
+            inserted += len(batch)
+            rate = inserted / (time.perf_counter() - started)
+            print(f"\r{table.name:<12} {inserted:>12,}{of_total}  ({rate:,.0f} rows/s)", end="", flush=True)
+        print()
+
+    def run(self) -> None:
+        args = self.args
+        recruiters = max(1, int(args.users * args.recruiter_share))
+        applicants = max(1, args.users - recruiters)
+        first_user = self.offsets["users"] + 1
+        first_applicant = first_user + recruiters
+        password_hash = get_password_hash("synthetic")
+
+        def users(rng, start_id):
+            for user_id in itertools.count(start_id):
+                role = UserRole.RECRUITER if user_id < first_applicant else UserRole.APPLICANT
+                yield {
+                    "id": user_id,
+                    "email": f"user{user_id}@synthetic.example.com",
+                    "hashed_password": password_hash,
+                    "full_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                    "role": role,
+                    "is_active": rng.random() > 0.02,
+                    "created_at": self.timestamp(rng),
+                }
+
+        recruiter_weights = zipf_cum_weights(recruiters, args.zipf)
+
+        def jobs(rng, start_id):
+            recruiter_picks = skewed_picks(rng, recruiter_weights)
+            for job_id in itertools.count(start_id):
+                prefix, level = rng.choice(SENIORITY)
+                title = f"{prefix} {rng.choice(TITLES)}".strip()
+                required = rng.sample(SKILLS, rng.randint(3, 6))
+                yield {
+                    "id": job_id,
+                    "recruiter_id": first_user + next(recruiter_picks),
+                    "title": title,
+                    "company": rng.choice(COMPANIES),
+                    "description": f"We are hiring a {title}. " + " ".join(rng.sample(SENTENCES, 4))
+                                   + f" Required: {', '.join(required)}.",
+                    "requirements": f"{rng.randint(0, 10)}+ years of experience",
+                    "location": rng.choice(LOCATIONS),
+                    "job_type": rng.choice(JOB_TYPES),
+                    "salary_range": f"${rng.randrange(50, 200, 10)}k-${rng.randrange(200, 300, 10)}k",
+                    "required_skills": required,
+                    "preferred_skills": rng.sample(SKILLS, 2),
+                    "experience_level": level,
+                    "education_requirement": rng.choice(EDUCATION[1:5]),
+                    "is_active": rng.random() > 0.1,
+                    "created_at": self.timestamp(rng),
+                }
+
+        # Resume owners are needed again to keep matches consistent with them
+        resume_owners: List[int] = []
+
+        def resumes(rng, start_id):
+            for resume_id in itertools.count(start_id):
+                owner = first_applicant + rng.randrange(applicants)
+                resume_owners.append(owner)
+                skills = rng.sample(SKILLS, rng.randint(4, 10))
+                years = rng.randint(0, 20)
+                education = rng.choice(EDUCATION)
+                yield {
+                    "id": resume_id,
+                    "user_id": owner,
+                    "title": f"{rng.choice(TITLES)} resume",
+                    "original_filename": f"resume_{resume_id}.pdf",
+                    "extracted_text": f"{years} years of experience. Skills: {', '.join(skills)}. {education}.",
+                    "parsed_data": {"skills": skills, "experience_years": years, "education_level": education},
+                    "skills": skills,
+                    "experience_years": years,
+                    "education_level": education,
+                    "created_at": self.timestamp(rng),
+                }
+
+        job_weights = zipf_cum_weights(args.jobs, args.job_zipf)
+        first_job = self.offsets["jobs"] + 1
+        first_resume = self.offsets["resumes"] + 1
+
+        def matches(rng, start_id):
+            job_picks = skewed_picks(rng, job_weights)
+            for match_id in itertools.count(start_id):
+                index = rng.randrange(len(resume_owners))
+                score = min(100.0, max(0.0, rng.gauss(62, 15)))
+                yield {
+                    "id": match_id,
+                    "user_id": resume_owners[index],
+                    "resume_id": first_resume + index,
+                    "job_id": first_job + next(job_picks),
+                    "match_score": round(score, 1),
+                    "skill_match_score": round(min(100.0, max(0.0, score + rng.gauss(0, 8))), 1),
+                    "experience_match_score": round(min(100.0, max(0.0, score + rng.gauss(0, 12))), 1),
+                    "education_match_score": round(min(100.0, max(0.0, score + rng.gauss(5, 10))), 1),
+                    "overall_feedback": "Synthetic match feedback.",
+                    "resume_suggestions": [
+                        {"section": "skills", "suggestion": f"Add {rng.choice(SKILLS)}", "priority": "high"}
+                    ] if score < 70 else None,
+                    "created_at": self.timestamp(rng),
+                }
+
+        # Skill gaps are generated as a flat stream: each match gets 0..max gaps
+        first_match = self.offsets["matches"] + 1
+
+        def skill_gaps(rng, start_id):
+            gap_id = start_id
+            for match_offset in range(args.matches):
+                for _ in range(rng.randint(0, args.max_gaps_per_match)):
+                    skill = rng.choice(SKILLS)
+                    yield {
+                        "id": gap_id,
+                        "match_id": first_match + match_offset,
+                        "missing_skill": skill,
+                        "importance": rng.choice(IMPORTANCE),
+                        "suggestion": f"Build a small project using {skill}",
+                        "created_at": self.timestamp(rng),
+                    }
+                    gap_id += 1
+
+        def events(rng, start_id):
+            for event_id in itertools.count(start_id):
+                event_type = rng.choices(EVENT_TYPES, EVENT_WEIGHTS)[0]
+                yield {
+                    "id": event_id,
+                    "user_id": first_user + rng.randrange(recruiters + applicants),
+                    "event_type": event_type,
+                    "event_data": {"source": "synthetic"},
+                    "improvement_score": round(rng.uniform(20, 100), 1) if event_type == "job_match" else None,
+                    "session_id": f"s{rng.getrandbits(48):012x}",
+                    "created_at": self.timestamp(rng),
+                }
+
+        self.insert(User, users, recruiters + applicants)
+        self.insert(Job, jobs, args.jobs)
+        self.insert(Resume, resumes, args.resumes)
+        self.insert(Match, matches, args.matches)
+        self.insert(SkillGap, skill_gaps)
+        self.insert(Analytics, events, args.events)
+
+
+def create_target_engine(url: str):
+    engine = create_engine(url)
+    if engine.dialect.name == "sqlite":
+        @event.listens_for(engine, "connect")
+        def _bulk_load_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            # Trade durability for load speed; the data is disposable
+            cursor.execute("PRAGMA journal_mode=OFF")
+            cursor.execute("PRAGMA synchronous=OFF")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.execute("PRAGMA cache_size=-262144")
+            cursor.close()
+    return engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="sqlite:///synthetic.sqlite")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    for name in ("users", "jobs", "resumes", "matches", "events"):
+        parser.add_argument(f"--{name}", type=int, help=f"Override the number of {name} for --scale")
+    parser.add_argument("--recruiter-share", type=float, default=0.05, help="Fraction of users who are recruiters")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Skew of jobs per recruiter")
+    parser.add_argument("--job-zipf", type=float, default=0.8, help="Skew of matches per job")
+    parser.add_argument("--max-gaps-per-match", type=int, default=3)
+    parser.add_argument("--days", type=int, default=365, help="Spread timestamps over this many days")
+    parser.add_argument(
+        "--anchor", type=lambda value: datetime.fromisoformat(value).replace(tzinfo=timezone.utc),
+        default=datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0),
+        help="Latest timestamp (ISO date, default: today 00:00 UTC); fix it to reproduce a dataset exactly"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=20_000)
+    parser.add_argument("--drop", action="store_true", help="Drop and recreate all tables first")
+    args = parser.parse_args()
+
+    for name, value in SCALES[args.scale].items():
+        if getattr(args, name) is None:
+            setattr(args, name, value)
+
+    engine = create_target_engine(args.database_url)
+    if args.drop:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    started = time.perf_counter()
+    Generator(engine, args).run()
+    print(f"Done in {time.perf_counter() - started:.1f}s (seed={args.seed}, anchor={args.anchor.date()})")
+
+
+if __name__ == "__main__":
+    main()
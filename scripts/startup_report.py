@@ -0,0 +1,154 @@
+"""Report how long a worker takes to start.
+
+Usage:
+    python scripts/startup_report.py --runs 5 --out startup.json
+
+Measures, in fresh interpreters:
+
+* import time of ``main`` via ``python -X importtime``, with the slowest
+  modules by cumulative and self time, and whether any dependency that
+  should load lazily (openai, PyPDF2, docx, passlib, jose, alembic, numpy) was
+  imported eagerly;
+* time from spawning uvicorn to the first successful ``/health`` response
+  (startup migrations included, against a temporary SQLite database), and
+  the latency of the first API request after that.
+
+Medians across ``--runs`` are printed as JSON.
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Any, Dict, List
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAZY_MODULES = ["openai", "PyPDF2", "docx", "passlib", "jose", "alembic", "numpy"]
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip())) // 2,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+    return modules
+
+
+def measure_imports(env: Dict[str, str], workdir: str) -> List[Dict[str, Any]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import sys; sys.path.insert(0, {ROOT!r}); import main"],
+        cwd=workdir, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing main failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_request(env: Dict[str, str], workdir: str, timeout: float = 60) -> Dict[str, float]:
+    port = free_port()
+    # Build the client up front so its setup cost is not counted as startup time
+    client = httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=timeout)
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", ROOT, "--port", str(port), "--log-level", "warning"],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = started + timeout
+        while True:
+            if proc.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with {proc.returncode}")
+            if time.perf_counter() > deadline:
+                raise RuntimeError("Timed out waiting for /health")
+            try:
+                if client.get("/health").status_code == 200:
+                    break
+            except httpx.TransportError:
+                time.sleep(0.005)
+        ready = time.perf_counter()
+        request_started = time.perf_counter()
+        client.get("/api/v1/jobs/").raise_for_status()
+        return {
+            "time_to_first_request_ms": round((ready - started) * 1000, 1),
+            "first_api_request_ms": round((time.perf_counter() - request_started) * 1000, 1),
+        }
+    finally:
+        client.close()
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to list")
+    parser.add_argument("--out", help="Also write the report as JSON here")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="skillsync-startup-")
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{workdir}/startup.sqlite",
+        "LLM_BACKEND": os.environ.get("LLM_BACKEND", "local"),
+        "PYTHONDONTWRITEBYTECODE": "0",
+    }
+
+    import_totals, cumulative, self_times = [], defaultdict(list), defaultdict(list)
+    eager = set()
+    first_requests = []
+    for _ in range(args.runs):
+        modules = measure_imports(env, workdir)
+        for module in modules:
+            cumulative[module["module"]].append(module["cumulative_ms"])
+            self_times[module["module"]].append(module["self_ms"])
+            if module["module"].split(".")[0] in LAZY_MODULES:
+                eager.add(module["module"].split(".")[0])
+        import_totals.append(next(m["cumulative_ms"] for m in modules if m["module"] == "main"))
+        first_requests.append(measure_first_request(env, workdir))
+
+    def top(samples: Dict[str, List[float]]) -> List[Dict[str, Any]]:
+        medians = {name: statistics.median(values) for name, values in samples.items()}
+        return [
+            {"module": name, "ms": round(ms, 1)}
+            for name, ms in sorted(medians.items(), key=lambda item: -item[1])[:args.top]
+        ]
+
+    report = {
+        "runs": args.runs,
+        "import_main_ms": round(statistics.median(import_totals), 1),
+        "time_to_first_request_ms": statistics.median(r["time_to_first_request_ms"] for r in first_requests),
+        "first_api_request_ms": statistics.median(r["first_api_request_ms"] for r in first_requests),
+        "eagerly_imported_lazy_modules": sorted(eager),
+        "slowest_modules_cumulative": top({name: v for name, v in cumulative.items() if name != "main"}),
+        "slowest_modules_self": top(self_times),
+    }
+    print(json.dumps(report, indent=2))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    if eager:
+        sys.exit(f"Imported at startup but expected to load lazily: {', '.join(sorted(eager))}")
+
+
+if __name__ == "__main__":
+    main()
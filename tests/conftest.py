@@ -0,0 +1,38 @@
+import os
+import tempfile
+
+# The deterministic local backend keeps LLM calls offline
+os.environ["LLM_BACKEND"] = "local"
+os.environ.setdefault("OPENAI_API_KEY", "offline")
+# A throwaway database, set before main (or anything else) imports the engine
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='skillsync-tests-')}/db.sqlite"
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from main import app  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    Base.metadata.create_all(bind=engine)
+    yield
+    engine.dispose()
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Background passes run inline after each response; no need to pace them
+    monkeypatch.setattr(settings, "MATCH_AUTO_CHUNK_PAUSE_SECONDS", 0)
+    return TestClient(app)
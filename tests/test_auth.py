@@ -0,0 +1,39 @@
+import asyncio
+import uuid
+from sqlalchemy import event
+from app.core.config import settings
+from app.core.security import configure_bcrypt_rounds
+from app.db.session import engine
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def test_register_and_login_keep_database_work_off_the_event_loop(client):
+    configure_bcrypt_rounds(4)
+    email = f"{uuid.uuid4().hex}@example.com"
+    on_loop = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        on_loop.append(_on_event_loop())
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        response = client.post(
+            "/api/v1/auth/register", json={"email": email, "full_name": "Jane", "password": "secret"}
+        )
+        assert response.status_code == 200
+        response = client.post("/api/v1/auth/login", data={"username": email, "password": "secret"})
+        assert response.status_code == 200 and response.json()["access_token"]
+        response = client.post("/api/v1/auth/login", data={"username": email, "password": "wrong"})
+        assert response.status_code == 401
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+        configure_bcrypt_rounds(settings.BCRYPT_ROUNDS)
+
+    assert on_loop and not any(on_loop)
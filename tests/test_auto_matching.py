@@ -0,0 +1,80 @@
+from app.models import Match, Resume
+from app.models.user import UserRole
+from tests.utils import headers_for, make_user
+
+JOB = {
+    "title": "Backend Engineer",
+    "company": "Acme",
+    "description": "We need Python and SQL.",
+    "required_skills": ["python", "sql"],
+}
+
+
+def _auto_matched_job(client, db):
+    """A resume in the pool, then a new job that gets auto-matched against it"""
+    applicant = make_user(db)
+    recruiter = make_user(db, UserRole.RECRUITER)
+    resume = Resume(user_id=applicant.id, title="CV", skills=["python", "sql"], experience_years=5)
+    db.add(resume)
+    db.commit()
+
+    response = client.post("/api/v1/jobs/", json=JOB, headers=headers_for(recruiter))
+    assert response.status_code == 200
+    job_id = response.json()["id"]
+    assert db.query(Match).filter(Match.job_id == job_id, Match.resume_id == resume.id, Match.origin == "auto").count()
+    return applicant, recruiter, resume, job_id
+
+
+def test_new_job_is_matched_against_existing_resumes(client, db):
+    applicant, _, _, job_id = _auto_matched_job(client, db)
+
+    # Recruiters see the candidate; the applicant's own listing stays theirs
+    assert client.get("/api/v1/matching/", headers=headers_for(applicant)).json() == []
+
+
+def test_deleting_an_auto_matched_job_deletes_its_matches(client, db):
+    _, recruiter, _, job_id = _auto_matched_job(client, db)
+
+    response = client.delete(f"/api/v1/jobs/{job_id}", headers=headers_for(recruiter))
+    assert response.status_code == 200
+    db.expire_all()
+    assert db.query(Match).filter(Match.job_id == job_id).count() == 0
+
+
+def test_deleting_an_auto_matched_resume_deletes_its_matches(client, db):
+    applicant, _, resume, _ = _auto_matched_job(client, db)
+    resume_id = resume.id
+
+    response = client.delete(f"/api/v1/resumes/{resume_id}", headers=headers_for(applicant))
+    assert response.status_code == 200
+    db.expire_all()
+    assert db.query(Match).filter(Match.resume_id == resume_id).count() == 0
+
+
+def test_changing_a_job_re_ranks_its_auto_matches(client, db):
+    applicant, recruiter, resume, job_id = _auto_matched_job(client, db)
+    cobol = Resume(user_id=applicant.id, title="COBOL CV", skills=["cobol"], experience_years=5)
+    db.add(cobol)
+    db.commit()
+
+    response = client.put(
+        f"/api/v1/jobs/{job_id}", json={"required_skills": ["cobol"]}, headers=headers_for(recruiter)
+    )
+    assert response.status_code == 200
+    db.expire_all()
+    auto = {match.resume_id for match in db.query(Match).filter(Match.job_id == job_id, Match.origin == "auto")}
+    # The old candidate fell below MATCH_AUTO_MIN_SCORE; the one that fits now takes its place
+    assert resume.id not in auto and cobol.id in auto
+
+
+def test_reactivated_job_is_matched_against_resumes_added_meanwhile(client, db):
+    applicant, recruiter, _, job_id = _auto_matched_job(client, db)
+    headers = headers_for(recruiter)
+    assert client.put(f"/api/v1/jobs/{job_id}", json={"is_active": False}, headers=headers).status_code == 200
+    late = Resume(user_id=applicant.id, title="Late CV", skills=["python", "sql"], experience_years=5)
+    db.add(late)
+    db.commit()
+
+    assert client.put(f"/api/v1/jobs/{job_id}", json={"is_active": True}, headers=headers).status_code == 200
+    db.expire_all()
+    assert db.query(Match).filter(Match.job_id == job_id, Match.resume_id == late.id, Match.origin == "auto").count()
@@ -0,0 +1,26 @@
+import csv
+import io
+from types import SimpleNamespace
+from app.services.candidate_export import CSV_HEADER, encode_rows
+
+
+def _row(**values):
+    return SimpleNamespace(**{**dict.fromkeys(CSV_HEADER), **values})
+
+
+def test_csv_cells_that_spreadsheets_would_evaluate_are_escaped():
+    rows = [
+        _row(candidate_name='=HYPERLINK("http://evil.example","click")', resume_title="+1 555 0100"),
+        _row(candidate_name="-2+3", resume_title="@SUM(A1)", skills=["=cmd", "python"]),
+        _row(candidate_name="\tTabbed", resume_title="\rReturn", match_score=-1.5),
+        _row(candidate_name="Ada Lovelace", resume_title="Backend developer", match_score=87.5),
+    ]
+
+    cells = list(csv.DictReader(io.StringIO(encode_rows(rows, "csv").decode("utf-8")), fieldnames=CSV_HEADER))
+
+    assert [cell["candidate_name"] for cell in cells] == [
+        '\'=HYPERLINK("http://evil.example","click")', "'-2+3", "'\tTabbed", "Ada Lovelace"
+    ]
+    assert [cell["resume_title"] for cell in cells] == ["'+1 555 0100", "'@SUM(A1)", "'\rReturn", "Backend developer"]
+    assert cells[1]["skills"] == "'=cmd;python"
+    assert cells[2]["match_score"] == "-1.5"  # Numbers are not text, so they are left alone
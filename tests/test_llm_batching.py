@@ -0,0 +1,21 @@
+import asyncio
+from app.services.ai_service import AIService
+from app.services.llm_resilience import ResilientCaller
+from app.services.llm_scheduler import LLMScheduler
+
+
+def test_batch_size_ignores_time_queued_for_the_scheduler():
+    service = AIService()
+    # One request every half second: the second batch queues for about 500ms
+    scheduler = LLMScheduler(requests_per_minute=120, tokens_per_minute=0, burst_seconds=0.5)
+    service.caller = ResilientCaller(service.backend, scheduler=scheduler)
+    service.job_batch_size.target_latency_ms = 200
+    size = service.job_batch_size.value
+
+    async def scenario():
+        for _ in range(2):
+            answers = await service._analyze_job_batch(["Python developer with SQL"] * 2)
+            assert all(answers)
+
+    asyncio.run(scenario())
+    assert service.job_batch_size.value == size
@@ -0,0 +1,17 @@
+import asyncio
+from app.services import ai_service as ai_service_module
+from app.services.ai_service import AIService
+
+
+def test_streamed_calls_record_time_to_first_token(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(ai_service_module.llm_ledger, "record", recorded.append)
+    service = AIService()
+
+    letter = asyncio.run(service.generate_cover_letter({"skills": ["python"]}, {"title": "Backend"}, "Jane"))
+    asyncio.run(service.analyze_job_description("We need Python and SQL."))
+
+    assert letter
+    streamed, whole = recorded
+    assert streamed.task == "generate_cover_letter" and streamed.time_to_first_token_ms is not None
+    assert whole.task == "analyze_job_description" and whole.time_to_first_token_ms is None
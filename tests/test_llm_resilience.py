@@ -0,0 +1,98 @@
+import asyncio
+import time
+from app.core.config import settings
+from app.services.llm_backends import Completion
+from app.services.llm_ledger import LLMCallRecord
+from app.services.llm_resilience import ResilientCaller
+from app.services.llm_scheduler import LLMScheduler
+
+
+class StubBackend:
+    name = "stub"
+    model = "stub-model"
+    rate_limited = False
+
+
+def _caller(monkeypatch, scheduler=None) -> ResilientCaller:
+    monkeypatch.setattr(settings, "LLM_DEADLINE_SECONDS", 0.05)
+    monkeypatch.setattr(settings, "LLM_TASK_DEADLINES", {})
+    monkeypatch.setattr(settings, "LLM_MAX_RETRIES", 0)
+    monkeypatch.setattr(settings, "LLM_HEDGE_ENABLED", False)
+    monkeypatch.setattr(settings, "LLM_BREAKER_MIN_CALLS", 2)
+    monkeypatch.setattr(settings, "LLM_BREAKER_ERROR_RATE", 0.5)
+    monkeypatch.setattr(settings, "LLM_BREAKER_COOLDOWN_SECONDS", 0)
+    return ResilientCaller(StubBackend(), scheduler=scheduler)
+
+
+async def _hang(backend):
+    await asyncio.sleep(1)
+
+
+async def _answer(backend):
+    return Completion(text="ok")
+
+
+async def _call(caller: ResilientCaller, request) -> str:
+    call = LLMCallRecord(task="test", model=StubBackend.model)
+    try:
+        return (await caller.complete("test", request, call)).text
+    except asyncio.TimeoutError:
+        return call.outcome
+
+
+def test_hung_requests_open_the_breaker(monkeypatch):
+    caller = _caller(monkeypatch)
+
+    async def scenario():
+        assert await _call(caller, _hang) == "timeout"
+        assert await _call(caller, _hang) == "timeout"
+
+    asyncio.run(scenario())
+    assert caller.breaker.state == "open"
+
+
+def test_breaker_recovers_after_probe_times_out(monkeypatch):
+    caller = _caller(monkeypatch)
+
+    async def scenario():
+        for _ in range(2):
+            await _call(caller, _hang)
+        # The cooldown is over, so this is the half-open probe; it hangs too
+        assert await _call(caller, _hang) == "timeout"
+        assert caller.breaker.state == "open"
+        # The next call probes again instead of being short-circuited forever
+        assert await _call(caller, _answer) == "ok"
+
+    asyncio.run(scenario())
+    assert caller.breaker.state == "closed"
+
+
+def test_cancelled_probe_lets_the_next_call_probe(monkeypatch):
+    caller = _caller(monkeypatch)
+
+    async def scenario():
+        for _ in range(2):
+            await _call(caller, _hang)
+        probe = asyncio.ensure_future(_call(caller, _hang))
+        await asyncio.sleep(0.01)
+        probe.cancel()
+        await asyncio.gather(probe, return_exceptions=True)
+        assert await _call(caller, _answer) == "ok"
+
+    asyncio.run(scenario())
+    assert caller.breaker.state == "closed"
+
+
+def test_deadline_covers_time_queued_for_the_scheduler(monkeypatch):
+    # One request a minute: the first call is admitted, the second would queue for a minute
+    caller = _caller(monkeypatch, LLMScheduler(requests_per_minute=1, tokens_per_minute=0))
+
+    async def scenario():
+        assert await _call(caller, _answer) == "ok"
+        start = time.perf_counter()
+        assert await _call(caller, _answer) == "timeout"
+        return time.perf_counter() - start
+
+    assert asyncio.run(scenario()) < 1
+    # Waiting in our own queue is not the provider's failure
+    assert caller.breaker.state == "closed"
@@ -0,0 +1,92 @@
+"""Listing endpoints must not issue more queries as their results grow.
+
+Each endpoint is called after seeding 1, 5 and 25 rows; a growing
+statement count means an N+1 lazy load slipped in.
+"""
+import uuid
+import pytest
+from app.api.v1 import jobs as jobs_router
+from app.db.instrumentation import assert_constant_query_count
+from app.db.session import SessionLocal, engine
+from app.models import Job, Match, Resume, SkillGap
+from app.models.user import UserRole
+from tests.utils import headers_for, make_user
+
+
+def seed_matches(db, size: int) -> dict:
+    recruiter = make_user(db, UserRole.RECRUITER)
+    user = make_user(db)
+    resume = Resume(user_id=user.id, title="Resume", skills=["python"])
+    db.add(resume)
+    db.flush()
+    match = None
+    for i in range(size):
+        job = Job(recruiter_id=recruiter.id, title=f"Job {i}", company="Acme", description="Python")
+        db.add(job)
+        db.flush()
+        match = Match(
+            user_id=user.id, resume_id=resume.id, job_id=job.id, match_score=50,
+            skill_gaps=[SkillGap(missing_skill=f"skill-{k}") for k in range(3)],
+        )
+        db.add(match)
+    db.flush()
+    return {"headers": headers_for(user), "match_id": match.id}
+
+
+def seed_match_detail(db, size: int) -> dict:
+    recruiter = make_user(db, UserRole.RECRUITER)
+    user = make_user(db)
+    resume = Resume(user_id=user.id, title="Resume")
+    job = Job(recruiter_id=recruiter.id, title="Job", company="Acme", description="Python")
+    db.add_all([resume, job])
+    db.flush()
+    match = Match(
+        user_id=user.id, resume_id=resume.id, job_id=job.id, match_score=50,
+        skill_gaps=[SkillGap(missing_skill=f"skill-{k}") for k in range(size)],
+    )
+    db.add(match)
+    db.flush()
+    return {"headers": headers_for(user), "match_id": match.id}
+
+
+def seed_resumes(db, size: int) -> dict:
+    user = make_user(db)
+    db.add_all([Resume(user_id=user.id, title=f"Resume {i}", extracted_text="text") for i in range(size)])
+    return {"headers": headers_for(user)}
+
+
+def seed_jobs(db, size: int) -> dict:
+    recruiter = make_user(db, UserRole.RECRUITER)
+    tag = uuid.uuid4().hex
+    db.add_all([
+        Job(recruiter_id=recruiter.id, title=f"{tag} {i}", company="Acme", description="Python")
+        for i in range(size)
+    ])
+    return {"headers": headers_for(recruiter), "tag": tag}
+
+
+@pytest.mark.parametrize("path, seeder", [
+    ("/api/v1/matching/", seed_matches),
+    ("/api/v1/matching/?view=summary", seed_matches),
+    ("/api/v1/matching/{match_id}", seed_match_detail),
+    ("/api/v1/resumes/", seed_resumes),
+    ("/api/v1/jobs/?search={tag}", seed_jobs),
+    ("/api/v1/jobs/my-jobs", seed_jobs),
+])
+def test_query_count_is_constant(client, path, seeder):
+    state = {}
+
+    def seed(size: int) -> None:
+        db = SessionLocal()
+        try:
+            state.update(seeder(db, size))
+            db.commit()
+        finally:
+            db.close()
+
+    def call() -> None:
+        jobs_router.job_cache.clear()
+        response = client.get(path.format(**state), headers=state["headers"])
+        assert response.status_code == 200, response.text
+
+    assert_constant_query_count(engine, seed, call)
@@ -0,0 +1,40 @@
+import logging
+import pytest
+from fastapi import BackgroundTasks, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app.db.instrumentation import SQLInstrumentationMiddleware
+from app.db.session import engine
+
+
+def test_failed_statement_does_not_leave_a_start_time_behind():
+    with engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM no_such_table"))
+        assert conn.info.get("query_start_time") == []
+        conn.execute(text("SELECT 1"))
+        assert conn.info["query_start_time"] == []
+
+
+def test_background_task_queries_are_not_counted_against_the_request(caplog):
+    def repeated_queries():
+        with engine.connect() as conn:
+            for _ in range(10):
+                conn.execute(text("SELECT 1"))
+
+    app = FastAPI()
+    app.add_middleware(SQLInstrumentationMiddleware, n_plus_one_threshold=5, debug_headers=True)
+
+    @app.get("/")
+    def endpoint(background_tasks: BackgroundTasks):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        background_tasks.add_task(repeated_queries)
+        return {}
+
+    with caplog.at_level(logging.WARNING, logger="app.db.instrumentation"):
+        response = TestClient(app).get("/")
+
+    assert response.headers["x-sql-queries"] == "1"
+    assert "Possible N+1" not in caplog.text
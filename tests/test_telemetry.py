@@ -0,0 +1,28 @@
+import time
+from fastapi import BackgroundTasks, FastAPI
+from fastapi.testclient import TestClient
+from app.core.telemetry import TelemetryMiddleware, http_request_duration_seconds, http_requests_in_flight
+
+
+def test_background_tasks_are_not_part_of_the_request():
+    in_flight = []
+
+    def slow_task():
+        in_flight.append(http_requests_in_flight.value())
+        time.sleep(0.3)
+
+    app = FastAPI()
+    app.add_middleware(TelemetryMiddleware, access_log_sample_rate=0)
+
+    @app.get("/with-background-task")
+    def endpoint(background_tasks: BackgroundTasks):
+        background_tasks.add_task(slow_task)
+        return {}
+
+    before = http_requests_in_flight.value()
+    assert TestClient(app).get("/with-background-task").status_code == 200
+
+    counts, total = http_request_duration_seconds.snapshot("GET", "/with-background-task")
+    assert sum(counts) == 1 and total < 0.3
+    assert in_flight == [before]
+    assert http_requests_in_flight.value() == before
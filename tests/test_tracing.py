@@ -0,0 +1,29 @@
+import time
+from fastapi import BackgroundTasks, FastAPI
+from fastapi.testclient import TestClient
+from app.core.tracing import TraceExporter, TracingMiddleware, span
+
+
+def test_root_span_ends_when_the_response_is_sent():
+    def slow_task():
+        with span("background"):
+            time.sleep(0.3)
+
+    exporter = TraceExporter()
+    app = FastAPI()
+    app.add_middleware(TracingMiddleware, exporter=exporter, sample_rate=1.0)
+
+    @app.get("/with-background-task")
+    def endpoint(background_tasks: BackgroundTasks):
+        with span("handler"):
+            background_tasks.add_task(slow_task)
+        return {}
+
+    response = TestClient(app).get("/with-background-task")
+    assert response.status_code == 200
+
+    trace = exporter.get(response.headers["x-trace-id"])
+    assert trace["name"] == "GET /with-background-task"
+    assert trace["attributes"]["status"] == 200
+    assert trace["duration_ms"] < 300
+    assert [item["name"] for item in trace["spans"]][1:] == ["handler"]
@@ -0,0 +1,19 @@
+import uuid
+from app.core.security import create_access_token
+from app.models.user import User, UserRole
+
+
+def make_user(db, role=UserRole.APPLICANT) -> User:
+    user = User(
+        email=f"{uuid.uuid4().hex}@example.com",
+        hashed_password="not-a-real-hash",
+        full_name="Test User",
+        role=role,
+    )
+    db.add(user)
+    db.flush()
+    return user
+
+
+def headers_for(user: User) -> dict:
+    return {"Authorization": f"Bearer {create_access_token(subject=user.email)}"}